@@ -0,0 +1,246 @@
+"""
+MySQL -> Snowflake RAW pipeline, generated from configs/config.yaml.
+
+Tables are grouped into tiers by their foreign keys (customers, products ->
+orders -> order_items); each tier is one task group mapped over its tables
+(dynamic task mapping), so independent tables load in parallel and a tier
+starts once the previous one has succeeded. Per table:
+
+    extract           MySQL -> local spool         pool: airflow.mysql_pool
+    load              spool -> Snowflake RAW        pool: airflow.snowflake_pool
+    commit_watermark  flush watermark, drop spool,  pool: airflow.snowflake_pool
+                      record the run in the ledger
+
+Extract and load are separate tasks so each can be capped by its own pool;
+the spool (src/pipeline/spool.py) hands the chunks over, and a failed load
+retries from it without reading MySQL again. Incremental loads still commit
+their (updated_at, pk) checkpoint with every chunk inside the load task.
+Each table's rows, bytes and task timings are added to the run ledger
+(src/pipeline/run_ledger.py) under the Airflow run id once its watermark is
+committed; failed tasks are left to Airflow's own task history.
+Tables with `extract_mode: cdc` are polled by updated_at here; binlog CDC
+(src/extract/binlog_cdc.py) runs through src.pipeline.runner.
+
+Create the pools once, sized like mysql.pool_size / snowflake.pool_size:
+
+    airflow pools set etl_mysql_readers 8 "MySQL extract connections"
+    airflow pools set etl_snowflake_writers 4 "Snowflake load sessions"
+"""
+
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from airflow import DAG
+from airflow.decorators import task, task_group
+from airflow.operators.python import get_current_context
+
+# docker-compose.yaml mounts the repository here and sets ETL_PROJECT_DIR.
+PROJECT_DIR = os.environ.get("ETL_PROJECT_DIR", "/opt/airflow/project")
+CONFIG_PATH = os.environ.get("ETL_CONFIG", "configs/config.yaml")
+
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+from src.common.config_loader import PipelineConfig, get_config  # noqa: E402
+from src.pipeline.runner import SOURCE_DDL_PATH, build_dependency_graph, dependency_tiers  # noqa: E402
+
+default_args = {
+    "owner": "vijay",
+    "depends_on_past": False,
+    "retries": 1,
+    "retry_delay": timedelta(minutes=5),
+}
+
+
+def _project_config() -> PipelineConfig:
+    # Paths in config.yaml (sql/, .etl_state/) are relative to the project.
+    os.chdir(PROJECT_DIR)
+    return get_config(CONFIG_PATH)
+
+
+def _run_dir(table_name: str) -> Path:
+    from src.pipeline.spool import SPOOL_DIR
+
+    run_id = re.sub(r"[^A-Za-z0-9_.-]", "_", get_current_context()["run_id"])
+    return Path(SPOOL_DIR) / run_id / table_name
+
+
+@task
+def extract(table_name: str) -> dict:
+    from src.common.db_connections import close_pools, get_mysql_pool
+    from src.load.watermark_utils import WatermarkStore
+    from src.pipeline.runner import TableResult, extract_table, read_table_checkpoint
+    from src.pipeline.spool import write_spool
+
+    config = _project_config()
+    table_cfg = config.table(table_name)
+    run_dir = _run_dir(table_name)
+    store = WatermarkStore(config.snowflake, cache_path=str(run_dir / "watermark.json"))
+    mysql_pool = get_mysql_pool(config.mysql)
+    result = TableResult(name=table_name, started_at=datetime.now(timezone.utc))
+    t0 = time.perf_counter()
+
+    try:
+        last_loaded, last_pk = read_table_checkpoint(table_name, config.snowflake, store, None, result)
+        with mysql_pool.connection() as mysql_conn:
+            chunks = extract_table(
+                table_cfg, config.mysql, last_loaded, last_pk, mysql_conn=mysql_conn, mysql_pool=mysql_pool
+            )
+            manifest = write_spool(chunks, str(run_dir / "chunks"), meta={
+                "table": table_name,
+                "last_loaded_at": last_loaded.isoformat() if last_loaded else None,
+            })
+    finally:
+        close_pools()
+    result.timings["extract"] = time.perf_counter() - t0
+
+    print(f"[EXTRACT] {table_name}: spooled {manifest['rows']} rows in {len(manifest['chunks'])} chunks")
+    return {
+        "table": table_name,
+        "run_dir": str(run_dir),
+        "rows": manifest["rows"],
+        "bytes": sum(c["bytes"] for c in manifest["chunks"]),
+        "started_at": result.started_at.isoformat(),
+        "timings": result.timings,
+    }
+
+
+@task
+def load(extracted: dict) -> dict:
+    from src.common import batch_sizer
+    from src.common.db_connections import close_pools, get_snowflake_pool
+    from src.load.row_hash import ROW_HASH_DIR, RowHashFilter
+    from src.load.watermark_utils import WatermarkStore
+    from src.pipeline.runner import TableResult, load_extracted
+    from src.pipeline.spool import read_manifest, read_spool
+
+    config = _project_config()
+    batch_sizer.configure(config.pipeline.get("batch_state"))
+    table_name = extracted["table"]
+    table_cfg = config.table(table_name)
+    run_dir = Path(extracted["run_dir"])
+    chunks_dir = str(run_dir / "chunks")
+
+    meta = read_manifest(chunks_dir)["meta"]
+    last_loaded = datetime.fromisoformat(meta["last_loaded_at"]) if meta["last_loaded_at"] else None
+    store = WatermarkStore(config.snowflake, cache_path=str(run_dir / "watermark.json"), prefer_cache=True)
+    row_hash_dir = config.pipeline.get("row_hash_dir", ROW_HASH_DIR)
+    row_filter = RowHashFilter(table_cfg, row_hash_dir) if table_cfg.get("row_hash") else None
+    result = TableResult(name=table_name)
+    t0 = time.perf_counter()
+
+    try:
+        with get_snowflake_pool(config.snowflake).connection() as sf_conn:
+            load_extracted(
+                table_cfg, config.snowflake, read_spool(chunks_dir), last_loaded, store, row_filter, sf_conn, result
+            )
+    finally:
+        if row_filter is not None:
+            print(row_filter.report())
+            result.skipped = row_filter.rows_skipped
+            row_filter.close()
+        batch_sizer.save(table_name)
+        close_pools()
+    result.timings["load"] = time.perf_counter() - t0
+
+    return {
+        **extracted,
+        "mode": result.mode,
+        "rows_extracted": extracted["rows"],
+        "rows": result.rows,
+        "skipped": result.skipped,
+        "timings": {**extracted["timings"], **result.timings},
+    }
+
+
+@task
+def commit_watermark(loaded: dict) -> dict:
+    from src.common.db_connections import close_pools
+    from src.load.watermark_utils import WatermarkStore
+    from src.pipeline import run_ledger
+    from src.pipeline.spool import remove_spool
+
+    config = _project_config()
+    run_dir = Path(loaded["run_dir"])
+    store = WatermarkStore(config.snowflake, cache_path=str(run_dir / "watermark.json"), prefer_cache=True)
+    ledger = run_ledger.RunLedger(config.snowflake, config.pipeline.get("run_log", run_ledger.RUN_LOG_PATH))
+    t0 = time.perf_counter()
+    try:
+        store.load()
+        store.flush()
+        timings = {**loaded["timings"], "commit": time.perf_counter() - t0}
+        # Queue time between the tasks is not counted.
+        duration = timings["extract"] + timings["load"] + timings["commit"]
+        run_ledger.record_and_check(ledger, [run_ledger.RunRecord(
+            run_id=get_current_context()["run_id"],
+            table_name=loaded["table"],
+            mode=loaded["mode"],
+            status="ok",
+            started_at=datetime.fromisoformat(loaded["started_at"]).astimezone(timezone.utc).replace(tzinfo=None),
+            duration_sec=round(duration, 4),
+            rows_extracted=loaded["rows_extracted"],
+            rows_merged=loaded["rows"],
+            rows_skipped=loaded["skipped"],
+            bytes=loaded["bytes"],
+            timings={phase: round(seconds, 4) for phase, seconds in timings.items()},
+        )], **run_ledger.slowdown_settings(config.pipeline))
+        ledger.push()
+    finally:
+        ledger.close()
+        close_pools()
+    remove_spool(str(run_dir))
+    # SPOOL_DIR/<run_id> goes with the last table of the run; rmdir fails
+    # while other tables still spool there.
+    try:
+        run_dir.parent.rmdir()
+    except OSError:
+        pass
+    return loaded
+
+
+def _tier_group(index: int, extract_slots: int, airflow_cfg: dict):
+    mysql_pool = airflow_cfg.get("mysql_pool", "etl_mysql_readers")
+    snowflake_pool = airflow_cfg.get("snowflake_pool", "etl_snowflake_writers")
+
+    @task_group(group_id=f"tier_{index}")
+    def tier(table_name: str):
+        extracted = extract.override(pool=mysql_pool, pool_slots=extract_slots)(table_name)
+        loaded = load.override(pool=snowflake_pool)(extracted)
+        return commit_watermark.override(pool=snowflake_pool)(loaded)
+
+    return tier
+
+
+_config = get_config(str(Path(PROJECT_DIR) / CONFIG_PATH))
+_airflow_cfg = _config.airflow
+_tables = {t["name"]: t for t in _config.tables}
+_tiers = dependency_tiers(build_dependency_graph(
+    list(_config.tables), str(Path(PROJECT_DIR) / _config.pipeline.get("source_ddl", SOURCE_DDL_PATH))
+))
+
+with DAG(
+    dag_id="etl_mysql_to_snowflake",
+    default_args=default_args,
+    description="Config-driven MySQL -> Snowflake RAW load",
+    start_date=datetime(2025, 1, 1),
+    schedule=_airflow_cfg.get("schedule", "@daily"),
+    catchup=False,
+    # Watermarks assume one run at a time.
+    max_active_runs=1,
+    tags=["etl"],
+) as dag:
+    previous = None
+    for i, names in enumerate(_tiers):
+        # A parallel (multi-connection) extract holds one pool slot per reader.
+        slots = min(
+            max(int(_tables[n].get("parallelism") or 1) for n in names),
+            int(_config.mysql.get("pool_size", 8)),
+        )
+        current = _tier_group(i, slots, _airflow_cfg).expand(table_name=names)
+        if previous is not None:
+            previous >> current
+        previous = current
@@ -44,3 +44,10 @@ CREATE TABLE order_items (
     CONSTRAINT fk_order_items_products
       FOREIGN KEY (product_id) REFERENCES products(product_id)
 );
+
+-- Incremental reads page by (updated_at, pk); catch-up slicing probes
+-- COUNT(*) over updated_at ranges.
+CREATE INDEX idx_customers_updated_at ON customers (updated_at, customer_id);
+CREATE INDEX idx_products_updated_at ON products (updated_at, product_id);
+CREATE INDEX idx_orders_updated_at ON orders (updated_at, order_id);
+CREATE INDEX idx_order_items_updated_at ON order_items (updated_at, order_item_id);
@@ -11,7 +11,8 @@ CREATE OR REPLACE TABLE RAW_CUSTOMERS (
     COUNTRY          STRING,
     CITY             STRING,
     STATUS           STRING,
-    UPDATED_AT       TIMESTAMP_NTZ
+    UPDATED_AT       TIMESTAMP_NTZ,
+    ROW_HASH         NUMBER(38,0)   -- fingerprint of the non-audit columns (src/load/row_hash.py)
 );
 
 -- RAW PRODUCTS
@@ -21,7 +22,8 @@ CREATE OR REPLACE TABLE RAW_PRODUCTS (
     CATEGORY         STRING,
     PRICE            NUMBER(10,2),
     CURRENCY         STRING,
-    UPDATED_AT       TIMESTAMP_NTZ
+    UPDATED_AT       TIMESTAMP_NTZ,
+    ROW_HASH         NUMBER(38,0)   -- fingerprint of the non-audit columns (src/load/row_hash.py)
 );
 
 -- RAW ORDERS
@@ -32,7 +34,8 @@ CREATE OR REPLACE TABLE RAW_ORDERS (
     ORDER_STATUS     STRING,
     TOTAL_AMOUNT     NUMBER(10,2),
     CURRENCY         STRING,
-    UPDATED_AT       TIMESTAMP_NTZ
+    UPDATED_AT       TIMESTAMP_NTZ,
+    ROW_HASH         NUMBER(38,0)   -- fingerprint of the non-audit columns (src/load/row_hash.py)
 );
 
 -- RAW ORDER ITEMS
@@ -43,5 +46,6 @@ CREATE OR REPLACE TABLE RAW_ORDER_ITEMS (
     QUANTITY         INT,
     UNIT_PRICE       NUMBER(10,2),
     CURRENCY         STRING,
-    UPDATED_AT       TIMESTAMP_NTZ
+    UPDATED_AT       TIMESTAMP_NTZ,
+    ROW_HASH         NUMBER(38,0)   -- fingerprint of the non-audit columns (src/load/row_hash.py)
 );
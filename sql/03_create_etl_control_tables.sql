@@ -4,5 +4,38 @@ USE SCHEMA RAW;
 CREATE OR REPLACE TABLE ETL_WATERMARK (
     TABLE_NAME      STRING NOT NULL,
     LAST_LOADED_AT  TIMESTAMP_NTZ,
+    LAST_LOADED_PK  VARIANT,        -- key of the last checkpointed row at LAST_LOADED_AT (array for composite keys)
+    BINLOG_FILE     STRING,         -- CDC tables: binlog position applied up to
+    BINLOG_POS      NUMBER(20,0),
     CONSTRAINT PK_ETL_WATERMARK PRIMARY KEY (TABLE_NAME)
 );
+
+-- Existing deployments:
+-- ALTER TABLE ETL_WATERMARK ADD COLUMN IF NOT EXISTS LAST_LOADED_PK VARIANT;
+-- LAST_LOADED_PK created as NUMBER(38,0) by an earlier version:
+-- ALTER TABLE ETL_WATERMARK RENAME COLUMN LAST_LOADED_PK TO LAST_LOADED_PK_NUM;
+-- ALTER TABLE ETL_WATERMARK ADD COLUMN LAST_LOADED_PK VARIANT;
+-- UPDATE ETL_WATERMARK SET LAST_LOADED_PK = TO_VARIANT(LAST_LOADED_PK_NUM);
+-- ALTER TABLE ETL_WATERMARK DROP COLUMN LAST_LOADED_PK_NUM;
+-- ALTER TABLE ETL_WATERMARK ADD COLUMN IF NOT EXISTS BINLOG_FILE STRING;
+-- ALTER TABLE ETL_WATERMARK ADD COLUMN IF NOT EXISTS BINLOG_POS NUMBER(20,0);
+
+-- One row per table per pipeline run (src/pipeline/run_ledger.py). The
+-- runner also keeps a SQLite mirror (pipeline.run_log) and re-sends rows
+-- that could not be written here on the next run.
+CREATE TABLE IF NOT EXISTS ETL_RUN_LOG (
+    RUN_ID           STRING NOT NULL,
+    TABLE_NAME       STRING NOT NULL,
+    MODE             STRING,         -- full / incremental / cdc / cdc-snapshot
+    STATUS           STRING,         -- ok / failed / skipped
+    STARTED_AT       TIMESTAMP_NTZ,  -- UTC
+    DURATION_SEC     FLOAT,
+    ROWS_EXTRACTED   NUMBER(38,0),   -- rows (CDC: binlog events) read from MySQL
+    ROWS_MERGED      NUMBER(38,0),   -- rows loaded into RAW
+    ROWS_SKIPPED     NUMBER(38,0),   -- unchanged rows dropped by the row-hash filter
+    ROWS_DELETED     NUMBER(38,0),
+    BYTES            NUMBER(38,0),   -- extracted bytes where measured (columnar batches, spool files)
+    TIMINGS          VARIANT,        -- {phase: seconds}: runner phases and instrumentation stages
+    ERROR            STRING,
+    CONSTRAINT PK_ETL_RUN_LOG PRIMARY KEY (RUN_ID, TABLE_NAME)
+);
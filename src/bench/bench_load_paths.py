@@ -0,0 +1,85 @@
+# src/bench/bench_load_paths.py
+
+"""
+Compare rows/sec of the executemany INSERT path against the bulk
+PUT + COPY INTO path, using the recording Snowflake stand-in.
+
+The stand-in charges each statement a round trip plus its payload size over
+the given bandwidth, so the numbers reflect network cost, not just the
+client-side CPU work. Use --latency-ms 0 --mbps 0 for CPU only.
+
+Usage:
+    python -m src.bench.bench_load_paths --rows 200000 --chunk-rows 10000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Iterator, List, Tuple
+
+from src.bench.stand_ins import RecordingSnowflakeCursor
+from src.load.snowflake_loader import copy_chunks_into, insert_chunks
+
+ORDER_ITEM_COLUMNS = [
+    "order_item_id", "order_id", "product_id", "quantity", "unit_price", "currency", "updated_at",
+]
+
+
+def synthetic_order_items(n_rows: int, chunk_rows: int) -> Iterator[Tuple[List[str], List[Tuple]]]:
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1)
+    batch = []
+    for i in range(1, n_rows + 1):
+        batch.append((
+            i,
+            i // 3 + 1,
+            rng.randint(1, 500),
+            rng.randint(1, 5),
+            Decimal(rng.randint(500, 50000)) / 100,
+            "USD",
+            start + timedelta(seconds=rng.randint(0, 63_000_000)),
+        ))
+        if len(batch) == chunk_rows:
+            yield ORDER_ITEM_COLUMNS, batch
+            batch = []
+    if batch:
+        yield ORDER_ITEM_COLUMNS, batch
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-rows", type=int, default=10_000)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="simulated round trip per statement")
+    parser.add_argument("--mbps", type=float, default=50.0, help="simulated upload bandwidth, megabits/sec")
+    args = parser.parse_args()
+
+    # Materialise once so data generation is not part of either timing.
+    chunks = list(synthetic_order_items(args.rows, args.chunk_rows))
+
+    results = {}
+    for name, load in (("executemany", insert_chunks), ("copy", copy_chunks_into)):
+        cur = RecordingSnowflakeCursor(
+            latency_s=args.latency_ms / 1000,
+            bytes_per_sec=args.mbps * 125_000 if args.mbps else None,
+        )
+        start = time.perf_counter()
+        total = load(cur, "RAW_ORDER_ITEMS", chunks)
+        elapsed = time.perf_counter() - start
+        results[name] = total / elapsed
+        print(f"[BENCH] {name:<12} {total} rows in {elapsed:.2f}s ({results[name]:,.0f} rows/sec, "
+              f"{cur.bytes_sent / 1e6:.1f} MB sent)")
+        if cur.puts:
+            stage, files = cur.puts[0]
+            size = sum(s for _, s in files)
+            print(f"[BENCH] {name:<12} PUT {len(files)} files ({size / 1e6:.1f} MB) to {stage}; "
+                  f"COPY INTO {cur.copies[0][0]}")
+
+    print(f"[BENCH] copy / executemany speedup: "
+          f"{results['copy'] / results['executemany']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+# src/bench/bench_pipeline.py
+
+"""
+Offline end-to-end benchmark: MySQL extract -> Snowflake load, with both
+ends replaced by SQLite stand-ins (src/bench/stand_ins.py).
+
+For each size it builds a source order_items table, then runs:
+
+- full           fetch_full_table -> full_load_to_raw
+- full_stream    iter_full_table -> full_load_chunks_to_raw
+- full_prefetch  the same through prefetch_chunks (depth 2), so extract
+                 and load overlap; extract_s is the time the load waited
+- incremental    fetch_incremental_rows -> incremental_upsert_to_raw
+                 (after updating 10% and adding 1% of the source rows)
+
+Each case runs --repeat times, each in a fresh process so its peak RSS is
+its own, and the fastest run is kept. Results
+(rows/sec, peak RSS, extract / load / total seconds, and the seconds /
+calls / rows of every instrumentation span the case recorded, e.g.
+extract.fetch, load.insert, load.merge) are written as JSON and, with
+--baseline, compared against a stored run: any case whose rows/sec dropped
+by more than --tolerance, or any span of it that got slower by more than
+--tolerance, is reported and the exit code is 1. Cases and spans that ran
+for under MIN_COMPARE_SECONDS in the baseline are not compared.
+
+Usage:
+    python -m src.bench.bench_pipeline --sizes 10k,100k,1M --out bench_results.json
+    python -m src.bench.bench_pipeline --sizes 10k,100k --baseline
+    python -m src.bench.bench_pipeline --sizes 10k,100k,1M --save-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from src.bench.bench_load_paths import ORDER_ITEM_COLUMNS, synthetic_order_items
+from src.bench.stand_ins import SQLiteMySQLConnection, SQLiteSnowflakeConnection, connect_sqlite
+
+BASELINE_PATH = "src/bench/baseline_pipeline.json"
+# Cases that took less than this in the baseline are too noisy to compare.
+MIN_COMPARE_SECONDS = 0.5
+CASES = ["full", "full_stream", "full_prefetch", "incremental"]
+
+SOURCE_DDL = """
+    CREATE TABLE order_items (
+        order_item_id INTEGER PRIMARY KEY,
+        order_id INTEGER,
+        product_id INTEGER,
+        quantity INTEGER,
+        unit_price DECIMAL,
+        currency TEXT,
+        updated_at TIMESTAMP
+    )
+"""
+RAW_DDL = """
+    CREATE TABLE RAW_ORDER_ITEMS (
+        ORDER_ITEM_ID INTEGER PRIMARY KEY,
+        ORDER_ID INTEGER,
+        PRODUCT_ID INTEGER,
+        QUANTITY INTEGER,
+        UNIT_PRICE DECIMAL,
+        CURRENCY TEXT,
+        UPDATED_AT TIMESTAMP
+    )
+"""
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower()
+    for suffix, factor in (("k", 1_000), ("m", 1_000_000)):
+        if text.endswith(suffix):
+            return int(float(text[:-1]) * factor)
+    return int(text)
+
+
+def bench_table_cfg(chunk_rows: int, load_method: str) -> Dict[str, Any]:
+    return {
+        "name": "order_items",
+        "source_table": "order_items",
+        "target_table": "RAW_ORDER_ITEMS",
+        "primary_key": "order_item_id",
+        "incremental_column": "updated_at",
+        "chunk_rows": chunk_rows,
+        "load_method": load_method,
+    }
+
+
+def build_source(path: Path, n_rows: int, chunk_rows: int) -> None:
+    db = connect_sqlite(str(path))
+    db.execute(SOURCE_DDL)
+    insert_sql = f"INSERT INTO order_items VALUES ({', '.join('?' * len(ORDER_ITEM_COLUMNS))})"
+    for _, batch in synthetic_order_items(n_rows, chunk_rows):
+        db.executemany(insert_sql, batch)
+    db.commit()
+    db.close()
+
+
+def build_raw(path: Path) -> None:
+    db = connect_sqlite(str(path))
+    db.execute(RAW_DDL)
+    db.commit()
+    db.close()
+
+
+def change_source(path: Path, n_rows: int) -> datetime:
+    """
+    Touch 10% of the rows and append 1% new ones, all stamped after the
+    current high-water mark. Returns that high-water mark.
+    """
+    db = connect_sqlite(str(path))
+    (watermark,) = db.execute("SELECT updated_at FROM order_items ORDER BY updated_at DESC LIMIT 1").fetchone()
+    changed_at = watermark + timedelta(minutes=1)
+    db.execute(
+        "UPDATE order_items SET quantity = quantity + 1, updated_at = ? WHERE order_item_id % 10 = 0",
+        (changed_at,),
+    )
+    new_rows = [
+        (n_rows + i, (n_rows + i) // 3 + 1, 1, 1, "9.99", "USD", changed_at)
+        for i in range(1, n_rows // 100 + 1)
+    ]
+    db.executemany(f"INSERT INTO order_items VALUES ({', '.join('?' * len(ORDER_ITEM_COLUMNS))})", new_rows)
+    db.commit()
+    db.close()
+    return watermark
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class _StageTimer:
+    """Accumulates the time spent inside next() of a chunk stream."""
+
+    def __init__(self):
+        self.seconds = 0.0
+
+    def wrap(self, chunks: Iterator) -> Iterator:
+        it = iter(chunks)
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(it)
+            except StopIteration:
+                self.seconds += time.perf_counter() - start
+                return
+            self.seconds += time.perf_counter() - start
+            yield chunk
+
+
+def run_case(case: str, source: str, raw: str, table_cfg: Dict[str, Any], since: Optional[datetime]) -> Dict[str, Any]:
+    """Run one extract -> load case; meant to execute in its own process."""
+    from src.common import batch_sizer, instrumentation
+    from src.extract.mysql_extractor import fetch_full_table, fetch_incremental_rows, iter_full_table, prefetch_chunks
+    from src.load.snowflake_loader import full_load_chunks_to_raw, full_load_to_raw, incremental_upsert_to_raw
+
+    # Batch sizes learned against SQLite must never reach the production
+    # state file (.etl_state/batch_sizes.json), nor seed the bench from it.
+    batch_sizer.configure(str(Path(raw).parent / "batch_sizes.json"))
+    my_conn = SQLiteMySQLConnection(source)
+    sf_conn = SQLiteSnowflakeConnection(raw)
+    log = io.StringIO()
+    spans_before = instrumentation.snapshot()
+    try:
+        with contextlib.redirect_stdout(log):
+            start = time.perf_counter()
+            if case == "full":
+                columns, rows = fetch_full_table(table_cfg, {}, conn=my_conn)
+                extract_s = time.perf_counter() - start
+                full_load_to_raw(columns, rows, table_cfg, {}, conn=sf_conn)
+                n_rows = len(rows)
+            elif case in ("full_stream", "full_prefetch"):
+                timer = _StageTimer()
+                chunks = iter_full_table(table_cfg, {}, conn=my_conn)
+                if case == "full_prefetch":
+                    chunks = prefetch_chunks(chunks, 2, table=table_cfg["name"])
+                chunks = timer.wrap(chunks)
+                n_rows = full_load_chunks_to_raw(chunks, table_cfg, {}, conn=sf_conn)
+                extract_s = timer.seconds
+            elif case == "incremental":
+                columns, rows = fetch_incremental_rows(table_cfg, {}, since, conn=my_conn)
+                extract_s = time.perf_counter() - start
+                incremental_upsert_to_raw(columns, rows, table_cfg, {}, conn=sf_conn)
+                n_rows = len(rows)
+            else:
+                raise ValueError(f"unknown case {case!r}")
+            total_s = time.perf_counter() - start
+    finally:
+        my_conn.close()
+        sf_conn.close()
+
+    return {
+        "case": case,
+        "rows": n_rows,
+        "load_method": table_cfg["load_method"],
+        "rows_per_sec": round(n_rows / total_s, 1) if total_s else None,
+        "peak_rss_mb": _peak_rss_mb(),
+        "stages": {
+            "extract_s": round(extract_s, 4),
+            "load_s": round(total_s - extract_s, 4),
+            "total_s": round(total_s, 4),
+        },
+        "spans": _span_deltas(spans_before, instrumentation.snapshot(), table_cfg["name"]),
+    }
+
+
+def _span_deltas(before: Dict, after: Dict, table: str) -> Dict[str, Dict[str, Any]]:
+    """{stage: seconds / calls / rows} recorded for `table` between two instrumentation snapshots."""
+    spans = {}
+    for (span_table, stage), stats in sorted(after.items()):
+        if span_table != table:
+            continue
+        prev = before.get((span_table, stage))
+        calls = stats.calls - (prev.calls if prev else 0)
+        if calls:
+            spans[stage] = {
+                "seconds": round(stats.seconds - (prev.seconds if prev else 0.0), 4),
+                "calls": calls,
+                "rows": stats.rows - (prev.rows if prev else 0),
+            }
+    return spans
+
+
+def run_size(n_rows: int, chunk_rows: int, load_method: str, work_dir: Path, repeat: int = 3) -> List[Dict[str, Any]]:
+    source = work_dir / f"source_{n_rows}.sqlite"
+    raw = work_dir / f"raw_{n_rows}.sqlite"
+    build_source(source, n_rows, chunk_rows)
+    build_raw(raw)
+    table_cfg = bench_table_cfg(chunk_rows, load_method)
+
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    since = None
+    for case in CASES:
+        if case == "incremental":
+            since = change_source(source, n_rows)
+        # Best of `repeat` runs, each in a fresh process; every case is
+        # idempotent against the RAW table, so reruns see the same work.
+        runs = []
+        for _ in range(repeat):
+            with ctx.Pool(1) as pool:
+                runs.append(pool.apply(run_case, (case, str(source), str(raw), table_cfg, since)))
+        result = max(runs, key=lambda r: r["rows_per_sec"] or 0)
+        result["size"] = n_rows
+        results.append(result)
+        print(
+            f"[BENCH] {n_rows:>10} {case:<12} {result['rows']:>10} rows "
+            f"{result['rows_per_sec']:>12,.0f} rows/sec  peak {result['peak_rss_mb']} MB  "
+            f"extract {result['stages']['extract_s']:.2f}s load {result['stages']['load_s']:.2f}s"
+        )
+    return results
+
+
+def compare_to_baseline(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Return one message per case, and per span of a case, that got slower
+    than baseline by more than `tolerance`.
+    """
+    key = lambda r: (r["case"], r["size"], r["load_method"])
+    expected = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        base = expected.get(key(r))
+        if base is None or not base["rows_per_sec"] or base["stages"]["total_s"] < MIN_COMPARE_SECONDS:
+            continue
+        ratio = r["rows_per_sec"] / base["rows_per_sec"]
+        print(f"[BENCH] {r['case']:<12} {r['size']:>10} {ratio:6.2f}x baseline")
+        if ratio < 1 - tolerance:
+            regressions.append(
+                f"{r['case']} @ {r['size']} rows: {r['rows_per_sec']:,.0f} rows/sec "
+                f"vs baseline {base['rows_per_sec']:,.0f} ({ratio:.2f}x)"
+            )
+        for stage, base_span in base.get("spans", {}).items():
+            span = r.get("spans", {}).get(stage)
+            if span is None or base_span["seconds"] < MIN_COMPARE_SECONDS:
+                continue
+            if span["seconds"] > base_span["seconds"] * (1 + tolerance):
+                regressions.append(
+                    f"{r['case']} @ {r['size']} rows: {stage} took {span['seconds']:.2f}s "
+                    f"vs baseline {base_span['seconds']:.2f}s"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10k,100k,1M", help="comma-separated row counts, e.g. 10k,100k,1M,10M")
+    parser.add_argument("--chunk-rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest is reported")
+    parser.add_argument("--load-method", choices=["insert", "copy"], default="insert")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", nargs="?", const=BASELINE_PATH,
+                        help=f"compare against this results JSON (default path: {BASELINE_PATH})")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed rows/sec drop vs baseline (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE_PATH,
+                        help="also write the results as the new baseline")
+    parser.add_argument("--work-dir", help="directory for the SQLite files (default: a temp dir)")
+    args = parser.parse_args()
+
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="etl_bench_", dir=args.work_dir) as tmp:
+        for n_rows in sizes:
+            results.extend(run_size(n_rows, args.chunk_rows, args.load_method, Path(tmp), args.repeat))
+
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "chunk_rows": args.chunk_rows,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n")
+        print(f"[BENCH] Results written to {args.out}")
+    else:
+        print(text)
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(text + "\n")
+        print(f"[BENCH] Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for msg in regressions:
+            print(f"[BENCH] REGRESSION {msg}")
+        if regressions:
+            sys.exit(1)
+        print("[BENCH] No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# src/bench/bench_record_batch.py
+
+"""
+Memory per million order_items rows: List[Tuple] vs RecordBatch.
+
+Rows are generated with the same shape and value types the MySQL connector
+returns for order_items (ints, Decimal unit_price, 'USD' currency,
+datetime updated_at). Memory is measured with tracemalloc while the whole
+dataset is held, which is what a buffered extract or load queue does.
+
+Usage:
+    python -m src.bench.bench_record_batch --rows 1000000 --chunk-rows 100000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import List, Tuple
+
+from src.bench.bench_load_paths import ORDER_ITEM_COLUMNS, synthetic_order_items
+from src.common.record_batch import RecordBatch
+
+
+def _measure(build) -> Tuple[object, int, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, current, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    def tuple_lists() -> List[List[Tuple]]:
+        return [batch for _, batch in synthetic_order_items(args.rows, args.chunk_rows)]
+
+    def record_batches() -> List[RecordBatch]:
+        # Convert chunk by chunk so the tuples of only one chunk are alive.
+        return [RecordBatch.from_rows(cols, batch) for cols, batch in synthetic_order_items(args.rows, args.chunk_rows)]
+
+    lists, list_bytes, list_s = _measure(tuple_lists)
+    del lists
+    batches, batch_bytes, batch_s = _measure(record_batches)
+
+    per_million = 1_000_000 / args.rows
+    print(f"[BENCH] rows: {args.rows}, columns: {', '.join(ORDER_ITEM_COLUMNS)}")
+    print(f"[BENCH] List[Tuple]  {list_bytes * per_million / 1e6:8.1f} MB per 1M rows (built in {list_s:.1f}s)")
+    print(f"[BENCH] RecordBatch  {batch_bytes * per_million / 1e6:8.1f} MB per 1M rows (built in {batch_s:.1f}s)")
+    print(f"[BENCH] reduction    {list_bytes / batch_bytes:8.1f}x")
+    print(f"[BENCH] {batches[0].describe()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# src/bench/bench_row_converter.py
+
+"""
+CPU cost of binding order_items rows for executemany: the connector's
+generic per-value conversion on raw rows vs the precompiled RowConverter
+(src/load/row_converter.py) followed by the same binding.
+
+Binding is rendered with snowflake-connector-python's own converter when it
+is installed (to_snowflake -> escape -> quote, as client-side binding does)
+and with the stand-in's renderer (src/bench/stand_ins.py) otherwise. Both
+List[Tuple] and RecordBatch (columnar: true) chunks are measured; the
+converted rows are checked to bind to the same SQL text.
+
+Usage:
+    python -m src.bench.bench_row_converter --rows 200000 --chunk-rows 10000
+"""
+
+import argparse
+import time
+from typing import Callable, List, Tuple
+
+from src.bench.bench_load_paths import synthetic_order_items
+from src.common.record_batch import RecordBatch
+from src.load.row_converter import row_converter_for
+
+
+def _binder() -> Tuple[str, Callable]:
+    try:
+        from snowflake.connector.converter import SnowflakeConverter
+    except ImportError:
+        from src.bench.stand_ins import _literal
+        return "stand-in", _literal
+    converter = SnowflakeConverter()
+
+    def bind(value):
+        return converter.quote(converter.escape(converter.to_snowflake(value)))
+
+    return "snowflake-connector", bind
+
+
+def _bind_rows(rows, bind: Callable) -> int:
+    n = 0
+    for row in rows:
+        n += len(",".join([bind(v) for v in row]))
+    return n
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    args = parser.parse_args()
+
+    binder_name, bind = _binder()
+    chunks = list(synthetic_order_items(args.rows, args.chunk_rows))
+    columns = chunks[0][0]
+    converter = row_converter_for("RAW_ORDER_ITEMS", columns)
+    record_batches = [RecordBatch.from_rows(cols, batch) for cols, batch in chunks]
+
+    # Converted rows must bind to the same SQL text (the stand-in adds a
+    # ::TIMESTAMP_NTZ cast to datetimes that the connector does not).
+    sample = chunks[0][1][:1000]
+    for raw, converted in zip(sample, converter.convert(sample)):
+        for a, b in zip(raw, converted):
+            assert bind(a).split("::")[0] == bind(b), (a, b)
+
+    def generic(batches: List) -> Callable[[], None]:
+        return lambda: [_bind_rows(batch, bind) for batch in batches]
+
+    def precompiled(batches: List) -> Callable[[], None]:
+        return lambda: [_bind_rows(converter.convert(batch), bind) for batch in batches]
+
+    print(f"[BENCH] rows: {args.rows}, binding: {binder_name}, converter: {converter.describe()}")
+    for label, batches in (("List[Tuple]", [b for _, b in chunks]), ("RecordBatch", record_batches)):
+        before = _time(generic(batches), args.repeat)
+        after = _time(precompiled(batches), args.repeat)
+        print(f"[BENCH] {label:<12} generic     {args.rows / before:12,.0f} rows/sec ({before:.2f}s)")
+        print(f"[BENCH] {label:<12} precompiled {args.rows / after:12,.0f} rows/sec ({after:.2f}s)")
+        print(f"[BENCH] {label:<12} speedup     {before / after:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
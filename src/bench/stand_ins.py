@@ -0,0 +1,358 @@
+# src/bench/stand_ins.py
+
+"""
+Local stand-ins for the MySQL and Snowflake connectors, used to exercise and
+benchmark the extract and load paths without a database server or a
+Snowflake account.
+
+- RecordingSnowflakeConnection only records what would be sent.
+- SQLiteMySQLConnection / SQLiteSnowflakeConnection run the statements the
+  pipeline issues against local SQLite files, translating the few
+  Snowflake-only statements (TRUNCATE, CREATE OR REPLACE TEMP TABLE, MERGE,
+  PUT, COPY INTO) into SQLite equivalents.
+"""
+
+import csv
+import glob
+import gzip
+import io
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.load.snowflake_loader import CSV_NULL
+
+_PUT_RE = re.compile(r"PUT\s+'file://(?P<src>[^']+)'\s+'(?P<stage>[^']+)'", re.IGNORECASE)
+_COPY_RE = re.compile(r"COPY\s+INTO\s+(?P<table>\S+)", re.IGNORECASE)
+
+
+def _literal(value: Any) -> str:
+    """Render a value the way client-side (pyformat) binding does."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float, Decimal)):
+        return str(value)
+    if isinstance(value, datetime):
+        return f"'{value.isoformat(sep=' ')}'::TIMESTAMP_NTZ"
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+class RecordingSnowflakeCursor:
+    """
+    Cursor that records every statement instead of sending it anywhere.
+
+    - executemany renders the multi-row INSERT text like the real connector's
+      client-side binding, so its CPU cost is comparable.
+    - PUT resolves the local file glob and records (path, size) per file.
+    - COPY INTO records the target table and the files staged so far.
+
+    When `latency_s` / `bytes_per_sec` are set, every statement sleeps for a
+    round trip plus the time to ship its payload (INSERT text or PUT file
+    bytes), which is what dominates the real executemany path.
+    """
+
+    def __init__(self, latency_s: float = 0.0, bytes_per_sec: Optional[float] = None):
+        self.latency_s = latency_s
+        self.bytes_per_sec = bytes_per_sec
+        self.bytes_sent = 0
+        self.statements: List[Tuple[str, Any]] = []
+        self.puts: List[Tuple[str, List[Tuple[str, int]]]] = []
+        self.copies: List[Tuple[str, str]] = []
+        self.rows_inserted = 0
+        self.description = None
+        self._result: List[Tuple] = []
+
+    def _round_trip(self, payload_bytes: int) -> None:
+        self.bytes_sent += payload_bytes
+        delay = self.latency_s
+        if self.bytes_per_sec:
+            delay += payload_bytes / self.bytes_per_sec
+        if delay:
+            time.sleep(delay)
+
+    def execute(self, sql: str, params: Optional[Tuple] = None):
+        self.statements.append((sql, params))
+        self._result = []
+        payload = len(sql)
+        put = _PUT_RE.search(sql)
+        if put:
+            files = [(f, os.path.getsize(f)) for f in sorted(glob.glob(put.group("src")))]
+            self.puts.append((put.group("stage"), files))
+            self._result = [(os.path.basename(f), size) for f, size in files]
+            payload += sum(size for _, size in files)
+        copy = _COPY_RE.search(sql)
+        if copy:
+            self.copies.append((copy.group("table"), sql))
+        self._round_trip(payload)
+        return self
+
+    def executemany(self, sql: str, rows) -> None:
+        values = ",".join("(" + ",".join(_literal(v) for v in row) + ")" for row in rows)
+        head = sql.split("VALUES")[0]
+        statement = f"{head}VALUES {values}"
+        self.statements.append((statement, None))
+        self.rows_inserted += len(rows)
+        self._round_trip(len(statement))
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return self._result
+
+    def close(self) -> None:
+        pass
+
+
+class RecordingSnowflakeConnection:
+    """Connection stand-in handing out a single shared RecordingSnowflakeCursor."""
+
+    def __init__(self, **cursor_kwargs):
+        self.cursor_obj = RecordingSnowflakeCursor(**cursor_kwargs)
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    def cursor(self) -> RecordingSnowflakeCursor:
+        return self.cursor_obj
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+# ---------------------------------------------------------------------------
+# SQLite-backed stand-ins
+# ---------------------------------------------------------------------------
+
+def _register_sqlite_types() -> None:
+    # Declared DECIMAL / TIMESTAMP columns come back as the types the real
+    # connectors return, so the pipeline code sees the same values.
+    sqlite3.register_adapter(Decimal, str)
+    sqlite3.register_adapter(datetime, lambda v: v.isoformat(sep=" "))
+    sqlite3.register_converter("DECIMAL", lambda b: Decimal(b.decode()))
+    sqlite3.register_converter("TIMESTAMP", lambda b: datetime.fromisoformat(b.decode()))
+
+
+def connect_sqlite(path: str) -> sqlite3.Connection:
+    _register_sqlite_types()
+    return sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+
+
+class _SQLiteCursor:
+    """DB-API cursor over sqlite3 that accepts the connectors' %s placeholders."""
+
+    def __init__(self, db: sqlite3.Connection):
+        self._db = db
+        self._cur = db.cursor()
+
+    @property
+    def description(self):
+        return self._cur.description
+
+    @property
+    def rowcount(self) -> int:
+        return self._cur.rowcount
+
+    def execute(self, sql: str, params: Optional[Tuple] = None):
+        self._cur.execute(sql.replace("%s", "?"), tuple(params or ()))
+        return self
+
+    def executemany(self, sql: str, rows) -> None:
+        self._cur.executemany(sql.replace("%s", "?"), rows)
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchmany(self, size: int):
+        return self._cur.fetchmany(size)
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def close(self) -> None:
+        self._cur.close()
+
+
+class SQLiteMySQLConnection:
+    """
+    mysql.connector-like connection over a SQLite file, for injecting into
+    the extractors (conn=...). Accepts cursor(buffered=False) and provides
+    ping() / consume_results() like the real connector.
+    """
+
+    def __init__(self, path: str):
+        self._db = connect_sqlite(path)
+
+    def cursor(self, buffered: bool = True, **_kwargs) -> _SQLiteCursor:
+        return _SQLiteCursor(self._db)
+
+    def ping(self, reconnect: bool = False) -> None:
+        self._db.execute("SELECT 1")
+
+    def consume_results(self) -> None:
+        pass
+
+    def commit(self) -> None:
+        self._db.commit()
+
+    def rollback(self) -> None:
+        self._db.rollback()
+
+    def close(self) -> None:
+        self._db.close()
+
+
+_TRUNCATE_RE = re.compile(r"^\s*TRUNCATE\s+TABLE\s+(?P<table>\S+)\s*$", re.IGNORECASE)
+_TEMP_TABLE_RE = re.compile(
+    r"^\s*CREATE\s+OR\s+REPLACE\s+TEMP(?:ORARY)?\s+TABLE\s+(?P<table>\S+)\s+AS\s+(?P<select>.+)$",
+    re.IGNORECASE | re.DOTALL,
+)
+_MERGE_RE = re.compile(
+    r"MERGE\s+INTO\s+(?P<target>\S+)\s+AS\s+t\s+USING\s+"
+    r"(?:\(\s*SELECT\s+\*\s+FROM\s+(?P<dedup_source>\S+)\s+QUALIFY\s+ROW_NUMBER\(\)\s+OVER\s*"
+    r"\(\s*PARTITION\s+BY\s+[^)]*?\s+ORDER\s+BY\s+(?P<order>\w+)\s+DESC\s*\)\s*=\s*1\s*\)"
+    r"|(?P<source>\S+))\s+AS\s+s\s+"
+    r"ON\s+(?P<on>.*?)\s+WHEN\s+"
+    r"(?:MATCHED\s+AND\s+\((?P<changed>.*?)\)\s+THEN)?.*?"
+    r"INSERT\s*\((?P<columns>[^)]*)\)",
+    re.IGNORECASE | re.DOTALL,
+)
+_ON_KEY_RE = re.compile(r"t\.(\w+)\s*=\s*s\.\w+")
+_CHANGED_RE = re.compile(r"EQUAL_NULL\(t\.(\w+)", re.IGNORECASE)
+_COPY_FROM_RE = re.compile(
+    r"COPY\s+INTO\s+(?P<table>\S+)\s*\((?P<columns>[^)]*)\)\s+FROM\s+'(?P<prefix>[^']+?)/?'",
+    re.IGNORECASE,
+)
+_TRANSACTION_RE = re.compile(r"^\s*(BEGIN|COMMIT|ROLLBACK)\s*;?\s*$", re.IGNORECASE)
+
+
+class SQLiteSnowflakeCursor(_SQLiteCursor):
+    """
+    Cursor that runs the loader's Snowflake SQL against SQLite:
+
+    - TRUNCATE TABLE               -> DELETE FROM
+    - CREATE OR REPLACE TEMP TABLE -> DROP + CREATE TEMP TABLE
+    - MERGE (build_merge_sql)      -> INSERT ... ON CONFLICT (keys) DO UPDATE ... WHERE changed,
+                                      QUALIFY dedupe as a ROW_NUMBER() subquery
+    - PUT                          -> remember the local files per stage prefix
+    - COPY INTO ... FROM prefix    -> parse those CSV files and INSERT them
+    - BEGIN / COMMIT / ROLLBACK    -> sqlite transaction control
+
+    Target tables need a PRIMARY KEY / UNIQUE constraint on the merge keys for the MERGE shim.
+    """
+
+    def __init__(self, conn: "SQLiteSnowflakeConnection"):
+        super().__init__(conn._db)
+        self._conn = conn
+
+    def execute(self, sql: str, params: Optional[Tuple] = None):
+        tx = _TRANSACTION_RE.match(sql)
+        if tx:
+            verb = tx.group(1).upper()
+            if verb == "COMMIT":
+                self._db.commit()
+            elif verb == "ROLLBACK":
+                self._db.rollback()
+            # BEGIN: sqlite3 opens the transaction on the next write.
+            return self
+
+        truncate = _TRUNCATE_RE.match(sql)
+        if truncate:
+            return super().execute(f"DELETE FROM {truncate.group('table')}")
+
+        temp = _TEMP_TABLE_RE.match(sql)
+        if temp:
+            super().execute(f"DROP TABLE IF EXISTS temp.{temp.group('table')}")
+            return super().execute(f"CREATE TEMP TABLE {temp.group('table')} AS {temp.group('select')}")
+
+        merge = _MERGE_RE.search(sql)
+        if merge:
+            return super().execute(self._merge_as_upsert(merge))
+
+        put = _PUT_RE.search(sql)
+        if put:
+            files = sorted(glob.glob(put.group("src")))
+            # The loader removes its temp dir after PUT, so keep the bytes.
+            staged = self._conn.stages.setdefault(put.group("stage").rstrip("/"), [])
+            for f in files:
+                with open(f, "rb") as fh:
+                    staged.append(fh.read())
+            return self
+
+        copy = _COPY_FROM_RE.search(sql)
+        if copy:
+            self._copy_into(copy)
+            return self
+
+        return super().execute(sql, params)
+
+    @staticmethod
+    def _merge_as_upsert(merge: re.Match) -> str:
+        target = merge.group("target")
+        columns = [c.strip() for c in merge.group("columns").split(",")]
+        keys = _ON_KEY_RE.findall(merge.group("on"))
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c not in keys)
+        select_cols = ", ".join(columns)
+
+        if merge.group("dedup_source"):
+            # QUALIFY ROW_NUMBER() ... = 1 -> window function in a subquery
+            source = (
+                f"(SELECT *, ROW_NUMBER() OVER (PARTITION BY {', '.join(keys)} "
+                f"ORDER BY {merge.group('order')} DESC) AS _rn FROM {merge.group('dedup_source')}) "
+                f"WHERE _rn = 1"
+            )
+        else:
+            # "WHERE true" disambiguates the upsert clause from a join (SQLite docs).
+            source = f"{merge.group('source')} WHERE true"
+
+        sql = f"INSERT INTO {target} ({select_cols}) SELECT {select_cols} FROM {source} ON CONFLICT ({', '.join(keys)}) "
+        if not updates:
+            return sql + "DO NOTHING"
+        sql += f"DO UPDATE SET {updates}"
+        if merge.group("changed"):
+            changed = _CHANGED_RE.findall(merge.group("changed"))
+            sql += " WHERE " + " OR ".join(f"{target}.{c} IS NOT excluded.{c}" for c in changed)
+        return sql
+
+    def _copy_into(self, copy: re.Match) -> None:
+        columns = [c.strip() for c in copy.group("columns").split(",")]
+        sql = (
+            f"INSERT INTO {copy.group('table')} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})"
+        )
+        for payload in self._conn.stages.pop(copy.group("prefix").rstrip("/"), []):
+            reader = csv.reader(io.StringIO(gzip.decompress(payload).decode("utf-8"), newline=""))
+            self._cur.executemany(sql, ([None if v == CSV_NULL else v for v in row] for row in reader))
+
+
+class SQLiteSnowflakeConnection:
+    """snowflake.connector-like connection over a SQLite file."""
+
+    def __init__(self, path: str):
+        self._db = connect_sqlite(path)
+        self.stages: Dict[str, List[bytes]] = {}
+
+    def cursor(self) -> SQLiteSnowflakeCursor:
+        return SQLiteSnowflakeCursor(self)
+
+    def is_closed(self) -> bool:
+        return False
+
+    def commit(self) -> None:
+        self._db.commit()
+
+    def rollback(self) -> None:
+        self._db.rollback()
+
+    def close(self) -> None:
+        self._db.close()
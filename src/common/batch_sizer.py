@@ -0,0 +1,251 @@
+# src/common/batch_sizer.py
+
+"""
+Adaptive batch sizing for executemany() inserts.
+
+One executemany() of a whole chunk is a single multi-row INSERT: too many
+rows and the statement blows past the server's size limit (Snowflake's
+statement size, MySQL's max_allowed_packet), too few and every batch pays a
+full round trip. BatchSizer picks the size per table from what it observes:
+
+- every batch's latency and rows/sec is recorded;
+- while throughput holds up (within TOLERANCE of the best recent rate) and
+  the batch finished under `max_seconds`, the size grows by `step_rows`
+  (additive increase);
+- when throughput drops or a batch is too slow, the size is cut by
+  DECREASE (multiplicative decrease) and the baseline rate reset, so it
+  probes upward again from there;
+- a batch rejected as too large halves the size, is retried, and lowers the
+  ceiling for that table so later runs stay under it.
+
+The size with the best observed throughput (and the learned ceiling) is
+saved per table in a small JSON file, BATCH_STATE_PATH by default or
+pipeline.batch_state, and is where the next run starts.
+
+    sizer = sizer_for(table_cfg)
+    executemany_batched(cur, insert_sql, rows, sizer)   # every chunk
+    batch_sizer.save(table_cfg["name"])                 # once the table is done
+
+Bounds per table (config.yaml): insert_batch_rows (starting size),
+insert_batch_min, insert_batch_max, insert_batch_max_seconds.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+BATCH_STATE_PATH = ".etl_state/batch_sizes.json"
+
+DEFAULT_INITIAL_ROWS = 1_000
+DEFAULT_MIN_ROWS = 100
+DEFAULT_MAX_ROWS = 16_384
+DEFAULT_MAX_SECONDS = 30.0
+
+# Additive step as a fraction of the starting size.
+STEP_FRACTION = 0.5
+# Multiplicative decrease on a slowdown or a rejected batch.
+DECREASE = 0.5
+# A batch is a slowdown when its rows/sec falls this far below the best
+# rate since the last decrease; smaller drops are treated as noise.
+TOLERANCE = 0.25
+
+# Error text of statements rejected for their size (Snowflake, MySQL).
+_TOO_LARGE_MARKERS = (
+    "max_allowed_packet",
+    "packet bigger than",
+    "too large",
+    "too long",
+    "exceeds the maximum",
+    "exceeded the maximum",
+)
+
+_state_lock = threading.Lock()
+_state_path = BATCH_STATE_PATH
+_sizers: Dict[str, "BatchSizer"] = {}
+_sizers_lock = threading.Lock()
+
+
+def is_too_large_error(exc: BaseException) -> bool:
+    """True when `exc` looks like a statement rejected for its size."""
+    if getattr(exc, "errno", None) == 1153:  # ER_NET_PACKET_TOO_LARGE
+        return True
+    message = str(exc).lower()
+    return any(marker in message for marker in _TOO_LARGE_MARKERS)
+
+
+def read_state(path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    state_file = Path(path or _state_path)
+    if not state_file.exists():
+        return {}
+    try:
+        return json.loads(state_file.read_text())
+    except ValueError:
+        # A corrupt state file only costs the remembered sizes.
+        print(f"[BATCH] Ignoring unreadable batch state {state_file}")
+        return {}
+
+
+class BatchSizer:
+    """AIMD controller for the batch size of one table's inserts."""
+
+    def __init__(
+        self,
+        key: str,
+        initial_rows: int = DEFAULT_INITIAL_ROWS,
+        min_rows: int = DEFAULT_MIN_ROWS,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        max_seconds: float = DEFAULT_MAX_SECONDS,
+        state_path: Optional[str] = None,
+    ):
+        if not 0 < min_rows <= max_rows:
+            raise ValueError(f"Batch bounds for {key} must satisfy 0 < min <= max (got {min_rows}, {max_rows})")
+        self.key = key
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.max_seconds = max_seconds
+        self.state_path = state_path or _state_path
+        self.step_rows = max(1, int(initial_rows * STEP_FRACTION))
+        self._lock = threading.Lock()
+
+        saved = read_state(self.state_path).get(key) or {}
+        self.ceiling = max(min_rows, min(max_rows, int(saved.get("ceiling") or max_rows)))
+        self.size = self._clamp(int(saved.get("batch_rows") or initial_rows))
+        self.start_size = self.size
+        self.batches = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self._baseline = 0.0
+        self.best_rate = 0.0
+        self.best_rows = self.size
+
+    def _clamp(self, rows: int) -> int:
+        return max(self.min_rows, min(self.ceiling, rows))
+
+    def record(self, rows: int, seconds: float) -> None:
+        """Feed one batch's outcome and adjust the size for the next one."""
+        with self._lock:
+            self.batches += 1
+            self.rows += rows
+            self.seconds += seconds
+            if seconds <= 0:
+                return
+            rate = rows / seconds
+            if rows >= self.size and rate > self.best_rate:
+                self.best_rate, self.best_rows = rate, rows
+
+            if seconds > self.max_seconds or (self._baseline and rate < self._baseline * (1 - TOLERANCE)):
+                self.size = self._clamp(int(self.size * DECREASE))
+                self._baseline = rate
+            elif rows >= self.size:
+                # Only full batches probe upward: a chunk's short tail says
+                # nothing about how a bigger batch would do.
+                self._baseline = max(self._baseline, rate)
+                self.size = self._clamp(self.size + self.step_rows)
+
+    def too_large(self, rows: int) -> None:
+        """A batch of `rows` was rejected for its size: shrink and cap below it."""
+        with self._lock:
+            self.ceiling = max(self.min_rows, min(self.ceiling, rows - 1))
+            self.size = self._clamp(int(rows * DECREASE))
+            self.best_rows = min(self.best_rows, self.ceiling)
+            self._baseline = 0.0
+
+    def summary(self) -> str:
+        rate = self.rows / self.seconds if self.seconds > 0 else 0.0
+        return (
+            f"[BATCH] {self.key}: {self.rows} rows in {self.batches} batches ({rate:,.0f} rows/sec), "
+            f"size {self.start_size} -> {self.size}, best {self.best_rows} at {self.best_rate:,.0f} rows/sec"
+        )
+
+    def save(self) -> None:
+        """Remember the best size (and learned ceiling) for the next run."""
+        if not self.batches:
+            return
+        with _state_lock:
+            state = read_state(self.state_path)
+            state[self.key] = {
+                "batch_rows": self.best_rows,
+                "rows_per_sec": round(self.best_rate, 1),
+                "ceiling": self.ceiling,
+                "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }
+            path = Path(self.state_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(state, indent=2, sort_keys=True))
+            tmp.replace(path)
+
+
+def configure(state_path: Optional[str] = None) -> None:
+    """Set the state file used by sizer_for(); forgets the sizers built so far."""
+    global _state_path
+    with _sizers_lock:
+        _state_path = state_path or BATCH_STATE_PATH
+        _sizers.clear()
+
+
+def save(key: str) -> None:
+    """
+    Save the sizer of `key` (a table name), once per table run: loads call
+    executemany_batched per chunk and only the best size matters.
+    """
+    with _sizers_lock:
+        sizer = _sizers.get(key)
+    if sizer is not None:
+        sizer.save()
+
+
+def report() -> None:
+    """Print a summary line per sizer that inserted anything in this process."""
+    with _sizers_lock:
+        sizers = sorted(_sizers.values(), key=lambda z: z.key)
+    for sizer in sizers:
+        if sizer.batches:
+            print(sizer.summary())
+
+
+def sizer_for(table_cfg: Dict[str, Any], key: Optional[str] = None) -> BatchSizer:
+    """
+    The process-wide sizer of a configured table, so every chunk (and every
+    staging insert) of the table keeps adapting the same size within a run.
+    """
+    key = key or table_cfg["name"]
+    with _sizers_lock:
+        sizer = _sizers.get(key)
+        if sizer is None:
+            sizer = BatchSizer(
+                key,
+                initial_rows=int(table_cfg.get("insert_batch_rows", DEFAULT_INITIAL_ROWS)),
+                min_rows=int(table_cfg.get("insert_batch_min", DEFAULT_MIN_ROWS)),
+                max_rows=int(table_cfg.get("insert_batch_max", DEFAULT_MAX_ROWS)),
+                max_seconds=float(table_cfg.get("insert_batch_max_seconds", DEFAULT_MAX_SECONDS)),
+                state_path=_state_path,
+            )
+            _sizers[key] = sizer
+        return sizer
+
+
+def executemany_batched(cur, sql: str, rows: Sequence, sizer: BatchSizer) -> int:
+    """
+    cur.executemany(sql, ...) over `rows` in batches sized by `sizer`.
+    A batch rejected as too large is retried smaller; a multi-row INSERT is
+    one statement, so nothing of it was applied. Returns the rows written.
+    """
+    done, total = 0, len(rows)
+    while done < total:
+        batch = rows[done:done + sizer.size]
+        start = time.perf_counter()
+        try:
+            cur.executemany(sql, batch)
+        except Exception as exc:
+            if len(batch) <= sizer.min_rows or not is_too_large_error(exc):
+                raise
+            sizer.too_large(len(batch))
+            print(f"[BATCH] {sizer.key}: batch of {len(batch)} rows rejected as too large, retrying with {sizer.size}")
+            continue
+        sizer.record(len(batch), time.perf_counter() - start)
+        done += len(batch)
+    return total
@@ -1,9 +1,181 @@
+import threading
 import yaml
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
-def load_config(config_path: str = "configs/config.yaml") -> dict:
+DEFAULT_CONFIG_PATH = "configs/config.yaml"
+
+_REQUIRED_KEYS = {
+    "mysql": ("host", "port", "database", "user", "password"),
+    "snowflake": ("account", "user", "password", "warehouse", "database", "schema_raw"),
+}
+_REQUIRED_TABLE_KEYS = ("name", "source_table", "target_table", "primary_key", "incremental_column")
+_LOAD_METHODS = ("insert", "copy")
+_EXTRACT_MODES = ("poll", "cdc")
+
+
+def load_config(config_path: str = DEFAULT_CONFIG_PATH) -> dict:
     config_file = Path(config_path)
     if not config_file.exists():
         raise FileNotFoundError(f"Config file not found at {config_path}")
     with open(config_file, "r") as f:
         return yaml.safe_load(f)
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """
+    Parsed and validated config.yaml.
+
+    The sections stay plain dicts because that is what the extract / load
+    functions take (`mysql_cfg`, `sf_cfg`, `table_cfg`); this object only
+    guarantees they are present and well-formed, and is built once per
+    process by get_config().
+    """
+
+    path: str
+    mysql: Dict[str, Any]
+    snowflake: Dict[str, Any]
+    pipeline: Dict[str, Any]
+    airflow: Dict[str, Any]
+    tables: Tuple[Dict[str, Any], ...]
+
+    @property
+    def table_names(self) -> List[str]:
+        return [t["name"] for t in self.tables]
+
+    def table(self, name: str) -> Dict[str, Any]:
+        for t in self.tables:
+            if t["name"] == name:
+                return t
+        raise ValueError(f"Unknown table {name!r} (configured: {', '.join(self.table_names)})")
+
+    def select_tables(self, names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Config entries of `names` in config order (all tables when empty)."""
+        if not names:
+            return list(self.tables)
+        unknown = set(names) - set(self.table_names)
+        if unknown:
+            raise ValueError(f"Unknown tables: {sorted(unknown)}")
+        return [t for t in self.tables if t["name"] in names]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The config in load_config() shape, for run_pipeline() and friends."""
+        return {
+            "mysql": self.mysql,
+            "snowflake": self.snowflake,
+            "pipeline": self.pipeline,
+            "airflow": self.airflow,
+            "tables": list(self.tables),
+        }
+
+
+def _key_columns(t: Dict[str, Any]) -> List[str]:
+    pk = t.get("primary_key") or []
+    return [c.strip() for c in pk.split(",") if c.strip()] if isinstance(pk, str) else list(pk)
+
+
+def _columns_problems(t: Dict[str, Any]) -> List[str]:
+    """A table's `columns` projection must be a list of names that keeps its key and watermark columns."""
+    if "columns" not in t:
+        return []
+    columns = t["columns"]
+    if not isinstance(columns, list) or not columns or not all(isinstance(c, str) for c in columns):
+        return ["columns must be a non-empty list of column names"]
+    problems = []
+    lowered = [c.lower() for c in columns]
+    if len(set(lowered)) != len(lowered):
+        problems.append("columns lists a column twice")
+    for c in _key_columns(t) + [t.get("incremental_column")]:
+        if c and c.lower() not in lowered:
+            problems.append(f"columns must include {c}")
+    return problems
+
+
+def validate_config(raw: Any) -> List[str]:
+    """Every problem found in a loaded config; empty when it is usable."""
+    if not isinstance(raw, dict):
+        return ["config must be a mapping"]
+    problems: List[str] = []
+    for section, keys in _REQUIRED_KEYS.items():
+        cfg = raw.get(section)
+        if not isinstance(cfg, dict):
+            problems.append(f"missing section '{section}'")
+            continue
+        problems.extend(f"{section}.{k} is required" for k in keys if k not in cfg)
+    for section in ("pipeline", "airflow"):
+        if raw.get(section) is not None and not isinstance(raw[section], dict):
+            problems.append(f"'{section}' must be a mapping")
+
+    tables = raw.get("tables")
+    if not isinstance(tables, list) or not tables:
+        problems.append("'tables' must be a non-empty list")
+        return problems
+    seen = set()
+    for i, t in enumerate(tables):
+        if not isinstance(t, dict):
+            problems.append(f"tables[{i}] must be a mapping")
+            continue
+        label = t.get("name") or f"tables[{i}]"
+        problems.extend(f"{label}: {k} is required" for k in _REQUIRED_TABLE_KEYS if not t.get(k))
+        if t.get("name") in seen:
+            problems.append(f"{label}: duplicate table name")
+        seen.add(t.get("name"))
+        if t.get("load_method", "insert") not in _LOAD_METHODS:
+            problems.append(f"{label}: load_method must be one of {', '.join(_LOAD_METHODS)}")
+        if t.get("extract_mode", "poll") not in _EXTRACT_MODES:
+            problems.append(f"{label}: extract_mode must be one of {', '.join(_EXTRACT_MODES)}")
+        for k in ("chunk_rows", "parallelism", "insert_batch_rows", "insert_batch_min", "insert_batch_max"):
+            if k in t and (not isinstance(t[k], int) or t[k] < 1):
+                problems.append(f"{label}: {k} must be a positive integer")
+        problems.extend(f"{label}: {p}" for p in _columns_problems(t))
+        pipeline = raw.get("pipeline") if isinstance(raw.get("pipeline"), dict) else {}
+        if len(_key_columns(t)) > 1 and t.get("delete_sync", pipeline.get("delete_sync", False)):
+            problems.append(f"{label}: delete_sync needs a single-column primary_key (set delete_sync: false)")
+        lo, hi = t.get("insert_batch_min"), t.get("insert_batch_max")
+        if isinstance(lo, int) and isinstance(hi, int) and lo > hi:
+            problems.append(f"{label}: insert_batch_min must not exceed insert_batch_max")
+    for t in tables:
+        if isinstance(t, dict):
+            for dep in t.get("depends_on") or []:
+                if dep not in seen:
+                    problems.append(f"{t.get('name')}: depends_on unknown table '{dep}'")
+    return problems
+
+
+def parse_config(raw: Any, path: str = DEFAULT_CONFIG_PATH) -> PipelineConfig:
+    problems = validate_config(raw)
+    if problems:
+        raise ValueError(f"Invalid config {path}:\n  " + "\n  ".join(problems))
+    return PipelineConfig(
+        path=path,
+        mysql=raw["mysql"],
+        snowflake=raw["snowflake"],
+        pipeline=raw.get("pipeline") or {},
+        airflow=raw.get("airflow") or {},
+        tables=tuple(raw["tables"]),
+    )
+
+
+_cache: Dict[str, Tuple[float, PipelineConfig]] = {}
+_cache_lock = threading.Lock()
+
+
+def get_config(config_path: str = DEFAULT_CONFIG_PATH) -> PipelineConfig:
+    """
+    The validated config at `config_path`, parsed once per process (and
+    again only if the file changes). Raises ValueError listing every problem
+    when the config is invalid.
+    """
+    config_file = Path(config_path)
+    if not config_file.exists():
+        raise FileNotFoundError(f"Config file not found at {config_path}")
+    key = str(config_file.resolve())
+    mtime = config_file.stat().st_mtime
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, parse_config(load_config(config_path), config_path))
+            _cache[key] = cached
+        return cached[1]
@@ -1,17 +1,29 @@
-from typing import Any, Dict
-import mysql.connector
-import snowflake.connector
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+# The connector packages are imported on first use: each takes a while to
+# import, and most entry points only talk to one of the two databases.
 
 def get_mysql_conn(mysql_cfg: Dict[str, Any]):
+    import mysql.connector
+
     return mysql.connector.connect(
         host=mysql_cfg["host"],
         port=mysql_cfg["port"],
         user=mysql_cfg["user"],
         password=mysql_cfg["password"],
         database=mysql_cfg["database"],
+        # Every statement sees current data. With the connector's default
+        # (autocommit off, REPEATABLE READ) a pooled connection would keep
+        # the snapshot of its first read for every later checkout.
+        autocommit=True,
     )
 
-def get_snowflake_conn(sf_cfg: Dict[str, Any]):
+def get_snowflake_conn(sf_cfg: Dict[str, Any], keep_alive: bool = False):
+    import snowflake.connector
+
     return snowflake.connector.connect(
         user=sf_cfg["user"],
         password=sf_cfg["password"],
@@ -19,4 +31,222 @@ def get_snowflake_conn(sf_cfg: Dict[str, Any]):
         warehouse=sf_cfg["warehouse"],
         database=sf_cfg["database"],
         schema=sf_cfg["schema_raw"],
+        # Heartbeats keep a pooled session from expiring while it sits idle.
+        client_session_keep_alive=keep_alive,
     )
+
+
+@contextmanager
+def mysql_session(mysql_cfg: Dict[str, Any], conn=None) -> Iterator[Any]:
+    """
+    Yield `conn` if the caller injected one (left open), otherwise open a
+    fresh MySQL connection and close it on exit.
+    """
+    if conn is not None:
+        yield conn
+        return
+    conn = get_mysql_conn(mysql_cfg)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def snowflake_session(sf_cfg: Dict[str, Any], conn=None) -> Iterator[Any]:
+    """
+    Yield `conn` if the caller injected one (left open), otherwise open a
+    fresh Snowflake connection and close it on exit.
+    """
+    if conn is not None:
+        yield conn
+        return
+    conn = get_snowflake_conn(sf_cfg)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _mysql_is_alive(conn) -> bool:
+    try:
+        conn.ping(reconnect=False)
+        return True
+    except Exception:
+        return False
+
+
+def _snowflake_is_alive(conn) -> bool:
+    try:
+        return not conn.is_closed()
+    except Exception:
+        return False
+
+
+class ConnectionPool:
+    """
+    Small thread-safe connection pool.
+
+    - connection() checks a connection out as a context manager and returns
+      it to the pool on exit (rolling back if the block raised). With
+      `reset_on_release` it is always rolled back, so a transaction the
+      block left open never reaches the next checkout; a connection that
+      cannot be reset is closed instead of pooled.
+    - At most `max_size` connections exist at once; further checkouts wait
+      up to `checkout_timeout` seconds.
+    - Idle connections unused for `idle_timeout` seconds are closed.
+    - `health_check` runs on every checkout; dead connections are discarded
+      and replaced transparently.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        health_check: Callable[[Any], bool],
+        name: str,
+        max_size: int = 4,
+        idle_timeout: float = 300.0,
+        checkout_timeout: float = 600.0,
+        reset_on_release: bool = False,
+    ):
+        self.factory = factory
+        self.health_check = health_check
+        self.name = name
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.reset_on_release = reset_on_release
+        self.opened = 0
+        self._idle: List[Tuple[Any, float]] = []
+        self._size = 0
+        self._cond = threading.Condition()
+
+    def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_timeout
+        keep = []
+        for conn, last_used in self._idle:
+            if last_used < cutoff:
+                self._discard(conn)
+            else:
+                keep.append((conn, last_used))
+        self._idle = keep
+
+    def _discard(self, conn) -> None:
+        self._size -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._cond:
+            while True:
+                self._evict_idle()
+                while self._idle:
+                    conn, _ = self._idle.pop()
+                    if self.health_check(conn):
+                        return conn
+                    print(f"[POOL] {self.name}: discarding dead connection")
+                    self._discard(conn)
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"[POOL] {self.name}: no connection available within {self.checkout_timeout}s")
+                self._cond.wait(remaining)
+
+        # Open outside the lock: a Snowflake login can take seconds.
+        try:
+            conn = self.factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        self.opened += 1
+        return conn
+
+    def _release(self, conn, reset: bool) -> None:
+        healthy = True
+        if reset:
+            try:
+                conn.rollback()
+            except Exception:
+                healthy = False
+        with self._cond:
+            if healthy:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                print(f"[POOL] {self.name}: discarding connection that could not be reset")
+                self._discard(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn = self._acquire()
+        failed = False
+        try:
+            yield conn
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._release(conn, failed or self.reset_on_release)
+
+    def close(self) -> None:
+        with self._cond:
+            for conn, _ in self._idle:
+                self._discard(conn)
+            self._idle = []
+
+
+_pools: Dict[Tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(key: Tuple, make: Callable[[], ConnectionPool]) -> ConnectionPool:
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = make()
+        return pool
+
+
+def get_mysql_pool(mysql_cfg: Dict[str, Any]) -> ConnectionPool:
+    """
+    Process-wide MySQL pool for this config (sized by mysql_cfg['pool_size']).
+    """
+    key = ("mysql", mysql_cfg["host"], mysql_cfg["port"], mysql_cfg["user"], mysql_cfg["database"])
+    return _get_pool(key, lambda: ConnectionPool(
+        lambda: get_mysql_conn(mysql_cfg),
+        _mysql_is_alive,
+        name="mysql",
+        max_size=int(mysql_cfg.get("pool_size", 8)),
+        idle_timeout=float(mysql_cfg.get("pool_idle_timeout", 300)),
+        reset_on_release=True,
+    ))
+
+
+def get_snowflake_pool(sf_cfg: Dict[str, Any]) -> ConnectionPool:
+    """
+    Process-wide Snowflake pool for this config (sized by sf_cfg['pool_size']).
+    Sessions are opened with client_session_keep_alive so they survive idling.
+    """
+    key = ("snowflake", sf_cfg["account"], sf_cfg["user"], sf_cfg["warehouse"], sf_cfg["database"])
+    return _get_pool(key, lambda: ConnectionPool(
+        lambda: get_snowflake_conn(sf_cfg, keep_alive=True),
+        _snowflake_is_alive,
+        name="snowflake",
+        max_size=int(sf_cfg.get("pool_size", 4)),
+        idle_timeout=float(sf_cfg.get("pool_idle_timeout", 900)),
+    ))
+
+
+def close_pools() -> None:
+    """Close every idle pooled connection (call once at the end of a run)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
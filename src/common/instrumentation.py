@@ -0,0 +1,332 @@
+# src/common/instrumentation.py
+
+"""
+Lightweight per-stage instrumentation for the extract / load / watermark
+code paths.
+
+    with span("extract.fetch", table="orders") as s:
+        batch = cur.fetchmany(n)
+        s.add(rows=len(batch))
+
+Every span records its wall time plus row and byte counters into a
+process-wide registry (aggregated per (table, stage)). Spans opened without
+`table` inherit it from the enclosing span on the same thread, so the
+runner's per-table span labels everything beneath it.
+
+Outputs, all off by default (configure() or env vars):
+
+- ETL_METRICS_LOG       JSON-lines file, one event per finished span.
+- ETL_PROM_TEXTFILE     Prometheus textfile (node_exporter textfile
+                        collector), written by flush().
+- ETL_PROFILE           comma-separated stages to profile, or "all".
+                        Each profiled stage gets a cProfile dump and a
+                        tracemalloc peak / top allocations report per table.
+- ETL_PROFILE_DIR       where profile output goes (default .etl_state/profiles).
+
+tracemalloc is process-wide: with several tables loading at once, the peaks
+of concurrent stages overlap. Profile with --workers 1 for clean numbers.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+PROFILE_DIR = ".etl_state/profiles"
+
+METRICS_LOG_ENV = "ETL_METRICS_LOG"
+PROM_TEXTFILE_ENV = "ETL_PROM_TEXTFILE"
+PROFILE_ENV = "ETL_PROFILE"
+PROFILE_DIR_ENV = "ETL_PROFILE_DIR"
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+    alloc_peak: int = 0
+
+
+class Span:
+    """Handle yielded by span(); add() counts rows / bytes handled in it."""
+
+    __slots__ = ("stage", "table", "rows", "bytes", "fields")
+
+    def __init__(self, stage: str, table: Optional[str], fields: Dict[str, Any]):
+        self.stage = stage
+        self.table = table
+        self.rows = 0
+        self.bytes = 0
+        self.fields = fields
+
+    def add(self, rows: int = 0, nbytes: int = 0) -> None:
+        self.rows += rows
+        self.bytes += nbytes
+
+
+class Instrumentation:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats: Dict[Tuple[str, str], StageStats] = {}
+        # One profiler per (table, stage, thread); merged when dumped.
+        self._profiles: Dict[Tuple[str, str, str], cProfile.Profile] = {}
+        self._alloc_snapshots: Dict[Tuple[str, str], tracemalloc.Snapshot] = {}
+        self._log_file = None
+        self.metrics_log: Optional[Path] = None
+        self.prom_textfile: Optional[Path] = None
+        self.profile_stages: Set[str] = set()
+        self.profile_dir = Path(PROFILE_DIR)
+        self.configure()
+
+    def configure(
+        self,
+        metrics_log: Optional[str] = None,
+        prom_textfile: Optional[str] = None,
+        profile: Optional[str] = None,
+        profile_dir: Optional[str] = None,
+    ) -> None:
+        """
+        Set the outputs. Environment variables win over arguments, so a run
+        can be profiled without touching config.yaml.
+        """
+        metrics_log = os.environ.get(METRICS_LOG_ENV) or metrics_log
+        prom_textfile = os.environ.get(PROM_TEXTFILE_ENV) or prom_textfile
+        profile = os.environ.get(PROFILE_ENV) or profile
+        profile_dir = os.environ.get(PROFILE_DIR_ENV) or profile_dir
+
+        with self._lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+            self.metrics_log = Path(metrics_log) if metrics_log else None
+            self.prom_textfile = Path(prom_textfile) if prom_textfile else None
+            self.profile_stages = {s.strip() for s in (profile or "").split(",") if s.strip()}
+            self.profile_dir = Path(profile_dir or PROFILE_DIR)
+
+    def _thread_state(self) -> threading.local:
+        local = self._local
+        if not hasattr(local, "tables"):
+            local.tables = []
+            local.profiling = False
+        return local
+
+    def current_table(self) -> Optional[str]:
+        tables = self._thread_state().tables
+        return tables[-1] if tables else None
+
+    @contextmanager
+    def table_scope(self, table: Optional[str]) -> Iterator[None]:
+        """Label spans opened inside the block (on this thread) with `table`, without timing it."""
+        tables = self._thread_state().tables
+        tables.append(table)
+        try:
+            yield
+        finally:
+            tables.pop()
+
+    def _profiled(self, stage: str) -> bool:
+        return bool(self.profile_stages) and ("all" in self.profile_stages or stage in self.profile_stages)
+
+    @contextmanager
+    def span(self, stage: str, table: Optional[str] = None, **fields: Any) -> Iterator[Span]:
+        table = table or self.current_table()
+        s = Span(stage, table, fields)
+        local = self._thread_state()
+        local.tables.append(table)
+
+        profiler = None
+        trace_alloc = False
+        if self._profiled(stage) and not local.profiling:
+            # One cProfile per thread at a time; nested profiled stages are
+            # folded into the outer one.
+            local.profiling = True
+            profiler = self._profile_for(stage, table)
+            trace_alloc = True
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+            tracemalloc.reset_peak()
+            profiler.enable()
+
+        start = time.perf_counter()
+        try:
+            yield s
+        finally:
+            seconds = time.perf_counter() - start
+            alloc_peak = 0
+            if profiler is not None:
+                profiler.disable()
+                local.profiling = False
+            if trace_alloc:
+                alloc_peak = tracemalloc.get_traced_memory()[1]
+                key = (table or "", stage)
+                # Snapshots are slow; keep one from the worst span per stage,
+                # taken outside the lock.
+                with self._lock:
+                    worst = alloc_peak > self._stats.get(key, StageStats()).alloc_peak
+                if worst:
+                    snap = tracemalloc.take_snapshot()
+                    with self._lock:
+                        self._alloc_snapshots[key] = snap
+            local.tables.pop()
+            self._record(s, seconds, alloc_peak)
+
+    def _profile_for(self, stage: str, table: Optional[str]) -> cProfile.Profile:
+        with self._lock:
+            key = (table or "", stage, threading.current_thread().name)
+            profiler = self._profiles.get(key)
+            if profiler is None:
+                profiler = self._profiles[key] = cProfile.Profile()
+            return profiler
+
+    def _record(self, s: Span, seconds: float, alloc_peak: int) -> None:
+        with self._lock:
+            stats = self._stats.setdefault((s.table or "", s.stage), StageStats())
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.rows += s.rows
+            stats.bytes += s.bytes
+            stats.alloc_peak = max(stats.alloc_peak, alloc_peak)
+
+            if self.metrics_log is not None:
+                if self._log_file is None:
+                    self.metrics_log.parent.mkdir(parents=True, exist_ok=True)
+                    self._log_file = open(self.metrics_log, "a", encoding="utf-8")
+                event = {
+                    "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                    "event": "span",
+                    "stage": s.stage,
+                    "table": s.table,
+                    "seconds": round(seconds, 6),
+                    "rows": s.rows,
+                    "bytes": s.bytes,
+                    "thread": threading.current_thread().name,
+                }
+                if alloc_peak:
+                    event["alloc_peak_bytes"] = alloc_peak
+                event.update(s.fields)
+                self._log_file.write(json.dumps(event, default=str) + "\n")
+
+    def snapshot(self) -> Dict[Tuple[str, str], StageStats]:
+        """Copy of the aggregated {(table, stage): StageStats} so far."""
+        with self._lock:
+            return {k: StageStats(**vars(v)) for k, v in self._stats.items()}
+
+    def write_prometheus_textfile(self, path: Optional[str] = None) -> Optional[Path]:
+        """
+        Write the aggregated stats in Prometheus text format. The file is
+        replaced atomically, as the node_exporter textfile collector expects.
+        """
+        target = Path(path) if path else self.prom_textfile
+        if target is None:
+            return None
+        stats = self.snapshot()
+        lines: List[str] = []
+
+        def _family(name: str, help_text: str, attr: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for (table, stage), st in sorted(stats.items()):
+                lines.append(f'{name}{{table="{table}",stage="{stage}"}} {getattr(st, attr)}')
+
+        _family("etl_stage_seconds", "Wall time spent in the stage during the last run.", "seconds")
+        _family("etl_stage_calls", "Number of spans recorded for the stage during the last run.", "calls")
+        _family("etl_stage_rows", "Rows handled by the stage during the last run.", "rows")
+        _family("etl_stage_bytes", "Bytes handled by the stage during the last run.", "bytes")
+
+        lines.append("# HELP etl_stage_rows_per_second Rows per second of wall time in the stage.")
+        lines.append("# TYPE etl_stage_rows_per_second gauge")
+        for (table, stage), st in sorted(stats.items()):
+            if st.rows and st.seconds > 0:
+                rate = st.rows / st.seconds
+                lines.append(f'etl_stage_rows_per_second{{table="{table}",stage="{stage}"}} {rate:.1f}')
+
+        lines.append("# HELP etl_last_run_timestamp_seconds Unix time the metrics were written.")
+        lines.append("# TYPE etl_last_run_timestamp_seconds gauge")
+        lines.append(f"etl_last_run_timestamp_seconds {time.time():.0f}")
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(target.suffix + ".tmp")
+        tmp.write_text("\n".join(lines) + "\n")
+        tmp.replace(target)
+        return target
+
+    def dump_profiles(self) -> List[Path]:
+        """Write one .prof (pstats) and one .alloc.txt file per profiled (table, stage)."""
+        with self._lock:
+            profiles = dict(self._profiles)
+            snapshots = dict(self._alloc_snapshots)
+            peaks = {key: self._stats[key].alloc_peak for key in snapshots if key in self._stats}
+            self._profiles.clear()
+            self._alloc_snapshots.clear()
+        if not profiles:
+            return []
+
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        merged: Dict[Tuple[str, str], pstats.Stats] = {}
+        for (table, stage, _thread), profiler in sorted(profiles.items()):
+            if (table, stage) in merged:
+                merged[(table, stage)].add(profiler)
+            else:
+                merged[(table, stage)] = pstats.Stats(profiler)
+
+        written = []
+        for (table, stage), stats in sorted(merged.items()):
+            # Stage names contain dots, so build the file names by hand.
+            base = f"{stamp}_{table or 'all'}_{stage}"
+            prof_path = self.profile_dir / f"{base}.prof"
+            stats.dump_stats(str(prof_path))
+            written.append(prof_path)
+            snap = snapshots.get((table, stage))
+            if snap is not None:
+                peak = peaks.get((table, stage), 0)
+                top = snap.statistics("lineno")[:25]
+                report = [f"# {table} {stage}: traced peak {peak / 1e6:.1f} MB (process-wide)"]
+                report += [str(stat) for stat in top]
+                alloc_path = self.profile_dir / f"{base}.alloc.txt"
+                alloc_path.write_text("\n".join(report) + "\n")
+                written.append(alloc_path)
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return written
+
+    def flush(self) -> None:
+        """Write the Prometheus textfile and profiles, and close the JSON log."""
+        path = self.write_prometheus_textfile()
+        if path is not None:
+            print(f"[METRICS] Prometheus metrics written to {path}")
+        for p in self.dump_profiles():
+            print(f"[METRICS] Profile written to {p}")
+        with self._lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+
+    def reset(self) -> None:
+        """Forget the stats of the last run (after flush()), so the next run starts from zero."""
+        with self._lock:
+            self._stats.clear()
+            self._profiles.clear()
+            self._alloc_snapshots.clear()
+
+
+_instrumentation = Instrumentation()
+
+span = _instrumentation.span
+table_scope = _instrumentation.table_scope
+configure = _instrumentation.configure
+snapshot = _instrumentation.snapshot
+write_prometheus_textfile = _instrumentation.write_prometheus_textfile
+flush = _instrumentation.flush
+reset = _instrumentation.reset
@@ -0,0 +1,562 @@
+# src/common/record_batch.py
+
+"""
+Columnar batch container passed between extract and load.
+
+A RecordBatch stores each column in a typed, contiguous buffer (stdlib
+`array`) instead of one Python object per value:
+
+- ints            -> int64 array
+- floats          -> float64 array
+- Decimals        -> int64 array of scaled integers + a scale
+- datetimes       -> int64 array of microseconds since 1970-01-01
+- low-cardinality strings (country, status, currency, ...)
+                  -> small int codes + a dictionary of distinct values
+- other strings   -> Arrow-style utf-8 data buffer + int64 offsets
+
+NULLs are tracked in a validity bitmap (one bit per row) that only exists
+when the column has NULLs. Anything that does not fit a typed column falls
+back to a plain Python list.
+
+RecordBatch is also a read-only Sequence of row tuples, so it can be used
+anywhere a List[Tuple] batch is expected (executemany, checkpointing);
+rows are rebuilt on access. Slicing and take() stay columnar, so the row
+hash filter and the row converter hand RecordBatches on and rows are only
+built once, by the connector.
+
+write_batch_file() / map_batch_file() store a batch as one file of raw
+column buffers; mapping it back gives a RecordBatch whose columns are
+memoryviews over the mmap'd file, so nothing is copied until values are
+read. Object columns are stored as JSON with tagged values (encode_value),
+never pickled: spool files are read back by later runs, possibly on other
+hosts.
+"""
+
+import base64
+import json
+import mmap
+import sys
+from array import array
+from collections.abc import Sequence
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+EPOCH = datetime(1970, 1, 1)
+_ONE_MICRO = timedelta(microseconds=1)
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+# Strings are dictionary-encoded when the batch has at most this many
+# distinct values and they repeat on average at least twice.
+DICTIONARY_MAX_DISTINCT = 65535
+
+
+def encode_value(value: Any) -> Any:
+    """JSON-safe form of a column value; decode_value() reverses it."""
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, timedelta):
+        return {"$seconds": value.total_seconds()}
+    if isinstance(value, time):
+        return {"$time": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"$decimal": str(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {"$bytes": base64.b64encode(bytes(value)).decode("ascii")}
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    encoded = encode_value(value)
+    if encoded is value:
+        raise TypeError(f"cannot spool a {type(value).__name__} value")
+    return encoded
+
+
+def decode_value(value: Any) -> Any:
+    if not isinstance(value, dict) or len(value) != 1:
+        return value
+    (tag, raw), = value.items()
+    if tag == "$datetime":
+        return datetime.fromisoformat(raw)
+    if tag == "$date":
+        return date.fromisoformat(raw)
+    if tag == "$seconds":
+        return timedelta(seconds=raw)
+    if tag == "$time":
+        return time.fromisoformat(raw)
+    if tag == "$decimal":
+        return Decimal(raw)
+    if tag == "$bytes":
+        return base64.b64decode(raw)
+    return value
+
+
+def _validity(values: List[Any]) -> Optional[bytearray]:
+    """Bitmap with bit i set when values[i] is not None, or None if no NULLs."""
+    if all(v is not None for v in values):
+        return None
+    bits = bytearray((len(values) + 7) // 8)
+    for i, v in enumerate(values):
+        if v is not None:
+            bits[i >> 3] |= 1 << (i & 7)
+    return bits
+
+
+class Column:
+    kind = "object"
+
+    def __init__(self, length: int, validity: Optional[bytearray]):
+        self.length = length
+        self.validity = validity
+
+    def __len__(self) -> int:
+        return self.length
+
+    def is_null(self, i: int) -> bool:
+        return self.validity is not None and not (self.validity[i >> 3] >> (i & 7)) & 1
+
+    def _nulls_nbytes(self) -> int:
+        return len(self.validity) if self.validity is not None else 0
+
+    def get(self, i: int) -> Any:
+        raise NotImplementedError
+
+    def to_pylist(self) -> List[Any]:
+        return [self.get(i) for i in range(self.length)]
+
+    def to_text(self, null: str) -> List[str]:
+        return [null if v is None else str(v) for v in self.to_pylist()]
+
+    def _take_validity(self, indices: Sequence) -> Optional[bytearray]:
+        if self.validity is None:
+            return None
+        bits = bytearray((len(indices) + 7) // 8)
+        for j, i in enumerate(indices):
+            if not self.is_null(i):
+                bits[j >> 3] |= 1 << (j & 7)
+        return bits
+
+    def take(self, indices: Sequence) -> "Column":
+        """New column of the values at `indices`, in that order."""
+        raise NotImplementedError
+
+    @property
+    def nbytes(self) -> int:
+        raise NotImplementedError
+
+
+class ObjectColumn(Column):
+    kind = "object"
+
+    def __init__(self, values: List[Any]):
+        super().__init__(len(values), None)
+        self.values = list(values)
+
+    def get(self, i: int) -> Any:
+        return self.values[i]
+
+    def to_pylist(self) -> List[Any]:
+        return list(self.values)
+
+    def take(self, indices: Sequence) -> "ObjectColumn":
+        values = self.values
+        return ObjectColumn([values[i] for i in indices])
+
+    @property
+    def nbytes(self) -> int:
+        # Pointer array only; the objects themselves are not counted.
+        return 8 * self.length
+
+
+class _ArrayColumn(Column):
+    def __init__(self, data: array, validity: Optional[bytearray]):
+        super().__init__(len(data), validity)
+        self.data = data
+
+    def _take_data(self, indices: Sequence) -> array:
+        data = self.data
+        # Mapped batch files hold memoryviews, which name their type `format`.
+        typecode = data.typecode if isinstance(data, array) else data.format
+        return array(typecode, [data[i] for i in indices])
+
+    def take(self, indices: Sequence) -> "_ArrayColumn":
+        return type(self)(self._take_data(indices), self._take_validity(indices))
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.itemsize * len(self.data) + self._nulls_nbytes()
+
+
+class Int64Column(_ArrayColumn):
+    kind = "int64"
+
+    def get(self, i: int) -> Optional[int]:
+        return None if self.is_null(i) else self.data[i]
+
+    def to_pylist(self) -> List[Optional[int]]:
+        if self.validity is None:
+            return self.data.tolist()
+        return super().to_pylist()
+
+
+class Float64Column(Int64Column):
+    kind = "float64"
+
+
+class DecimalColumn(_ArrayColumn):
+    kind = "decimal"
+
+    def __init__(self, data: array, validity: Optional[bytearray], scale: int):
+        super().__init__(data, validity)
+        self.scale = scale
+
+    def take(self, indices: Sequence) -> "DecimalColumn":
+        return DecimalColumn(self._take_data(indices), self._take_validity(indices), self.scale)
+
+    def get(self, i: int) -> Optional[Decimal]:
+        if self.is_null(i):
+            return None
+        return Decimal(self.data[i]).scaleb(-self.scale)
+
+    def to_text(self, null: str) -> List[str]:
+        scale = self.scale
+        out = []
+        for i, v in enumerate(self.data):
+            if self.is_null(i):
+                out.append(null)
+            elif scale == 0:
+                out.append(str(v))
+            else:
+                digits = str(abs(v)).rjust(scale + 1, "0")
+                sign = "-" if v < 0 else ""
+                out.append(f"{sign}{digits[:-scale]}.{digits[-scale:]}")
+        return out
+
+
+class TimestampColumn(_ArrayColumn):
+    kind = "timestamp"
+
+    def get(self, i: int) -> Optional[datetime]:
+        if self.is_null(i):
+            return None
+        return EPOCH + timedelta(microseconds=self.data[i])
+
+    def to_text(self, null: str) -> List[str]:
+        return [null if v is None else v.isoformat(sep=" ") for v in self.to_pylist()]
+
+
+class DictionaryColumn(Column):
+    kind = "dictionary"
+
+    def __init__(self, codes: array, dictionary: List[str], validity: Optional[bytearray]):
+        super().__init__(len(codes), validity)
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def get(self, i: int) -> Optional[str]:
+        return None if self.is_null(i) else self.dictionary[self.codes[i]]
+
+    def to_pylist(self) -> List[Optional[str]]:
+        values = [self.dictionary[c] for c in self.codes]
+        if self.validity is not None:
+            values = [None if self.is_null(i) else v for i, v in enumerate(values)]
+        return values
+
+    def to_text(self, null: str) -> List[str]:
+        # Each distinct value is handled once, then looked up by code.
+        return [null if v is None else v for v in self.to_pylist()]
+
+    def take(self, indices: Sequence) -> "DictionaryColumn":
+        codes = self.codes
+        typecode = codes.typecode if isinstance(codes, array) else codes.format
+        return DictionaryColumn(array(typecode, [codes[i] for i in indices]), self.dictionary, self._take_validity(indices))
+
+    @property
+    def nbytes(self) -> int:
+        dict_bytes = sum(len(s.encode("utf-8")) for s in self.dictionary)
+        return self.codes.itemsize * len(self.codes) + dict_bytes + self._nulls_nbytes()
+
+
+class StringColumn(Column):
+    kind = "string"
+
+    def __init__(self, offsets: array, data: bytes, validity: Optional[bytearray]):
+        super().__init__(len(offsets) - 1, validity)
+        self.offsets = offsets
+        self.data = data
+
+    def get(self, i: int) -> Optional[str]:
+        if self.is_null(i):
+            return None
+        # str() rather than .decode() so memory-mapped buffers work too.
+        return str(self.data[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def to_text(self, null: str) -> List[str]:
+        return [null if v is None else v for v in self.to_pylist()]
+
+    def take(self, indices: Sequence) -> "StringColumn":
+        offsets, data = self.offsets, self.data
+        new_offsets = array("q", [0])
+        parts = []
+        pos = 0
+        for i in indices:
+            part = bytes(data[offsets[i]:offsets[i + 1]])
+            parts.append(part)
+            pos += len(part)
+            new_offsets.append(pos)
+        return StringColumn(new_offsets, b"".join(parts), self._take_validity(indices))
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.itemsize * len(self.offsets) + len(self.data) + self._nulls_nbytes()
+
+
+def build_column(values: List[Any]) -> Column:
+    """Pick the most compact column type that round-trips `values` exactly."""
+    kinds = {type(v) for v in values if v is not None}
+    if len(kinds) != 1:
+        return ObjectColumn(values)
+    kind = kinds.pop()
+    validity = _validity(values)
+
+    try:
+        if kind is int:
+            return Int64Column(array("q", [0 if v is None else v for v in values]), validity)
+
+        if kind is float:
+            return Float64Column(array("d", [0.0 if v is None else v for v in values]), validity)
+
+        if kind is Decimal:
+            if not all(v.is_finite() for v in values if v is not None):
+                return ObjectColumn(values)
+            scale = max(max(-v.as_tuple().exponent, 0) for v in values if v is not None)
+            scaled = [0 if v is None else int(v.scaleb(scale)) for v in values]
+            return DecimalColumn(array("q", scaled), validity, scale)
+
+        if kind is datetime:
+            if any(v.tzinfo is not None for v in values if v is not None):
+                return ObjectColumn(values)
+            micros = [0 if v is None else (v - EPOCH) // _ONE_MICRO for v in values]
+            return TimestampColumn(array("q", micros), validity)
+
+        if kind is str:
+            return _build_string_column(values, validity)
+
+    except OverflowError:
+        # Value outside int64 (huge ints, very wide decimals).
+        pass
+
+    return ObjectColumn(values)
+
+
+def _build_string_column(values: List[Optional[str]], validity: Optional[bytearray]) -> Column:
+    lookup: Dict[str, int] = {}
+    codes = []
+    for v in values:
+        if v is None:
+            codes.append(0)
+            continue
+        code = lookup.get(v)
+        if code is None:
+            if len(lookup) >= DICTIONARY_MAX_DISTINCT:
+                break
+            code = lookup[v] = len(lookup)
+        codes.append(code)
+    else:
+        n_values = len(values) - (0 if validity is None else values.count(None))
+        if len(lookup) * 2 <= max(n_values, 1):
+            typecode = "B" if len(lookup) <= 256 else "H"
+            return DictionaryColumn(array(typecode, codes), list(lookup), validity)
+
+    offsets = array("q", [0])
+    parts = []
+    pos = 0
+    for v in values:
+        if v is not None:
+            encoded = v.encode("utf-8")
+            parts.append(encoded)
+            pos += len(encoded)
+        offsets.append(pos)
+    return StringColumn(offsets, b"".join(parts), validity)
+
+
+class RecordBatch(Sequence):
+    """
+    Columnar batch of rows. Behaves as a read-only sequence of row tuples.
+    """
+
+    def __init__(self, columns: List[str], arrays: List[Column]):
+        if len(columns) != len(arrays):
+            raise ValueError("columns and arrays must have the same length")
+        lengths = {len(a) for a in arrays}
+        if len(lengths) > 1:
+            raise ValueError(f"column lengths differ: {sorted(lengths)}")
+        self.columns = list(columns)
+        self.arrays = arrays
+        self.num_rows = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_rows(cls, columns: List[str], rows: List[Tuple]) -> "RecordBatch":
+        values_by_column = list(zip(*rows)) if rows else [() for _ in columns]
+        return cls(columns, [build_column(list(values)) for values in values_by_column])
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.take(range(*i.indices(self.num_rows)))
+        if i < 0:
+            i += self.num_rows
+        if not 0 <= i < self.num_rows:
+            raise IndexError("RecordBatch index out of range")
+        return tuple(col.get(i) for col in self.arrays)
+
+    def __iter__(self) -> Iterator[Tuple]:
+        return zip(*[col.to_pylist() for col in self.arrays])
+
+    def column(self, name: str) -> Column:
+        return self.arrays[self.columns.index(name)]
+
+    def take(self, indices: Sequence) -> "RecordBatch":
+        """The rows at `indices` as a new RecordBatch, built column by column."""
+        return RecordBatch(self.columns, [col.take(indices) for col in self.arrays])
+
+    def with_column(self, name: str, column: Column) -> "RecordBatch":
+        return RecordBatch(self.columns + [name], self.arrays + [column])
+
+    def replace_columns(self, columns: Dict[int, Column]) -> "RecordBatch":
+        """Copy with the columns at the given positions swapped out."""
+        return RecordBatch(self.columns, [columns.get(i, col) for i, col in enumerate(self.arrays)])
+
+    def to_rows(self) -> List[Tuple]:
+        return list(iter(self))
+
+    def to_text_columns(self, null: str) -> List[List[str]]:
+        """Every column rendered as text (NULL as `null`), one list per column."""
+        return [col.to_text(null) for col in self.arrays]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(col.nbytes for col in self.arrays)
+
+    def describe(self) -> str:
+        kinds = ", ".join(f"{name}:{col.kind}" for name, col in zip(self.columns, self.arrays))
+        return f"RecordBatch({self.num_rows} rows, {self.nbytes} bytes; {kinds})"
+
+
+# ---------------------------------------------------------------------------
+# Batch files: JSON header + 8-byte aligned column buffers
+# ---------------------------------------------------------------------------
+
+BATCH_FILE_MAGIC = b"ETLBATCH2\n"
+
+
+def _column_buffers(col: Column) -> Tuple[Dict[str, Any], List[Tuple[str, bytes, str]]]:
+    """(header fields, [(buffer name, bytes, memoryview format)]) of a column."""
+    meta: Dict[str, Any] = {"kind": col.kind}
+    buffers: List[Tuple[str, bytes, str]] = []
+    if isinstance(col, ObjectColumn):
+        values = json.dumps(col.values, default=_json_default).encode("utf-8")
+        buffers.append(("values", values, "B"))
+        return meta, buffers
+    if col.validity is not None:
+        buffers.append(("validity", bytes(col.validity), "B"))
+    if isinstance(col, DictionaryColumn):
+        meta["dictionary"] = col.dictionary
+        buffers.append(("codes", col.codes.tobytes(), col.codes.typecode))
+    elif isinstance(col, StringColumn):
+        buffers.append(("offsets", col.offsets.tobytes(), "q"))
+        buffers.append(("data", bytes(col.data), "B"))
+    else:
+        if isinstance(col, DecimalColumn):
+            meta["scale"] = col.scale
+        buffers.append(("data", col.data.tobytes(), col.data.typecode))
+    return meta, buffers
+
+
+def write_batch_file(path: str, columns: List[str], batch: Sequence) -> int:
+    """
+    Write a batch (RecordBatch or list of row tuples) as a batch file.
+    Returns the number of bytes written.
+    """
+    if not isinstance(batch, RecordBatch):
+        batch = RecordBatch.from_rows(columns, batch)
+
+    header: Dict[str, Any] = {"columns": list(columns), "rows": batch.num_rows, "byteorder": sys.byteorder}
+    arrays_meta = []
+    payload: List[bytes] = []
+    offset = 0
+    for col in batch.arrays:
+        meta, buffers = _column_buffers(col)
+        meta["buffers"] = {}
+        for name, data, fmt in buffers:
+            meta["buffers"][name] = [offset, len(data), fmt]
+            pad = -len(data) % 8
+            payload.append(data + b"\0" * pad)
+            offset += len(data) + pad
+        arrays_meta.append(meta)
+    header["arrays"] = arrays_meta
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    header_bytes += b" " * (-(len(BATCH_FILE_MAGIC) + 8 + len(header_bytes)) % 8)
+    with open(path, "wb") as f:
+        f.write(BATCH_FILE_MAGIC)
+        f.write(len(header_bytes).to_bytes(8, "little"))
+        f.write(header_bytes)
+        for part in payload:
+            f.write(part)
+    return len(BATCH_FILE_MAGIC) + 8 + len(header_bytes) + offset
+
+
+def map_batch_file(path: str) -> Tuple[List[str], RecordBatch]:
+    """
+    Memory-map a batch file as (columns, RecordBatch). Typed columns are
+    memoryviews over the mapping (zero copy); the mapping stays open as
+    long as the batch is referenced.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    if bytes(view[:len(BATCH_FILE_MAGIC)]) != BATCH_FILE_MAGIC:
+        raise ValueError(f"{path} is not a batch file")
+    pos = len(BATCH_FILE_MAGIC)
+    header_len = int.from_bytes(view[pos:pos + 8], "little")
+    pos += 8
+    header = json.loads(str(view[pos:pos + header_len], "utf-8"))
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError(f"{path} was written on a {header['byteorder']}-endian machine")
+    base = pos + header_len
+
+    def _buffer(meta: Dict[str, Any], name: str) -> Optional[memoryview]:
+        spec = meta["buffers"].get(name)
+        if spec is None:
+            return None
+        offset, length, fmt = spec
+        buf = view[base + offset:base + offset + length]
+        return buf if fmt == "B" else buf.cast(fmt)
+
+    arrays: List[Column] = []
+    for meta in header["arrays"]:
+        kind = meta["kind"]
+        validity = _buffer(meta, "validity")
+        if kind == "object":
+            arrays.append(ObjectColumn(json.loads(str(_buffer(meta, "values"), "utf-8"), object_hook=decode_value)))
+        elif kind == "dictionary":
+            arrays.append(DictionaryColumn(_buffer(meta, "codes"), meta["dictionary"], validity))
+        elif kind == "string":
+            arrays.append(StringColumn(_buffer(meta, "offsets"), _buffer(meta, "data"), validity))
+        elif kind == "decimal":
+            arrays.append(DecimalColumn(_buffer(meta, "data"), validity, meta["scale"]))
+        elif kind == "timestamp":
+            arrays.append(TimestampColumn(_buffer(meta, "data"), validity))
+        elif kind == "float64":
+            arrays.append(Float64Column(_buffer(meta, "data"), validity))
+        elif kind == "int64":
+            arrays.append(Int64Column(_buffer(meta, "data"), validity))
+        else:
+            raise ValueError(f"{path}: unknown column kind {kind!r}")
+    return header["columns"], RecordBatch(header["columns"], arrays)
@@ -0,0 +1,303 @@
+# src/common/schema_registry.py
+
+"""
+Cached column schemas of every table's MySQL source and Snowflake RAW target.
+
+Both sides are read from information_schema and kept in a small JSON file
+(SCHEMA_CACHE_PATH, or pipeline.schema_cache) together with a fingerprint
+of the column lists. Within `ttl_hours` of the last check a run trusts the
+cache and issues no metadata queries at all; after that (or with refresh)
+both sides are introspected again and compared with the cached fingerprint,
+and any drift is printed column by column.
+
+The schema drives the column lists of the pipeline: extract queries select
+extract_columns(table_cfg) instead of `*`, which is the table's `columns`
+list in config.yaml when it has one, else every source column. The chunks
+carry those names, so the INSERT / COPY column lists and the MERGE follow.
+ensure() refuses (ValueError) a projection that names a column the source
+or the RAW table does not have, before anything is read.
+
+    registry.ensure(table_cfg, mysql_cfg, sf_cfg)   # once per table per run
+    registry.extract_columns(table_cfg)              # no I/O
+
+Until ensure() has run for a table in this process (e.g. a function called
+outside the runner), a table without `columns` in the config gets None from
+extract_columns() and its extracts fall back to `SELECT *`.
+"""
+
+import hashlib
+import json
+import threading
+from dataclasses import astuple, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from src.common.db_connections import mysql_session, snowflake_session
+
+SCHEMA_CACHE_PATH = ".etl_state/schema.json"
+DEFAULT_SCHEMA_TTL_HOURS = 24.0
+
+
+@dataclass(frozen=True)
+class ColumnInfo:
+    name: str
+    data_type: str
+    scale: Optional[int] = None
+
+
+@dataclass
+class TableSchema:
+    table: str
+    source: List[ColumnInfo]
+    target: List[ColumnInfo]
+    checked_at: datetime
+
+    @property
+    def fingerprint(self) -> str:
+        text = json.dumps([[astuple(c) for c in side] for side in (self.source, self.target)])
+        return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+    @property
+    def source_names(self) -> List[str]:
+        return [c.name for c in self.source]
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "source": [[c.name, c.data_type, c.scale] for c in self.source],
+            "target": [[c.name, c.data_type, c.scale] for c in self.target],
+            "fingerprint": self.fingerprint,
+            "checked_at": self.checked_at.isoformat(),
+        }
+
+    @classmethod
+    def from_json(cls, table: str, data: Dict[str, Any]) -> "TableSchema":
+        return cls(
+            table=table,
+            source=[ColumnInfo(*c) for c in data["source"]],
+            target=[ColumnInfo(*c) for c in data["target"]],
+            checked_at=datetime.fromisoformat(data["checked_at"]),
+        )
+
+
+def _read_columns(cur, sql: str, params: tuple) -> List[ColumnInfo]:
+    cur.execute(sql, params)
+    return [
+        ColumnInfo(name, str(data_type).lower(), int(scale) if scale is not None else None)
+        for name, data_type, scale in cur.fetchall()
+    ]
+
+
+def mysql_columns(table_cfg: Dict[str, Any], mysql_cfg: Dict[str, Any], conn=None) -> List[ColumnInfo]:
+    """Columns of the source table in ordinal order, from information_schema."""
+    with mysql_session(mysql_cfg, conn) as conn:
+        cur = conn.cursor()
+        try:
+            columns = _read_columns(
+                cur,
+                "SELECT COLUMN_NAME, DATA_TYPE, NUMERIC_SCALE FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION",
+                (mysql_cfg["database"], table_cfg["source_table"]),
+            )
+        finally:
+            cur.close()
+    if not columns:
+        raise ValueError(f"Source table {table_cfg['source_table']} not found in {mysql_cfg['database']}")
+    return columns
+
+
+def snowflake_columns(table_cfg: Dict[str, Any], sf_cfg: Dict[str, Any], conn=None) -> List[ColumnInfo]:
+    """Columns of the RAW table in ordinal order, from INFORMATION_SCHEMA."""
+    table = table_cfg["target_table"].split(".")[-1].upper()
+    with snowflake_session(sf_cfg, conn) as conn:
+        cur = conn.cursor()
+        try:
+            columns = _read_columns(
+                cur,
+                "SELECT COLUMN_NAME, DATA_TYPE, NUMERIC_SCALE FROM INFORMATION_SCHEMA.COLUMNS "
+                "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION",
+                (sf_cfg["schema_raw"].upper(), table),
+            )
+        finally:
+            cur.close()
+    if not columns:
+        raise ValueError(f"RAW table {table} not found in {sf_cfg['database']}.{sf_cfg['schema_raw']}")
+    return columns
+
+
+def _diff(label: str, old: List[ColumnInfo], new: List[ColumnInfo]) -> List[str]:
+    before = {c.name.lower(): c for c in old}
+    after = {c.name.lower(): c for c in new}
+    out = []
+    added = [c.name for c in new if c.name.lower() not in before]
+    dropped = [c.name for c in old if c.name.lower() not in after]
+    changed = [
+        f"{c.name} {before[c.name.lower()].data_type} -> {c.data_type}"
+        for c in new
+        if c.name.lower() in before and before[c.name.lower()] != c
+    ]
+    if added:
+        out.append(f"{label} added {', '.join(added)}")
+    if dropped:
+        out.append(f"{label} dropped {', '.join(dropped)}")
+    if changed:
+        out.append(f"{label} changed {', '.join(changed)}")
+    return out
+
+
+def primary_key_columns(table_cfg: Dict[str, Any]) -> List[str]:
+    """
+    Key columns of a table: `primary_key` may be a single column name, a
+    list of names, or a comma-separated string.
+    """
+    pk = table_cfg["primary_key"]
+    if isinstance(pk, str):
+        return [c.strip() for c in pk.split(",") if c.strip()]
+    return list(pk)
+
+
+def key_getter(columns: List[str], key_columns: List[str]) -> Callable[[Sequence[Any]], Any]:
+    """
+    Function returning the key of a row with these `columns`: the value
+    itself for a single-column key, a tuple for a composite one (so keys
+    compare and sort like the (incremental_column, key...) cursor).
+    """
+    idx = [columns.index(c) for c in key_columns]
+    if len(idx) == 1:
+        i = idx[0]
+        return lambda row: row[i]
+    return lambda row: tuple(row[i] for i in idx)
+
+
+def projection_problems(table_cfg: Dict[str, Any], schema: TableSchema) -> List[str]:
+    """Columns the table would extract that either side does not have."""
+    columns = table_cfg.get("columns") or schema.source_names
+    source = {c.name.lower() for c in schema.source}
+    target = {c.name.lower() for c in schema.target}
+    problems = []
+    missing = [c for c in columns if c.lower() not in source]
+    if missing:
+        problems.append(f"not in source table {table_cfg['source_table']}: {', '.join(missing)}")
+    missing = [c for c in columns if c.lower() not in target]
+    if missing:
+        problems.append(f"not in RAW table {table_cfg['target_table']}: {', '.join(missing)}")
+    return problems
+
+
+class SchemaRegistry:
+    """Per-table schemas, cached in a JSON file and re-checked every `ttl_hours`."""
+
+    def __init__(self, cache_path: Optional[str] = SCHEMA_CACHE_PATH, ttl_hours: float = DEFAULT_SCHEMA_TTL_HOURS):
+        self._lock = threading.Lock()
+        self.configure(cache_path, ttl_hours)
+
+    def configure(self, cache_path: Optional[str] = SCHEMA_CACHE_PATH, ttl_hours: Optional[float] = None) -> None:
+        with self._lock:
+            self.cache_path = Path(cache_path) if cache_path else None
+            self.ttl = timedelta(hours=DEFAULT_SCHEMA_TTL_HOURS if ttl_hours is None else float(ttl_hours))
+            self._schemas: Optional[Dict[str, TableSchema]] = None
+            self._ensured: Set[str] = set()
+
+    def _loaded(self) -> Dict[str, TableSchema]:
+        # Caller holds the lock.
+        if self._schemas is None:
+            self._schemas = {}
+            if self.cache_path is not None and self.cache_path.exists():
+                try:
+                    data = json.loads(self.cache_path.read_text())
+                    self._schemas = {name: TableSchema.from_json(name, entry) for name, entry in data.items()}
+                except (ValueError, KeyError, TypeError):
+                    print(f"[SCHEMA] Ignoring unreadable schema cache {self.cache_path}")
+        return self._schemas
+
+    def _write(self) -> None:
+        # Caller holds the lock.
+        if self.cache_path is None:
+            return
+        data = {name: schema.to_json() for name, schema in sorted(self._schemas.items())}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2))
+        tmp.replace(self.cache_path)
+
+    def get(self, name: str) -> Optional[TableSchema]:
+        """The cached schema of a table, without any I/O beyond the cache file."""
+        with self._lock:
+            return self._loaded().get(name)
+
+    def invalidate(self, name: str) -> None:
+        """Forget a table's schema so the next ensure() introspects it again."""
+        with self._lock:
+            self._ensured.discard(name)
+            if self._loaded().pop(name, None) is not None:
+                self._write()
+
+    def refresh(
+        self,
+        table_cfg: Dict[str, Any],
+        mysql_cfg: Dict[str, Any],
+        sf_cfg: Dict[str, Any],
+        mysql_conn=None,
+        sf_conn=None,
+    ) -> TableSchema:
+        """Introspect both sides, report drift against the cache and store the result."""
+        name = table_cfg["name"]
+        schema = TableSchema(
+            table=name,
+            source=mysql_columns(table_cfg, mysql_cfg, conn=mysql_conn),
+            target=snowflake_columns(table_cfg, sf_cfg, conn=sf_conn),
+            checked_at=datetime.now(timezone.utc),
+        )
+        with self._lock:
+            cached = self._loaded().get(name)
+            if cached is None:
+                print(f"[SCHEMA] {name}: cached {len(schema.source)} source / {len(schema.target)} RAW columns")
+            elif cached.fingerprint != schema.fingerprint:
+                drift = _diff("source", cached.source, schema.source) + _diff("RAW", cached.target, schema.target)
+                print(f"[SCHEMA] {name}: schema changed since {cached.checked_at:%Y-%m-%d %H:%M}: {'; '.join(drift)}")
+            self._schemas[name] = schema
+            self._write()
+        return schema
+
+    def ensure(
+        self,
+        table_cfg: Dict[str, Any],
+        mysql_cfg: Dict[str, Any],
+        sf_cfg: Dict[str, Any],
+        mysql_conn=None,
+        sf_conn=None,
+        refresh: bool = False,
+    ) -> TableSchema:
+        """
+        The table's schema: the cached one while it is younger than the TTL,
+        introspected again otherwise. Raises ValueError when the columns to
+        extract are missing from either side.
+        """
+        schema = None if refresh else self.get(table_cfg["name"])
+        if schema is None or datetime.now(timezone.utc) - schema.checked_at > self.ttl:
+            schema = self.refresh(table_cfg, mysql_cfg, sf_cfg, mysql_conn=mysql_conn, sf_conn=sf_conn)
+        problems = projection_problems(table_cfg, schema)
+        if problems:
+            raise ValueError(f"Schema drift in {table_cfg['name']}: " + "; ".join(problems))
+        with self._lock:
+            self._ensured.add(table_cfg["name"])
+        return schema
+
+    def extract_columns(self, table_cfg: Dict[str, Any]) -> Optional[List[str]]:
+        """Columns to select for a table, or None for `SELECT *`."""
+        if table_cfg.get("columns"):
+            return list(table_cfg["columns"])
+        with self._lock:
+            if table_cfg["name"] not in self._ensured:
+                return None
+            schema = self._loaded().get(table_cfg["name"])
+        return schema.source_names if schema is not None else None
+
+
+_registry = SchemaRegistry()
+
+configure = _registry.configure
+ensure = _registry.ensure
+extract_columns = _registry.extract_columns
+invalidate = _registry.invalidate
+get_schema = _registry.get
@@ -0,0 +1,321 @@
+# src/extract/binlog_cdc.py
+
+"""
+Change data capture from the MySQL binlog, as an alternative to polling
+`WHERE updated_at > watermark`.
+
+Row-based binlog events (insert / update / delete) for the configured
+tables are read from a (log_file, log_pos) position and folded into
+CdcBatch objects: the net upserts and deletes per primary key, cut at
+transaction boundaries so every batch ends on a position a reader can
+resume from. The loader applies a batch and stores that position as the
+table's watermark (watermark_utils.write_binlog_position), so an
+incremental run costs the number of changes, not the size of the table,
+and hard deletes reach RAW.
+
+Live reads use python-mysql-replication (`pymysqlreplication`, imported
+lazily). The source needs binlog_format=ROW, binlog_row_image=FULL and,
+for column names in the events, binlog_row_metadata=FULL (MySQL 8.0.14+);
+the ETL user needs REPLICATION SLAVE and REPLICATION CLIENT.
+
+Events can be recorded to a JSON-lines fixture and replayed offline
+(iter_fixture_events), which is how a table with `cdc_fixture` set in its
+config reads its changes:
+
+    python -m src.extract.binlog_cdc --tables customers orders --out cdc_events.jsonl --follow
+"""
+
+import argparse
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from src.common.db_connections import mysql_session
+from src.common.instrumentation import span
+from src.common.record_batch import decode_value, encode_value
+from src.common.schema_registry import extract_columns, primary_key_columns
+from src.extract.mysql_extractor import DEFAULT_CHUNK_ROWS
+
+# Default replica id used when mysql.binlog_server_id is not set; it must
+# differ from the server_id of the source and of every other replica.
+DEFAULT_SERVER_ID = 4242
+
+# Offset of the first event in every binlog file.
+BINLOG_START_POS = 4
+
+UPSERT = "upsert"
+DELETE = "delete"
+COMMIT = "commit"
+
+
+class BinlogPosition(NamedTuple):
+    log_file: str
+    log_pos: int
+
+
+@dataclass
+class ChangeEvent:
+    """
+    One row change (`kind` upsert / delete) or a transaction commit.
+    `position` is where a reader resumes after this event.
+    """
+
+    kind: str
+    position: BinlogPosition
+    timestamp: datetime
+    schema: Optional[str] = None
+    table: Optional[str] = None
+    values: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class CdcBatch:
+    """Net changes of one table between two commit positions."""
+
+    columns: List[str]
+    upserts: List[Tuple]
+    deletes: List[Tuple]
+    position: BinlogPosition
+    timestamp: Optional[datetime] = None
+    events: int = 0
+
+
+def current_binlog_position(mysql_cfg: Dict[str, Any], conn=None) -> BinlogPosition:
+    """
+    The source's current binlog position. Taken before a snapshot (full
+    load) so that changes made while the snapshot runs are replayed after it.
+    """
+    with mysql_session(mysql_cfg, conn) as conn:
+        cur = conn.cursor()
+        try:
+            try:
+                cur.execute("SHOW BINARY LOG STATUS")  # MySQL 8.2+
+            except Exception:
+                cur.execute("SHOW MASTER STATUS")
+            row = cur.fetchone()
+        finally:
+            cur.close()
+    if not row:
+        raise RuntimeError("Binary logging is disabled on the source (SHOW MASTER STATUS returned nothing)")
+    return BinlogPosition(row[0], int(row[1]))
+
+
+def iter_binlog_events(
+    mysql_cfg: Dict[str, Any],
+    source_tables: List[str],
+    start: BinlogPosition,
+    server_id: Optional[int] = None,
+    blocking: bool = False,
+    primary_keys: Optional[Dict[str, List[str]]] = None,
+) -> Iterator[ChangeEvent]:
+    """
+    Read row events for `source_tables` (in mysql_cfg['database']) from
+    `start`. With blocking=False the stream ends once it has caught up with
+    the source, which is what a scheduled run wants.
+
+    An update that changes a row's key (`primary_keys`: {source table: key
+    columns}; the event's own key from the row metadata otherwise) yields a
+    DELETE of the old key before the UPSERT of the new one, so the old row
+    does not stay behind in RAW.
+    """
+    from pymysqlreplication import BinLogStreamReader
+    from pymysqlreplication.event import XidEvent
+    from pymysqlreplication.row_event import DeleteRowsEvent, UpdateRowsEvent, WriteRowsEvent
+
+    stream = BinLogStreamReader(
+        connection_settings={
+            "host": mysql_cfg["host"],
+            "port": int(mysql_cfg["port"]),
+            "user": mysql_cfg["user"],
+            "passwd": mysql_cfg["password"] or "",
+        },
+        server_id=int(server_id or mysql_cfg.get("binlog_server_id") or DEFAULT_SERVER_ID),
+        only_events=[WriteRowsEvent, UpdateRowsEvent, DeleteRowsEvent, XidEvent],
+        only_schemas=[mysql_cfg["database"]],
+        only_tables=list(source_tables),
+        log_file=start.log_file,
+        log_pos=start.log_pos,
+        resume_stream=True,
+        blocking=blocking,
+    )
+    try:
+        for event in stream:
+            position = BinlogPosition(stream.log_file, stream.log_pos)
+            timestamp = datetime.fromtimestamp(event.timestamp)
+            if isinstance(event, XidEvent):
+                yield ChangeEvent(COMMIT, position, timestamp)
+                continue
+            for row in event.rows:
+                if isinstance(event, DeleteRowsEvent):
+                    kind, values = DELETE, row["values"]
+                elif isinstance(event, UpdateRowsEvent):
+                    kind, values = UPSERT, row["after_values"]
+                    before = row["before_values"]
+                    key = _key_columns(event, primary_keys)
+                    if any(before.get(c) != values.get(c) for c in key):
+                        yield ChangeEvent(DELETE, position, timestamp, event.schema, event.table, before)
+                else:
+                    kind, values = UPSERT, row["values"]
+                yield ChangeEvent(kind, position, timestamp, event.schema, event.table, values)
+    finally:
+        stream.close()
+
+
+def _key_columns(event, primary_keys: Optional[Dict[str, List[str]]]) -> List[str]:
+    if primary_keys and event.table in primary_keys:
+        return primary_keys[event.table]
+    pk = getattr(event, "primary_key", None)
+    if not pk:
+        return []
+    return [pk] if isinstance(pk, str) else list(pk)
+
+
+# ---------------------------------------------------------------------------
+# Fixtures: recorded events as JSON lines, replayable without a MySQL server
+# ---------------------------------------------------------------------------
+
+def write_fixture(events: Iterable[ChangeEvent], path: str) -> int:
+    """Record events as JSON lines. Returns the number of events written."""
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    n = 0
+    with open(out, "w", encoding="utf-8") as f:
+        for e in events:
+            f.write(json.dumps({
+                "kind": e.kind,
+                "log_file": e.position.log_file,
+                "log_pos": e.position.log_pos,
+                "timestamp": e.timestamp.isoformat(),
+                "schema": e.schema,
+                "table": e.table,
+                "values": {k: encode_value(v) for k, v in e.values.items()},
+            }) + "\n")
+            n += 1
+    return n
+
+
+def iter_fixture_events(path: str, start: Optional[BinlogPosition] = None) -> Iterator[ChangeEvent]:
+    """Replay a recorded fixture, skipping events at or before `start`."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            d = json.loads(line)
+            position = BinlogPosition(d["log_file"], int(d["log_pos"]))
+            if start is not None and position <= start:
+                continue
+            yield ChangeEvent(
+                d["kind"],
+                position,
+                datetime.fromisoformat(d["timestamp"]),
+                d.get("schema"),
+                d.get("table"),
+                {k: decode_value(v) for k, v in (d.get("values") or {}).items()},
+            )
+
+
+def fixture_start(path: str) -> BinlogPosition:
+    """Position before the first event of a fixture (stands in for SHOW MASTER STATUS)."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                return BinlogPosition(json.loads(line)["log_file"], BINLOG_START_POS)
+    return BinlogPosition("", BINLOG_START_POS)
+
+
+# ---------------------------------------------------------------------------
+# Events -> batches
+# ---------------------------------------------------------------------------
+
+def cdc_batches(
+    events: Iterable[ChangeEvent],
+    table_cfg: Dict[str, Any],
+    key_columns: List[str],
+    chunk_rows: Optional[int] = None,
+) -> Iterator[CdcBatch]:
+    """
+    Fold the events of one table (table_cfg['source_table']) into batches.
+
+    Changes are collapsed per primary key (the last change wins, so a row
+    inserted and deleted in the same batch is only deleted), and a batch is
+    cut at the first commit after `chunk_rows` keys have changed. The final
+    batch carries the last commit position even when it holds no changes,
+    so the watermark also moves past traffic on other tables.
+    """
+    source = table_cfg["source_table"].lower()
+    n = int(chunk_rows or table_cfg.get("chunk_rows") or DEFAULT_CHUNK_ROWS)
+    # The registry's projection when known, else every column of the first event.
+    columns: Optional[List[str]] = extract_columns(table_cfg)
+    changes: Dict[Tuple, Tuple[str, Optional[Tuple]]] = {}
+    n_events = 0
+    last_commit: Optional[ChangeEvent] = None
+    emitted_at: Optional[BinlogPosition] = None
+
+    def _batch(commit: ChangeEvent) -> CdcBatch:
+        upserts = [row for kind, row in changes.values() if kind == UPSERT]
+        deletes = [key for key, (kind, _) in changes.items() if kind == DELETE]
+        return CdcBatch(list(columns or []), upserts, deletes, commit.position, commit.timestamp, n_events)
+
+    for event in events:
+        if event.kind == COMMIT:
+            last_commit = event
+            if len(changes) >= n:
+                with span("extract.cdc.batch", table=table_cfg["name"]) as s:
+                    batch = _batch(event)
+                    s.add(rows=n_events)
+                yield batch
+                emitted_at = event.position
+                changes, n_events = {}, 0
+            continue
+        if (event.table or "").lower() != source:
+            continue
+        if columns is None:
+            columns = list(event.values)
+        key = tuple(event.values[k] for k in key_columns)
+        # Drop the earlier change so the batch stays in change order.
+        changes.pop(key, None)
+        if event.kind == DELETE:
+            changes[key] = (DELETE, None)
+        else:
+            changes[key] = (UPSERT, tuple(event.values.get(c) for c in columns))
+        n_events += 1
+
+    # Changes after the last commit belong to a transaction that is still
+    # open (or was rolled back); they are read again next time.
+    if last_commit is not None and last_commit.position != emitted_at:
+        yield _batch(last_commit)
+
+
+def main() -> None:
+    from src.common.config_loader import DEFAULT_CONFIG_PATH, get_config
+
+    parser = argparse.ArgumentParser(description="Record MySQL binlog row events to a replayable fixture.")
+    parser.add_argument("--tables", nargs="+", required=True, help="config names of the tables to capture")
+    parser.add_argument("--out", required=True, help="JSON-lines fixture to write")
+    parser.add_argument("--from-file", help="binlog file to start from (default: current position)")
+    parser.add_argument("--from-pos", type=int, default=BINLOG_START_POS)
+    parser.add_argument("--follow", action="store_true", help="keep waiting for new events until Ctrl-C")
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    args = parser.parse_args()
+
+    config = get_config(args.config)
+    tables = config.select_tables(args.tables)
+    sources = [t["source_table"] for t in tables]
+    keys = {t["source_table"]: primary_key_columns(t) for t in tables}
+    if args.from_file:
+        start = BinlogPosition(args.from_file, args.from_pos)
+    else:
+        start = current_binlog_position(config.mysql)
+    print(f"[CDC] Recording events for {', '.join(sources)} from {start.log_file}:{start.log_pos} to {args.out}")
+    try:
+        events = iter_binlog_events(config.mysql, sources, start, blocking=args.follow, primary_keys=keys)
+        n = write_fixture(events, args.out)
+        print(f"[CDC] Recorded {n} events")
+    except KeyboardInterrupt:
+        print(f"[CDC] Stopped; events so far are in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
 from faker import Faker
+import argparse
 import random
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-import mysql.connector
+from pathlib import Path
+from typing import Dict, List, Tuple
+import numpy as np
+
+from src.common.batch_sizer import BatchSizer, executemany_batched
 
 fake = Faker()
 
@@ -9,16 +15,20 @@ fake = Faker()
 # MySQL connection
 # -------------------------------------------------------------------
 
-def get_mysql_conn():
+def get_mysql_conn(allow_local_infile=False):
     """
     Adjust host/user/password/database to match your MySQL instance.
     """
+    # Imported here so --no-load runs without the MySQL driver installed.
+    import mysql.connector
+
     return mysql.connector.connect(
         host="localhost",
         user="vijay",
         password="Rohit@45",
         database="ecommerce_source",
-        port=3307
+        port=3307,
+        allow_local_infile=allow_local_infile,
     )
 
 # -------------------------------------------------------------------
@@ -204,6 +214,17 @@ def generate_orders_and_order_items(
 # Insert functions
 # -------------------------------------------------------------------
 
+def _executemany(cur, table: str, sql: str, rows) -> None:
+    # Batched so the classic dataset stays under max_allowed_packet;
+    # the size adapts per table and is remembered for the next run.
+    sizer = BatchSizer(f"mysql.{table}")
+    try:
+        executemany_batched(cur, sql, rows, sizer)
+    finally:
+        sizer.save()
+    print(sizer.summary())
+
+
 def insert_customers(customers):
     conn = get_mysql_conn()
     cur = conn.cursor()
@@ -212,7 +233,7 @@ def insert_customers(customers):
         (customer_id, first_name, last_name, email, signup_date, country, city, status, updated_at)
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
     """
-    cur.executemany(sql, customers)
+    _executemany(cur, "customers", sql, customers)
     conn.commit()
     cur.close()
     conn.close()
@@ -227,7 +248,7 @@ def insert_products(products):
         (product_id, product_name, category, price, currency, updated_at)
         VALUES (%s, %s, %s, %s, %s, %s)
     """
-    cur.executemany(sql, products)
+    _executemany(cur, "products", sql, products)
     conn.commit()
     cur.close()
     conn.close()
@@ -242,7 +263,7 @@ def insert_orders(orders):
         (order_id, customer_id, order_date, order_status, total_amount, currency, updated_at)
         VALUES (%s, %s, %s, %s, %s, %s, %s)
     """
-    cur.executemany(sql, orders)
+    _executemany(cur, "orders", sql, orders)
     conn.commit()
     cur.close()
     conn.close()
@@ -257,17 +278,270 @@ def insert_order_items(order_items):
         (order_item_id, order_id, product_id, quantity, unit_price, currency, updated_at)
         VALUES (%s, %s, %s, %s, %s, %s, %s)
     """
-    cur.executemany(sql, order_items)
+    _executemany(cur, "order_items", sql, order_items)
     conn.commit()
     cur.close()
     conn.close()
     print(f"Inserted {len(order_items)} order_items.")
 
+# -------------------------------------------------------------------
+# Scale-factor mode: vectorized (NumPy), sharded over processes,
+# written as TSV and bulk-loaded with LOAD DATA LOCAL INFILE
+# -------------------------------------------------------------------
+
+# Rows per unit of --scale. order_items averages 3 per order, so
+# --scale 100 gives 5M orders and ~15M order_items.
+SCALE_BASE = {"customers": 5000, "products": 500, "orders": 50000}
+
+# Rows generated (and written to one TSV file) per shard.
+SHARD_ROWS = 250_000
+
+COUNTRIES = ["United States", "Canada", "United Kingdom", "Germany", "Australia", "India"]
+CUSTOMER_STATUSES = ["active", "inactive"]
+CUSTOMER_STATUS_WEIGHTS = [0.8, 0.2]
+CATEGORIES = ["Electronics", "Clothing", "Home & Kitchen", "Sports", "Books", "Beauty", "Toys"]
+ORDER_STATUSES = ["completed", "shipped", "cancelled", "returned", "pending"]
+ORDER_STATUS_WEIGHTS = [0.6, 0.2, 0.05, 0.05, 0.1]
+MAX_ITEMS_PER_ORDER = 5
+
+TABLE_COLUMNS = {
+    "customers": ["customer_id", "first_name", "last_name", "email", "signup_date", "country", "city", "status", "updated_at"],
+    "products": ["product_id", "product_name", "category", "price", "currency", "updated_at"],
+    "orders": ["order_id", "customer_id", "order_date", "order_status", "total_amount", "currency", "updated_at"],
+    "order_items": ["order_item_id", "order_id", "product_id", "quantity", "unit_price", "currency", "updated_at"],
+}
+
+# Stream ids mixed into every shard seed so tables never share a stream.
+_TABLE_STREAM = {"customers": 1, "products": 2, "orders": 3}
+
+
+def _shard_rng(seed: int, table: str, shard: int) -> np.random.Generator:
+    """Deterministic generator for one shard: same seed -> same data, any worker count."""
+    return np.random.default_rng([seed, _TABLE_STREAM[table], shard])
+
+
+def _shards(n_rows: int) -> List[Tuple[int, int, int]]:
+    """(shard index, first id, last id) ranges of at most SHARD_ROWS ids."""
+    return [
+        (i, lo, min(lo + SHARD_ROWS - 1, n_rows))
+        for i, lo in enumerate(range(1, n_rows + 1, SHARD_ROWS))
+    ]
+
+
+def _fmt_ts(start: np.datetime64, seconds: np.ndarray) -> np.ndarray:
+    stamps = start + seconds.astype("timedelta64[s]")
+    return np.char.replace(np.datetime_as_string(stamps, unit="s"), "T", " ")
+
+
+def _fmt_cents(cents: np.ndarray) -> np.ndarray:
+    return np.char.mod("%.2f", cents / 100.0)
+
+
+def _write_tsv(path: Path, columns: List[np.ndarray]) -> int:
+    text_columns = [np.asarray(c).astype(str).tolist() for c in columns]
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.writelines("\t".join(row) + "\n" for row in zip(*text_columns))
+    return len(text_columns[0])
+
+
+def _name_pools(seed: int) -> Dict[str, List[str]]:
+    """Small Faker-generated pools that the vectorized generators sample from."""
+    pool_fake = Faker()
+    pool_fake.seed_instance(seed)
+    return {
+        "first_names": [pool_fake.first_name() for _ in range(1000)],
+        "last_names": [pool_fake.last_name() for _ in range(1000)],
+        "cities": [pool_fake.city() for _ in range(2000)],
+        "words": [pool_fake.word().title() for _ in range(1000)],
+    }
+
+
+def _gen_customers_shard(args) -> Tuple[str, Path, int]:
+    shard, lo, hi, seed, start, span, pools, out_dir = args
+    rng = _shard_rng(seed, "customers", shard)
+    n = hi - lo + 1
+    ids = np.arange(lo, hi + 1, dtype=np.int64)
+
+    first = np.array(pools["first_names"])[rng.integers(0, len(pools["first_names"]), n)]
+    last = np.array(pools["last_names"])[rng.integers(0, len(pools["last_names"]), n)]
+    email = np.char.add(
+        np.char.add(np.char.add(np.char.lower(first), "."), np.char.lower(last)),
+        np.char.add(ids.astype(str), "@example.com"),
+    )
+    signup = rng.integers(0, span, n)
+    # updated_at on or after signup_date
+    updated = signup + (rng.random(n) * (span - signup)).astype(np.int64)
+
+    path = out_dir / f"customers_{shard:05d}.tsv"
+    rows = _write_tsv(path, [
+        ids,
+        first,
+        last,
+        email,
+        _fmt_ts(start, signup),
+        np.array(COUNTRIES)[rng.integers(0, len(COUNTRIES), n)],
+        np.array(pools["cities"])[rng.integers(0, len(pools["cities"]), n)],
+        rng.choice(CUSTOMER_STATUSES, size=n, p=CUSTOMER_STATUS_WEIGHTS),
+        _fmt_ts(start, updated),
+    ])
+    return "customers", path, rows
+
+
+def _gen_products(seed: int, n: int, start: np.datetime64, span: int, pools, out_dir: Path) -> Tuple[Path, np.ndarray]:
+    rng = _shard_rng(seed, "products", 0)
+    ids = np.arange(1, n + 1, dtype=np.int64)
+    words = np.array(pools["words"])
+    names = np.char.add(np.char.add(words[rng.integers(0, len(words), n)], " "), words[rng.integers(0, len(words), n)])
+    price_cents = rng.integers(500, 50_001, n)
+
+    path = out_dir / "products_00000.tsv"
+    _write_tsv(path, [
+        ids,
+        names,
+        np.array(CATEGORIES)[rng.integers(0, len(CATEGORIES), n)],
+        _fmt_cents(price_cents),
+        np.full(n, "USD"),
+        _fmt_ts(start, rng.integers(0, span, n)),
+    ])
+    return path, price_cents
+
+
+def _order_item_counts(rng: np.random.Generator, n: int) -> np.ndarray:
+    # Always the first draw from a shard's stream, so counting and
+    # generating see the same values.
+    return rng.integers(1, MAX_ITEMS_PER_ORDER + 1, n)
+
+
+def _count_order_items(args) -> int:
+    shard, lo, hi, seed = args
+    return int(_order_item_counts(_shard_rng(seed, "orders", shard), hi - lo + 1).sum())
+
+
+def _gen_orders_shard(args) -> List[Tuple[str, Path, int]]:
+    shard, lo, hi, seed, first_item_id, n_customers, price_cents, start, span, out_dir = args
+    rng = _shard_rng(seed, "orders", shard)
+    n = hi - lo + 1
+    n_items = _order_item_counts(rng, n)
+    order_ids = np.arange(lo, hi + 1, dtype=np.int64)
+
+    customer_ids = rng.integers(1, n_customers + 1, n)
+    order_secs = rng.integers(0, span, n)
+    statuses = rng.choice(ORDER_STATUSES, size=n, p=ORDER_STATUS_WEIGHTS)
+
+    total_items = int(n_items.sum())
+    item_ids = np.arange(first_item_id, first_item_id + total_items, dtype=np.int64)
+    item_order_ids = np.repeat(order_ids, n_items)
+    product_ids = rng.integers(1, len(price_cents) + 1, total_items)
+    # Small variation around the product price, kept in integer cents so
+    # order totals equal the sum of their items exactly.
+    unit_cents = np.rint(price_cents[product_ids - 1] * rng.uniform(0.9, 1.1, total_items)).astype(np.int64)
+    quantity = rng.integers(1, 6, total_items)
+    offsets = np.concatenate(([0], np.cumsum(n_items)[:-1]))
+    total_cents = np.add.reduceat(unit_cents * quantity, offsets)
+
+    order_ts = _fmt_ts(start, order_secs)
+    orders_path = out_dir / f"orders_{shard:05d}.tsv"
+    items_path = out_dir / f"order_items_{shard:05d}.tsv"
+    _write_tsv(orders_path, [
+        order_ids, customer_ids, order_ts, statuses, _fmt_cents(total_cents), np.full(n, "USD"), order_ts,
+    ])
+    item_ts = np.repeat(order_ts, n_items)
+    _write_tsv(items_path, [
+        item_ids, item_order_ids, product_ids, quantity, _fmt_cents(unit_cents), np.full(total_items, "USD"), item_ts,
+    ])
+    return [("orders", orders_path, n), ("order_items", items_path, total_items)]
+
+
+def generate_scaled(
+    scale: int,
+    out_dir: str,
+    seed: int = 42,
+    workers: int = 4,
+    as_of: str = "2026-01-01",
+) -> Dict[str, List[Path]]:
+    """
+    Generate all four tables at `scale` x SCALE_BASE rows as TSV shards in
+    `out_dir`, using `workers` processes. Output depends only on
+    (scale, seed, as_of), not on the number of workers.
+
+    Returns {table: [shard paths]}.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    n_customers = SCALE_BASE["customers"] * scale
+    n_products = SCALE_BASE["products"] * scale
+    n_orders = SCALE_BASE["orders"] * scale
+
+    end = np.datetime64(as_of, "s")
+    span = 730 * 86400  # last ~2 years
+    start = end - np.timedelta64(span, "s")
+    pools = _name_pools(seed)
+    files: Dict[str, List[Path]] = {t: [] for t in TABLE_COLUMNS}
+    counts: Dict[str, int] = {t: 0 for t in TABLE_COLUMNS}
+
+    products_path, price_cents = _gen_products(seed, n_products, start, span, pools, out)
+    files["products"].append(products_path)
+    counts["products"] = n_products
+
+    order_shards = _shards(n_orders)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        customer_jobs = [(i, lo, hi, seed, start, span, pools, out) for i, lo, hi in _shards(n_customers)]
+        for table, path, rows in pool.map(_gen_customers_shard, customer_jobs):
+            files[table].append(path)
+            counts[table] += rows
+
+        # Item ids are dense across shards: count every shard's items first.
+        item_counts = list(pool.map(_count_order_items, [(i, lo, hi, seed) for i, lo, hi in order_shards]))
+        first_item_ids = np.concatenate(([1], 1 + np.cumsum(item_counts)[:-1])).tolist()
+
+        order_jobs = [
+            (i, lo, hi, seed, first_item_ids[i], n_customers, price_cents, start, span, out)
+            for i, lo, hi in order_shards
+        ]
+        for shard_files in pool.map(_gen_orders_shard, order_jobs):
+            for table, path, rows in shard_files:
+                files[table].append(path)
+                counts[table] += rows
+
+    for table in TABLE_COLUMNS:
+        print(f"Generated {counts[table]} {table} in {len(files[table])} shard(s).")
+    return files
+
+
+def load_tsv_shards(files: Dict[str, List[Path]], workers: int = 4) -> None:
+    """
+    Bulk-load TSV shards with LOAD DATA LOCAL INFILE, one connection per
+    shard in flight, tables in FK-safe order.
+    """
+    def _load(table: str, path: Path) -> None:
+        conn = get_mysql_conn(allow_local_infile=True)
+        cur = conn.cursor()
+        try:
+            # Generated data is consistent by construction; skipping the
+            # per-row checks makes the bulk load much faster.
+            cur.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+            file_name = path.resolve().as_posix().replace("'", "\\'")
+            cur.execute(
+                f"LOAD DATA LOCAL INFILE '{file_name}' INTO TABLE {table} "
+                f"FIELDS TERMINATED BY '\\t' ESCAPED BY '' LINES TERMINATED BY '\\n' "
+                f"({', '.join(TABLE_COLUMNS[table])})"
+            )
+            conn.commit()
+        finally:
+            cur.close()
+            conn.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for table in ["customers", "products", "orders", "order_items"]:
+            list(pool.map(lambda p: _load(table, p), files[table]))
+            print(f"Loaded {len(files[table])} {table} shard(s).")
+
+
 # -------------------------------------------------------------------
 # Main
 # -------------------------------------------------------------------
 
-if __name__ == "__main__":
+def main_classic():
     random.seed(42)  # for reproducibility
 
     # 1) Generate data in memory
@@ -302,3 +576,25 @@ if __name__ == "__main__":
     insert_order_items(order_items)
 
     print("Sample data generation completed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate sample e-commerce data in MySQL.")
+    parser.add_argument("--scale", type=int, help="scale factor (vectorized mode); omit for the classic 5k/20k dataset")
+    parser.add_argument("--out-dir", help="directory for TSV shards (default: data/scale_<N>)")
+    parser.add_argument("--workers", type=int, default=4, help="generator processes / loader connections")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", default="2026-01-01", help="latest timestamp generated (keeps output reproducible)")
+    parser.add_argument("--no-load", action="store_true", help="only write the TSV files (offline benchmarks)")
+    args = parser.parse_args()
+
+    if args.scale is None:
+        main_classic()
+    else:
+        out_dir = args.out_dir or f"data/scale_{args.scale}"
+        files = generate_scaled(args.scale, out_dir, seed=args.seed, workers=args.workers, as_of=args.as_of)
+        if args.no_load:
+            print(f"Wrote TSV shards to {out_dir} (not loaded).")
+        else:
+            load_tsv_shards(files, workers=args.workers)
+            print("Sample data generation completed.")
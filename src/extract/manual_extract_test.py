@@ -2,7 +2,7 @@
 
 from typing import Dict, Any, List, Tuple
 
-from src.common.config_loader import load_config
+from src.common.config_loader import PipelineConfig, get_config
 from src.extract.mysql_extractor import fetch_full_table
 
 
@@ -24,15 +24,13 @@ def print_sample_rows(columns: List[str], rows: List[Tuple], sample_size: int =
 
 def main() -> None:
     # 1. Load config
-    config: Dict[str, Any] = load_config("configs/config.yaml")
+    config: PipelineConfig = get_config("configs/config.yaml")
 
     # 2. Get MySQL config and table config for 'customers'
-    mysql_cfg: Dict[str, Any] = config["mysql"]
+    mysql_cfg: Dict[str, Any] = config.mysql
 
     # find table config where name == "customers"
-    table_cfg: Dict[str, Any] = next(
-        t for t in config["tables"] if t["name"] == "customers"
-    )
+    table_cfg: Dict[str, Any] = config.table("customers")
 
     print("Using MySQL configuration:")
     print(mysql_cfg)
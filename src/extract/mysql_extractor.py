@@ -1,33 +1,748 @@
-from typing import Dict, Any, List, Tuple
-from datetime import datetime
-from src.common.db_connections import get_mysql_conn
-
-def fetch_full_table(table_cfg: Dict[str, Any], mysql_cfg: Dict[str, Any]) -> List[Tuple]:
-    conn = get_mysql_conn(mysql_cfg)
-    cur = conn.cursor()
-    sql = f"SELECT * FROM {table_cfg['source_table']}"
-    cur.execute(sql)
-    rows = cur.fetchall()
-    columns = [desc[0] for desc in cur.description]
-    cur.close()
-    conn.close()
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta
+from src.common.db_connections import ConnectionPool, get_mysql_conn, mysql_session
+from src.common.instrumentation import span
+from src.common.record_batch import RecordBatch
+from src.common.schema_registry import extract_columns, key_getter, primary_key_columns
+
+# Rows pulled per fetchmany() call when a table does not set chunk_rows.
+DEFAULT_CHUNK_ROWS = 10000
+
+# Target rows per time slice of a catch-up read (see plan_time_slices).
+DEFAULT_SLICE_ROWS = 200_000
+
+Chunk = Tuple[List[str], List[Tuple]]
+
+
+def fetch_full_table(table_cfg: Dict[str, Any], mysql_cfg: Dict[str, Any], conn=None) -> List[Tuple]:
+    if _parallelism(table_cfg) > 1:
+        columns, rows = [], []
+        for columns, batch in iter_full_table_parallel(table_cfg, mysql_cfg):
+            rows.extend(batch)
+        return columns, rows
+
+    with mysql_session(mysql_cfg, conn) as conn:
+        cur = conn.cursor()
+        select, columns = _projection(table_cfg)
+        sql = f"SELECT {select} FROM {table_cfg['source_table']}"
+        cur.execute(sql)
+        rows = cur.fetchall()
+        columns = _column_names(cur, columns)
+        cur.close()
     return columns, rows
 
 def fetch_incremental_rows(
     table_cfg: Dict[str, Any],
     mysql_cfg: Dict[str, Any],
     last_loaded_at: datetime,
+    conn=None,
 ) -> List[Tuple]:
-    conn = get_mysql_conn(mysql_cfg)
-    cur = conn.cursor()
+    with mysql_session(mysql_cfg, conn) as conn:
+        cur = conn.cursor()
+        incr_col = table_cfg["incremental_column"]
+        select, columns = _projection(table_cfg)
+        sql = f"""
+            SELECT {select} FROM {table_cfg['source_table']}
+            WHERE {incr_col} > %s
+        """
+        cur.execute(sql, (last_loaded_at,))
+        rows = cur.fetchall()
+        columns = _column_names(cur, columns)
+        cur.close()
+    return columns, rows
+
+
+def _chunk_rows(table_cfg: Dict[str, Any], chunk_rows: Optional[int]) -> int:
+    return int(chunk_rows or table_cfg.get("chunk_rows") or DEFAULT_CHUNK_ROWS)
+
+
+def _parallelism(table_cfg: Dict[str, Any]) -> int:
+    return int(table_cfg.get("parallelism") or 1)
+
+
+def _projection(table_cfg: Dict[str, Any]) -> Tuple[str, Optional[List[str]]]:
+    """(select list, column names) from the schema registry; ("*", None) when unknown."""
+    columns = extract_columns(table_cfg)
+    return (", ".join(columns) if columns else "*"), columns
+
+
+def _column_names(cur, columns: Optional[List[str]]) -> List[str]:
+    return list(columns) if columns else [desc[0] for desc in cur.description]
+
+
+def _maybe_columnar(table_cfg: Dict[str, Any], chunks: Iterator[Chunk]) -> Iterator[Chunk]:
+    # Tables with `columnar: true` hand RecordBatch batches to the loader.
+    if table_cfg.get("columnar"):
+        return (_emit(table_cfg, columns, batch) for columns, batch in chunks)
+    return chunks
+
+
+def _emit(table_cfg: Dict[str, Any], columns: List[str], batch: List[Tuple]) -> Chunk:
+    if table_cfg.get("columnar"):
+        with span("extract.columnar", table=table_cfg["name"]) as s:
+            record_batch = RecordBatch.from_rows(columns, batch)
+            s.add(rows=len(batch), nbytes=record_batch.nbytes)
+        return columns, record_batch
+    return columns, batch
+
+
+def _stream_query(
+    mysql_cfg: Dict[str, Any],
+    sql: str,
+    params: Optional[Tuple] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    conn=None,
+    table: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+) -> Iterator[Chunk]:
+    """
+    Execute `sql` on an unbuffered cursor and yield (columns, batch) chunks.
+    `columns` names the selected columns (cur.description when None).
+
+    The unbuffered cursor leaves the result set on the server socket, so only
+    one batch of `chunk_rows` rows is held in memory at a time. An injected
+    `conn` is left open; otherwise a connection is opened for the stream.
+    """
+    owns_conn = conn is None
+    if owns_conn:
+        conn = get_mysql_conn(mysql_cfg)
+    cur = conn.cursor(buffered=False)
+    started = exhausted = False
+
+    try:
+        cur.execute(sql, params)
+        started = True
+        columns = _column_names(cur, columns)
+        while True:
+            with span("extract.fetch", table=table) as s:
+                batch = cur.fetchmany(chunk_rows)
+                s.add(rows=len(batch))
+            if not batch:
+                exhausted = True
+                break
+            yield columns, batch
+    finally:
+        # Closing the cursor with unread rows raises in mysql-connector.
+        # When the consumer stops early, drop an owned connection; a shared
+        # one has to be drained so it can be reused.
+        if started and not exhausted and not owns_conn:
+            conn.consume_results()
+            exhausted = True
+        if exhausted or not started:
+            cur.close()
+        if owns_conn:
+            conn.close()
+
+
+def iter_full_table(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    chunk_rows: Optional[int] = None,
+    conn=None,
+    pool: Optional[ConnectionPool] = None,
+) -> Iterator[Chunk]:
+    """
+    Streaming variant of fetch_full_table.
+
+    Yields (columns, batch) tuples where batch holds at most `chunk_rows` rows
+    (defaults to table_cfg['chunk_rows'] or DEFAULT_CHUNK_ROWS); batch is a
+    RecordBatch for tables with `columnar: true`. Tables with
+    `parallelism` > 1 are read with iter_full_table_parallel, drawing reader
+    connections from `pool` when one is given; the key ranges need a
+    single integer key, so tables with a composite key are read serially.
+    """
+    if _parallelism(table_cfg) > 1 and len(primary_key_columns(table_cfg)) == 1:
+        return iter_full_table_parallel(table_cfg, mysql_cfg, chunk_rows=chunk_rows, pool=pool)
+
+    select, columns = _projection(table_cfg)
+    sql = f"SELECT {select} FROM {table_cfg['source_table']}"
+    return _maybe_columnar(table_cfg, _stream_query(
+        mysql_cfg, sql, chunk_rows=_chunk_rows(table_cfg, chunk_rows), conn=conn, table=table_cfg["name"],
+        columns=columns,
+    ))
+
+
+def iter_incremental_rows(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    last_loaded_at: datetime,
+    chunk_rows: Optional[int] = None,
+    conn=None,
+) -> Iterator[Chunk]:
+    """
+    Streaming variant of fetch_incremental_rows.
+
+    Yields (columns, batch) tuples of rows whose incremental column is newer
+    than `last_loaded_at`.
+    """
     incr_col = table_cfg["incremental_column"]
+    select, columns = _projection(table_cfg)
     sql = f"""
-        SELECT * FROM {table_cfg['source_table']}
+        SELECT {select} FROM {table_cfg['source_table']}
         WHERE {incr_col} > %s
     """
-    cur.execute(sql, (last_loaded_at,))
-    rows = cur.fetchall()
-    columns = [desc[0] for desc in cur.description]
-    cur.close()
-    conn.close()
-    return columns, rows
+    return _maybe_columnar(table_cfg, _stream_query(
+        mysql_cfg, sql, (last_loaded_at,), chunk_rows=_chunk_rows(table_cfg, chunk_rows), conn=conn,
+        table=table_cfg["name"], columns=columns,
+    ))
+
+
+def pk_ranges(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    parts: int,
+    conn=None,
+) -> List[Tuple[int, int]]:
+    """
+    Split the integer primary key space of a table into `parts` ranges.
+
+    Returns a list of (low_exclusive, high_inclusive) bounds covering
+    MIN(pk)..MAX(pk), or an empty list when the table has no rows.
+    """
+    pk = table_cfg["primary_key"]
+    with mysql_session(mysql_cfg, conn) as conn:
+        cur = conn.cursor()
+        try:
+            cur.execute(f"SELECT MIN({pk}), MAX({pk}) FROM {table_cfg['source_table']}")
+            lo, hi = cur.fetchone()
+        finally:
+            cur.close()
+
+    if lo is None:
+        return []
+
+    lo, hi = int(lo), int(hi)
+    parts = max(1, min(parts, hi - lo + 1))
+    step = (hi - lo + 1) // parts
+    bounds = [lo - 1 + step * i for i in range(parts)] + [hi]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def iter_pk_range(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    low_exclusive: int,
+    high_inclusive: int,
+    chunk_rows: Optional[int] = None,
+    stop: Optional[threading.Event] = None,
+    conn=None,
+) -> Iterator[Chunk]:
+    """
+    Read one primary key range with keyset pagination on its own connection.
+
+    Each page is `SELECT ... WHERE pk > last AND pk <= high ORDER BY pk LIMIT n`,
+    so every query is an index range scan regardless of how deep into the
+    range we are.
+    """
+    pk = table_cfg["primary_key"]
+    n = _chunk_rows(table_cfg, chunk_rows)
+    select, projected = _projection(table_cfg)
+    sql = f"""
+        SELECT {select} FROM {table_cfg['source_table']}
+        WHERE {pk} > %s AND {pk} <= %s
+        ORDER BY {pk}
+        LIMIT {n}
+    """
+    last = low_exclusive
+
+    with mysql_session(mysql_cfg, conn) as conn:
+        cur = conn.cursor()
+        try:
+            while stop is None or not stop.is_set():
+                with span("extract.fetch", table=table_cfg["name"]) as s:
+                    cur.execute(sql, (last, high_inclusive))
+                    batch = cur.fetchall()
+                    s.add(rows=len(batch))
+                if not batch:
+                    break
+                columns = _column_names(cur, projected)
+                yield _emit(table_cfg, columns, batch)
+                if len(batch) < n:
+                    break
+                last = batch[-1][columns.index(pk)]
+        finally:
+            cur.close()
+
+
+# Keys per `WHERE key IN (...)` lookup in iter_rows_by_key.
+KEY_LOOKUP_BATCH = 1000
+
+
+def iter_rows_by_key(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    key_columns: List[str],
+    keys: List[Tuple],
+    conn=None,
+) -> Iterator[Chunk]:
+    """
+    Read the source rows whose key is in `keys` (tuples in `key_columns`
+    order), KEY_LOOKUP_BATCH keys per query. Keys that no longer exist are
+    simply not returned.
+    """
+    select, columns = _projection(table_cfg)
+    with mysql_session(mysql_cfg, conn) as conn:
+        cur = conn.cursor()
+        try:
+            for i in range(0, len(keys), KEY_LOOKUP_BATCH):
+                part = keys[i:i + KEY_LOOKUP_BATCH]
+                if len(key_columns) == 1:
+                    where = f"{key_columns[0]} IN ({', '.join(['%s'] * len(part))})"
+                    params = tuple(key[0] for key in part)
+                else:
+                    match = "(" + " AND ".join(f"{c} = %s" for c in key_columns) + ")"
+                    where = " OR ".join([match] * len(part))
+                    params = tuple(v for key in part for v in key)
+                with span("extract.fetch", table=table_cfg["name"]) as s:
+                    cur.execute(f"SELECT {select} FROM {table_cfg['source_table']} WHERE {where}", params)
+                    batch = cur.fetchall()
+                    s.add(rows=len(batch))
+                if batch:
+                    yield _column_names(cur, columns), batch
+        finally:
+            cur.close()
+
+
+def _put_until_stopped(q: "queue.Queue", item: Any, stop: threading.Event) -> None:
+    # Poll so a producer blocked on a full queue notices a stopped consumer.
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.5)
+            return
+        except queue.Full:
+            continue
+
+
+def prefetch_chunks(chunks: Iterable[Chunk], depth: int, table: Optional[str] = None) -> Iterator[Chunk]:
+    """
+    Pull `chunks` on a background thread, up to `depth` chunks ahead of the
+    consumer, so chunk N+1 is fetched from MySQL while chunk N is loaded.
+
+    At most depth + 2 chunks are in memory (queued, being fetched, being
+    loaded). An error in the producer is re-raised in the consumer at the
+    position it happened, so nothing after the last good chunk is ever
+    handed on (and no watermark can move past it). If the consumer stops
+    early, the producer is stopped and the source stream closed before
+    this generator returns. depth <= 0 disables prefetching.
+    """
+    if depth <= 0:
+        yield from chunks
+        return
+
+    buffer: "queue.Queue" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def _produce() -> None:
+        it = iter(chunks)
+        try:
+            for chunk in it:
+                if stop.is_set():
+                    break
+                _put_until_stopped(buffer, chunk, stop)
+        except BaseException as e:
+            _put_until_stopped(buffer, e, stop)
+        finally:
+            # Closing the source on this thread lets _stream_query drain or
+            # release its connection before the consumer moves on.
+            close = getattr(it, "close", None)
+            if close is not None:
+                close()
+            _put_until_stopped(buffer, done, stop)
+
+    producer = threading.Thread(target=_produce, daemon=True, name=f"prefetch-{table or 'chunks'}")
+    producer.start()
+    try:
+        while True:
+            # Time the loader spends waiting for MySQL.
+            with span("extract.wait", table=table):
+                item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def iter_full_table_parallel(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    parallelism: Optional[int] = None,
+    chunk_rows: Optional[int] = None,
+    pool: Optional[ConnectionPool] = None,
+) -> Iterator[Chunk]:
+    """
+    Parallel full-table read.
+
+    The primary key space is split into `parallelism` ranges (defaults to
+    table_cfg['parallelism']); each range is read by its own thread and MySQL
+    connection (checked out of `pool` when given), and the pages are merged
+    into a single (columns, batch) stream.
+    Chunks arrive in completion order, not primary key order.
+
+    At most 2 * parallelism chunks are buffered, so memory stays bounded even
+    when the consumer is slower than the readers.
+    """
+    workers = int(parallelism or _parallelism(table_cfg))
+    if pool is None:
+        ranges = pk_ranges(table_cfg, mysql_cfg, workers)
+    else:
+        with pool.connection() as conn:
+            ranges = pk_ranges(table_cfg, mysql_cfg, workers, conn=conn)
+    if not ranges:
+        return
+
+    print(
+        f"[EXTRACT] Reading {table_cfg['source_table']} in {len(ranges)} "
+        f"primary key ranges in parallel"
+    )
+
+    chunks: "queue.Queue" = queue.Queue(maxsize=2 * len(ranges))
+    stop = threading.Event()
+    done = object()
+
+    def _put(item) -> None:
+        _put_until_stopped(chunks, item, stop)
+
+    def _read_range(bounds: Tuple[int, int], conn=None) -> None:
+        for chunk in iter_pk_range(table_cfg, mysql_cfg, *bounds, chunk_rows=chunk_rows, stop=stop, conn=conn):
+            _put(chunk)
+
+    def _read(bounds: Tuple[int, int]) -> None:
+        try:
+            if pool is None:
+                _read_range(bounds)
+            else:
+                with pool.connection() as conn:
+                    _read_range(bounds, conn)
+        except BaseException as e:
+            _put(e)
+        finally:
+            _put(done)
+
+    threads = [
+        threading.Thread(target=_read, args=(bounds,), daemon=True, name=f"extract-{i}")
+        for i, bounds in enumerate(ranges)
+    ]
+    for t in threads:
+        t.start()
+
+    try:
+        remaining = len(threads)
+        while remaining:
+            item = chunks.get()
+            if item is done:
+                remaining -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+
+def iter_incremental_keyset(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    after_value: Any,
+    after_pk: Optional[Any] = None,
+    chunk_rows: Optional[int] = None,
+    conn=None,
+    before: Optional[Any] = None,
+) -> Iterator[Chunk]:
+    """
+    Incremental read paged by the compound cursor (incremental_column, primary_key).
+    With a composite primary key the cursor is (incremental_column, key
+    columns...) and `after_pk` is the tuple of key values.
+
+    Pages are ordered by (incr, pk) and each one starts strictly after the
+    last row of the previous page, so the last row of every chunk is a
+    resumable checkpoint. Rows that share a timestamp are never skipped.
+
+    When `after_pk` is None (a plain timestamp watermark) the boundary
+    timestamp itself is re-read, since rows committed later with the same
+    timestamp would otherwise be missed; the MERGE makes this idempotent.
+
+    With `before`, only rows whose incremental column is below it are read
+    (one time slice of a catch-up).
+    """
+    incr_col = table_cfg["incremental_column"]
+    keys = primary_key_columns(table_cfg)
+    order = ", ".join(keys)
+    # Row-value comparison for a composite key: (a, b) > (%s, %s).
+    key_expr = keys[0] if len(keys) == 1 else f"({order})"
+    key_marks = "%s" if len(keys) == 1 else f"({', '.join(['%s'] * len(keys))})"
+    n = _chunk_rows(table_cfg, chunk_rows)
+    upper = f"AND {incr_col} < %s" if before is not None else ""
+    upper_params = (before,) if before is not None else ()
+    select, projected = _projection(table_cfg)
+
+    first_sql = f"""
+        SELECT {select} FROM {table_cfg['source_table']}
+        WHERE {incr_col} >= %s {upper}
+        ORDER BY {incr_col}, {order}
+        LIMIT {n}
+    """
+    next_sql = f"""
+        SELECT {select} FROM {table_cfg['source_table']}
+        WHERE ({incr_col} > %s OR ({incr_col} = %s AND {key_expr} > {key_marks})) {upper}
+        ORDER BY {incr_col}, {order}
+        LIMIT {n}
+    """
+    last_value, last_pk = after_value, after_pk
+
+    with mysql_session(mysql_cfg, conn) as conn:
+        cur = conn.cursor()
+        try:
+            while True:
+                with span("extract.fetch", table=table_cfg["name"]) as s:
+                    if last_pk is None:
+                        cur.execute(first_sql, (last_value,) + upper_params)
+                    else:
+                        key_params = (last_pk,) if len(keys) == 1 else tuple(last_pk)
+                        cur.execute(next_sql, (last_value, last_value) + key_params + upper_params)
+                    batch = cur.fetchall()
+                    s.add(rows=len(batch))
+                if not batch:
+                    break
+                columns = _column_names(cur, projected)
+                yield _emit(table_cfg, columns, batch)
+                if len(batch) < n:
+                    break
+                last_row = batch[-1]
+                last_value, last_pk = last_row[columns.index(incr_col)], key_getter(columns, keys)(last_row)
+        finally:
+            cur.close()
+
+
+@dataclass
+class TimeSlice:
+    """Half-open window [start, before) of the incremental column; before=None is open-ended."""
+
+    start: Any
+    before: Optional[Any]
+    rows: int
+
+
+def _midpoint(low: Any, high: Any) -> Any:
+    if isinstance(low, datetime):
+        # Whole seconds keep slice bounds readable and match DATETIME columns.
+        mid = (low + (high - low) / 2).replace(microsecond=0)
+        return mid if mid > low else low + timedelta(seconds=1)
+    return low + (high - low) // 2
+
+
+def _count_window(cur, table_cfg: Dict[str, Any], start: Any, before: Optional[Any]) -> int:
+    incr_col = table_cfg["incremental_column"]
+    sql = f"SELECT COUNT(*) FROM {table_cfg['source_table']} WHERE {incr_col} >= %s"
+    params: Tuple = (start,)
+    if before is not None:
+        sql += f" AND {incr_col} < %s"
+        params += (before,)
+    with span("extract.probe", table=table_cfg["name"]):
+        cur.execute(sql, params)
+        return int(cur.fetchone()[0])
+
+
+def source_high_watermark(table_cfg: Dict[str, Any], mysql_cfg: Dict[str, Any], conn=None) -> Any:
+    """
+    MAX(incremental_column) of the source table (an index lookup), or None
+    when it has no rows. Catch-up decisions compare the watermark with this
+    rather than with the local clock.
+    """
+    incr_col = table_cfg["incremental_column"]
+    with mysql_session(mysql_cfg, conn) as conn:
+        cur = conn.cursor()
+        try:
+            with span("extract.probe", table=table_cfg["name"]):
+                cur.execute(f"SELECT MAX({incr_col}) FROM {table_cfg['source_table']}")
+                return cur.fetchone()[0]
+        finally:
+            cur.close()
+
+
+def plan_time_slices(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    after_value: Any,
+    slice_rows: Optional[int] = None,
+    conn=None,
+) -> List[TimeSlice]:
+    """
+    Split the window from `after_value` to the newest row into time slices
+    of about `slice_rows` rows (table_cfg['catchup_slice_rows']).
+
+    The window is bisected on the incremental column, using COUNT(*) probes
+    (index range scans on (incremental_column, primary_key)), until every
+    slice holds at most `slice_rows` rows or is one second wide; adjacent
+    small slices are then merged back together. The last slice is
+    open-ended so rows written during the catch-up are not left behind.
+    """
+    incr_col = table_cfg["incremental_column"]
+    target = int(slice_rows or table_cfg.get("catchup_slice_rows") or DEFAULT_SLICE_ROWS)
+
+    with mysql_session(mysql_cfg, conn) as conn:
+        cur = conn.cursor()
+        try:
+            with span("extract.probe", table=table_cfg["name"]):
+                cur.execute(
+                    f"SELECT {incr_col} FROM {table_cfg['source_table']} WHERE {incr_col} >= %s "
+                    f"ORDER BY {incr_col} DESC LIMIT 1",
+                    (after_value,),
+                )
+                row = cur.fetchone()
+            if row is None or row[0] is None:
+                return []
+            newest = row[0]
+            min_width = timedelta(seconds=1) if isinstance(newest, datetime) else 1
+
+            pending = [TimeSlice(after_value, None, _count_window(cur, table_cfg, after_value, None))]
+            planned: List[TimeSlice] = []
+            while pending:
+                piece = pending.pop()
+                high = newest if piece.before is None else piece.before
+                if piece.rows <= target or high - piece.start <= min_width:
+                    planned.append(piece)
+                    continue
+                mid = _midpoint(piece.start, high)
+                left = _count_window(cur, table_cfg, piece.start, mid)
+                # Right half first, so the left half is popped (and planned) first.
+                pending.append(TimeSlice(mid, piece.before, max(piece.rows - left, 0)))
+                pending.append(TimeSlice(piece.start, mid, left))
+        finally:
+            cur.close()
+
+    merged: List[TimeSlice] = []
+    for piece in planned:
+        if merged and merged[-1].rows + piece.rows <= target:
+            merged[-1] = TimeSlice(merged[-1].start, piece.before, merged[-1].rows + piece.rows)
+        else:
+            merged.append(piece)
+    return merged
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{secs:02d}s" if hours else f"{minutes}m{secs:02d}s"
+
+
+def iter_incremental_catchup(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    after_value: Any,
+    after_pk: Optional[Any] = None,
+    parallelism: Optional[int] = None,
+    slice_rows: Optional[int] = None,
+    chunk_rows: Optional[int] = None,
+    pool: Optional[ConnectionPool] = None,
+) -> Iterator[Chunk]:
+    """
+    Catch-up read of a large incremental window: the window is split into
+    time slices (plan_time_slices), up to `parallelism` slices are extracted
+    at once, each on its own thread and MySQL connection (from `pool` when
+    given), and the chunks are yielded slice by slice in time order.
+
+    Within a slice chunks are in (incremental_column, primary_key) order,
+    so the stream as a whole is in checkpoint order: the loader can move the
+    watermark after every chunk, and a crash resumes from the last chunk
+    loaded. Slices that are ahead of the loader buffer at most one slice of
+    chunks each. Progress (slices, rows, ETA) is printed after each slice.
+    """
+    name = table_cfg["name"]
+    workers = int(parallelism or table_cfg.get("catchup_parallelism") or _parallelism(table_cfg))
+    n = _chunk_rows(table_cfg, chunk_rows)
+    if pool is None:
+        slices = plan_time_slices(table_cfg, mysql_cfg, after_value, slice_rows)
+    else:
+        with pool.connection() as conn:
+            slices = plan_time_slices(table_cfg, mysql_cfg, after_value, slice_rows, conn=conn)
+    if not slices:
+        return
+
+    estimated = sum(s.rows for s in slices)
+    workers = max(1, min(workers, len(slices)))
+    print(
+        f"[CATCHUP] {name}: ~{estimated} rows after {after_value} in {len(slices)} time slices, "
+        f"{workers} readers"
+    )
+
+    # Each slice buffers up to one slice worth of chunks.
+    per_slice = max(2, -(-max(s.rows for s in slices) // n))
+    buffers = [queue.Queue(maxsize=per_slice) for _ in slices]
+    stop = threading.Event()
+    done = object()
+    claim = iter(range(len(slices)))
+    claim_lock = threading.Lock()
+
+    def _read_slice(i: int, conn=None) -> None:
+        piece = slices[i]
+        # Only the first slice starts at the stored (timestamp, pk) cursor.
+        start_pk = after_pk if i == 0 else None
+        for chunk in iter_incremental_keyset(
+            table_cfg, mysql_cfg, piece.start, start_pk, chunk_rows=n, conn=conn, before=piece.before
+        ):
+            if stop.is_set():
+                return
+            _put_until_stopped(buffers[i], chunk, stop)
+
+    def _reader() -> None:
+        while not stop.is_set():
+            with claim_lock:
+                i = next(claim, None)
+            if i is None:
+                return
+            try:
+                if pool is None:
+                    _read_slice(i)
+                else:
+                    with pool.connection() as conn:
+                        _read_slice(i, conn)
+            except BaseException as e:
+                _put_until_stopped(buffers[i], e, stop)
+            finally:
+                _put_until_stopped(buffers[i], done, stop)
+
+    threads = [
+        threading.Thread(target=_reader, daemon=True, name=f"catchup-{name}-{i}")
+        for i in range(workers)
+    ]
+    for t in threads:
+        t.start()
+
+    started = time.perf_counter()
+    rows_done = 0
+    try:
+        for i, piece in enumerate(slices):
+            slice_rows_read = 0
+            while True:
+                with span("extract.wait", table=name):
+                    item = buffers[i].get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                slice_rows_read += len(item[1])
+                yield item
+            rows_done += slice_rows_read
+            elapsed = time.perf_counter() - started
+            total = max(estimated, rows_done)
+            eta = elapsed / rows_done * (total - rows_done) if rows_done else 0.0
+            print(
+                f"[CATCHUP] {name}: slice {i + 1}/{len(slices)} [{piece.start} .. {piece.before or 'end'}) "
+                f"{slice_rows_read} rows; {rows_done}/{total} ({100.0 * rows_done / total if total else 100.0:.0f}%), "
+                f"elapsed {_format_seconds(elapsed)}, ETA {_format_seconds(eta)}"
+            )
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
@@ -2,22 +2,20 @@
 
 from typing import Dict, Any, List, Tuple
 
-from src.common.config_loader import load_config
+from src.common.config_loader import PipelineConfig, get_config
 from src.extract.mysql_extractor import fetch_full_table
 from src.load.snowflake_loader import full_load_to_raw
 
 
 def main() -> None:
     # 1. Load configuration
-    config: Dict[str, Any] = load_config("configs/config.yaml")
+    config: PipelineConfig = get_config("configs/config.yaml")
 
-    mysql_cfg: Dict[str, Any] = config["mysql"]
-    sf_cfg: Dict[str, Any] = config["snowflake"]
+    mysql_cfg: Dict[str, Any] = config.mysql
+    sf_cfg: Dict[str, Any] = config.snowflake
 
     # 2. Get table config for 'customers'
-    table_cfg: Dict[str, Any] = next(
-        t for t in config["tables"] if t["name"] == "customers"
-    )
+    table_cfg: Dict[str, Any] = config.table("customers")
 
     print("[TEST] MySQL config:")
     print(mysql_cfg)
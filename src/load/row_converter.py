@@ -0,0 +1,119 @@
+# src/load/row_converter.py
+
+"""
+Per-table row converters for the executemany INSERT path.
+
+With client-side binding the Snowflake connector renders every bound value
+through its generic converter: a lookup by the value's class name, then
+escape and quote. For a datetime that costs more than twice what a str
+does (its formatter is pure Python, field by field), and every RAW table
+has at least one TIMESTAMP_NTZ column. A RowConverter is built once per
+(RAW table, column list) from the RAW DDL (sql/02_create_raw_tables.sql)
+and renders those columns of a whole batch up front with str(), the same
+literal the connector would produce:
+
+- TIMESTAMP* / DATETIME  -> "2025-01-01 10:00:00[.ffffff]"
+- DATE                   -> "2025-01-01"
+- everything else        -> passed through untouched
+
+NUMBER(p,s) columns are left as Decimal on purpose: the connector binds a
+Decimal as str(value) already, and a pre-rendered string would only add
+its escape pass (see src/bench/bench_row_converter.py).
+
+Conversion is column-wise, columns that need nothing are not touched, a
+RecordBatch comes back as a RecordBatch, and a batch with no such columns
+is returned as is. Snowflake casts the strings
+back on insert, so the RAW rows are identical.
+"""
+
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from src.common.record_batch import ObjectColumn, RecordBatch
+
+RAW_DDL_PATH = "sql/02_create_raw_tables.sql"
+
+_CREATE_RE = re.compile(r"CREATE\s+(?:OR\s+REPLACE\s+)?TABLE\s+(\w+)\s*\((.*?)\);", re.IGNORECASE | re.DOTALL)
+_COLUMN_RE = re.compile(r"^\s*(\w+)\s+(\w+(?:\s*\(\s*\d+\s*(?:,\s*\d+\s*)?\))?)", re.MULTILINE)
+
+
+def converter_for_type(sql_type: str) -> Optional[Callable[[Any], Any]]:
+    """Per-value converter for a RAW column type, None when none is needed."""
+    t = sql_type.upper()
+    # str(datetime) / str(date) is the ISO literal, rendered in C.
+    if t.startswith("TIMESTAMP") or t in ("DATETIME", "DATE"):
+        return str
+    return None
+
+
+@lru_cache(maxsize=None)
+def parse_raw_column_types(ddl_path: str = RAW_DDL_PATH) -> Dict[str, Dict[str, str]]:
+    """
+    {TABLE: {COLUMN: type}} for every CREATE TABLE in the RAW DDL file (upper
+    case); empty when the file is missing, which turns conversion off.
+    """
+    path = Path(ddl_path)
+    if not path.exists():
+        return {}
+    tables = {}
+    for name, body in _CREATE_RE.findall(path.read_text()):
+        body = re.sub(r"--[^\n]*", "", body)
+        tables[name.upper()] = {col.upper(): sql_type for col, sql_type in _COLUMN_RE.findall(body)}
+    return tables
+
+
+class RowConverter:
+    """Converts whole batches of one table's rows for executemany."""
+
+    def __init__(self, columns: Sequence[str], converters: Sequence[Optional[Callable[[Any], Any]]]):
+        self.columns = list(columns)
+        self.converters = list(converters)
+        self.needed = [i for i, conv in enumerate(self.converters) if conv is not None]
+
+    def describe(self) -> str:
+        return ", ".join(f"{self.columns[i]}:{self.converters[i].__name__}" for i in self.needed) or "no conversion"
+
+    def convert(self, batch: Sequence[Tuple]) -> Sequence[Tuple]:
+        if not self.needed or not batch:
+            return batch
+        if isinstance(batch, RecordBatch):
+            # Only the converted columns are materialised; the rest keep their
+            # typed buffers and the result stays a RecordBatch.
+            return batch.replace_columns({
+                i: ObjectColumn([v if v is None else self.converters[i](v) for v in batch.arrays[i].to_pylist()])
+                for i in self.needed
+            })
+        columns = list(zip(*batch))
+        for i in self.needed:
+            conv = self.converters[i]
+            columns[i] = [v if v is None else conv(v) for v in columns[i]]
+        return list(zip(*columns))
+
+
+_converters: Dict[Tuple[str, str, Tuple[str, ...]], RowConverter] = {}
+_converters_lock = threading.Lock()
+
+
+def row_converter_for(
+    raw_table: str,
+    columns: Sequence[str],
+    ddl_path: str = RAW_DDL_PATH,
+) -> RowConverter:
+    """
+    The converter of `columns` of `raw_table`, built from the RAW DDL on first
+    use and cached. Columns the DDL does not know are passed through.
+    """
+    key = (ddl_path, raw_table.upper(), tuple(c.upper() for c in columns))
+    with _converters_lock:
+        converter = _converters.get(key)
+        if converter is None:
+            types = parse_raw_column_types(ddl_path).get(key[1], {})
+            converter = RowConverter(
+                columns, [converter_for_type(types[c]) if c in types else None for c in key[2]]
+            )
+            _converters[key] = converter
+        return converter
+
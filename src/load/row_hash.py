@@ -0,0 +1,314 @@
+# src/load/row_hash.py
+
+"""
+Row fingerprints used to skip unchanged rows before they are staged and
+MERGEd.
+
+Each table keeps a local index {primary key: 64-bit hash of the non-audit
+columns} in a small SQLite file (composite keys as JSON text). Rows whose hash matches the index are
+dropped from the batch; new hashes are only persisted after the Snowflake
+transaction that loaded them has committed, so a failed load never marks
+rows as already loaded.
+
+The index is only a cache of RAW's ROW_HASH column. It records the table
+watermark it is in sync with; when a load on another host (an Airflow
+worker, say) has moved the watermark past it, the index is re-seeded from
+RAW before anything is skipped, so a stale hash never hides a change.
+"""
+
+import hashlib
+import json
+import sqlite3
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.common.record_batch import Int64Column, RecordBatch, encode_value
+from src.common.schema_registry import primary_key_columns
+
+ROW_HASH_DIR = ".etl_state/row_hashes"
+
+# SQLite's default limit on host parameters per statement is 999.
+_LOOKUP_BATCH = 900
+
+
+def row_fingerprint(values: Tuple) -> int:
+    """
+    Stable signed 64-bit hash of a tuple of column values (stable across
+    processes, unlike hash()).
+    """
+    digest = hashlib.blake2b(repr(values).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _encode_watermark(value: Any) -> str:
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _behind(synced: Optional[str], watermark: Any) -> bool:
+    if synced is None:
+        return True
+    if synced == _encode_watermark(watermark):
+        return False
+    if isinstance(watermark, datetime):
+        try:
+            return datetime.fromisoformat(synced) < watermark
+        except (TypeError, ValueError):
+            pass
+    # Cannot be ordered: assume loads were missed.
+    return True
+
+
+def _composite_key(key: Tuple) -> str:
+    # SQLite cannot bind a tuple; composite keys are stored as JSON text.
+    return json.dumps([encode_value(v) for v in key])
+
+
+class RowHashIndex:
+    """
+    On-disk {pk: hash} index for one table. Lookups and writes are batched;
+    nothing is held in memory beyond the current chunk.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # The runner loads tables on worker threads; each index is used by
+        # one thread at a time.
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS row_hash (pk INTEGER PRIMARY KEY, h INTEGER NOT NULL) WITHOUT ROWID"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT)")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+
+    def lookup(self, pks: List[Any]) -> Dict[Any, int]:
+        found: Dict[Any, int] = {}
+        for i in range(0, len(pks), _LOOKUP_BATCH):
+            part = pks[i:i + _LOOKUP_BATCH]
+            sql = f"SELECT pk, h FROM row_hash WHERE pk IN ({', '.join('?' * len(part))})"
+            found.update(self._db.execute(sql, part).fetchall())
+        return found
+
+    def upsert(self, items: List[Tuple[Any, int]]) -> None:
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO row_hash (pk, h) VALUES (?, ?)", items)
+
+    def delete(self, pks: List[Any]) -> None:
+        with self._db:
+            self._db.executemany("DELETE FROM row_hash WHERE pk = ?", [(pk,) for pk in pks])
+
+    def clear(self) -> None:
+        with self._db:
+            self._db.execute("DELETE FROM row_hash")
+            self._db.execute("DELETE FROM meta")
+
+    def synced_to(self) -> Optional[str]:
+        """The watermark (isoformat) the index was last marked in sync with."""
+        row = self._db.execute("SELECT v FROM meta WHERE k = 'watermark'").fetchone()
+        return row[0] if row else None
+
+    def mark_synced(self, watermark: str) -> None:
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta (k, v) VALUES ('watermark', ?)", (watermark,))
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM row_hash").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class RowHashFilter:
+    """
+    Per-table change detector built from table_cfg:
+
+    - row_hash_exclude: columns left out of the fingerprint
+      (defaults to [incremental_column], the audit timestamp).
+    - row_hash_column: optional RAW column that mirrors the fingerprint;
+      when set it is appended to every batch that goes to Snowflake.
+
+    filter() drops unchanged rows and queues the new hashes; commit() makes
+    them durable once the load that used them has committed. mark_synced()
+    records the watermark a finished load moved the table to, and
+    bootstrap_from_raw() re-seeds an index that is behind the table's.
+    """
+
+    def __init__(self, table_cfg: Dict[str, Any], index_dir: str = ROW_HASH_DIR):
+        self.table_cfg = table_cfg
+        self.keys = primary_key_columns(table_cfg)
+        self.exclude = {c.lower() for c in table_cfg.get("row_hash_exclude", [table_cfg["incremental_column"]])}
+        self.hash_column: Optional[str] = table_cfg.get("row_hash_column")
+        self.index = RowHashIndex(str(Path(index_dir) / f"{table_cfg['name']}.sqlite"))
+        self.rows_in = 0
+        self.rows_skipped = 0
+        self._pending: List[Tuple[Any, int]] = []
+        self._pending_deletes: List[Any] = []
+        self._layout: Optional[Tuple[Tuple[str, ...], List[int], List[int]]] = None
+
+    def _columns_layout(self, columns: List[str]) -> Tuple[List[int], List[int]]:
+        key = tuple(columns)
+        if self._layout is None or self._layout[0] != key:
+            key_idx = [columns.index(c) for c in self.keys]
+            hashed = [i for i, c in enumerate(columns) if c.lower() not in self.exclude]
+            self._layout = (key, key_idx, hashed)
+        return self._layout[1], self._layout[2]
+
+    def _index_key(self, key: Tuple) -> Any:
+        """Index entry for a key tuple (key columns in primary_key order)."""
+        return key[0] if len(key) == 1 else _composite_key(key)
+
+    def filter(
+        self,
+        columns: List[str],
+        batch: List[Tuple],
+        skip_unchanged: bool = True,
+    ) -> Tuple[List[str], List[Tuple]]:
+        """
+        Return (columns, rows to load). With skip_unchanged=False every row is
+        kept (full loads) but its hash is still recorded.
+        """
+        key_idx, hashed = self._columns_layout(columns)
+        if isinstance(batch, RecordBatch):
+            return self._filter_record_batch(columns, batch, key_idx, hashed, skip_unchanged)
+        if len(key_idx) == 1:
+            pk_idx = key_idx[0]
+            hashes = [(row[pk_idx], row_fingerprint(tuple(row[i] for i in hashed))) for row in batch]
+        else:
+            hashes = [
+                (_composite_key(tuple(row[i] for i in key_idx)), row_fingerprint(tuple(row[i] for i in hashed)))
+                for row in batch
+            ]
+        known = self.index.lookup([pk for pk, _ in hashes]) if skip_unchanged else {}
+
+        keep: List[Tuple] = []
+        for row, (pk, h) in zip(batch, hashes):
+            if known.get(pk) == h:
+                continue
+            if self.hash_column:
+                row = tuple(row) + (h,)
+            keep.append(row)
+            self._pending.append((pk, h))
+
+        self.rows_in += len(batch)
+        self.rows_skipped += len(batch) - len(keep)
+        out_columns = columns + [self.hash_column] if self.hash_column else columns
+        return out_columns, keep
+
+    def _filter_record_batch(
+        self,
+        columns: List[str],
+        batch: RecordBatch,
+        key_idx: List[int],
+        hashed: List[int],
+        skip_unchanged: bool,
+    ) -> Tuple[List[str], RecordBatch]:
+        """
+        filter() for a RecordBatch, column by column: the hashed columns are
+        read once each, and the kept rows are taken from the typed buffers,
+        so the result is a RecordBatch as well. The fingerprints are the same
+        as for the equivalent row tuples.
+        """
+        if len(key_idx) == 1:
+            pks = batch.arrays[key_idx[0]].to_pylist()
+        else:
+            pks = [_composite_key(key) for key in zip(*(batch.arrays[i].to_pylist() for i in key_idx))]
+        values = [batch.arrays[i].to_pylist() for i in hashed]
+        hashes = [row_fingerprint(row) for row in zip(*values)]
+        known = self.index.lookup(pks) if skip_unchanged else {}
+
+        keep_idx = [i for i, (pk, h) in enumerate(zip(pks, hashes)) if known.get(pk) != h]
+        self._pending.extend((pks[i], hashes[i]) for i in keep_idx)
+        self.rows_in += batch.num_rows
+        self.rows_skipped += batch.num_rows - len(keep_idx)
+
+        kept = batch if len(keep_idx) == batch.num_rows else batch.take(keep_idx)
+        if not self.hash_column:
+            return columns, kept
+        hash_col = Int64Column(array("q", [hashes[i] for i in keep_idx]), None)
+        return columns + [self.hash_column], kept.with_column(self.hash_column, hash_col)
+
+    def forget(self, keys: List[Tuple]) -> None:
+        """
+        Queue deleted rows for removal from the index (applied by commit()).
+        `keys` are tuples of the key columns in primary_key order.
+        """
+        self._pending_deletes.extend(self._index_key(key) for key in keys)
+
+    def commit(self) -> None:
+        if self._pending_deletes:
+            self.index.delete(self._pending_deletes)
+            self._pending_deletes = []
+        if self._pending:
+            self.index.upsert(self._pending)
+            self._pending = []
+
+    def rollback(self) -> None:
+        self._pending = []
+        self._pending_deletes = []
+
+    def reset(self) -> None:
+        """Forget every known hash (before a full reload)."""
+        self.index.clear()
+        self._pending = []
+        self._pending_deletes = []
+
+    def mark_synced(self, watermark: Any) -> None:
+        """Record that the index holds every row loaded up to `watermark`."""
+        if watermark is not None:
+            self.index.mark_synced(_encode_watermark(watermark))
+
+    def is_stale(self, watermark: Any) -> bool:
+        """
+        True when the table's `watermark` is past the one the index was
+        marked in sync with (or the index never was): loads it did not see
+        have moved RAW on.
+        """
+        if watermark is None:
+            return False
+        return _behind(self.index.synced_to(), watermark)
+
+    def bootstrap_from_raw(self, cur, watermark: Any = None) -> int:
+        """
+        Seed the local index from the RAW table's mirrored hash column when it
+        is empty, or when it is stale against the table's current
+        `watermark` (see is_stale), in which case it is cleared first.
+        Returns the number of hashes loaded.
+        """
+        if not self.hash_column:
+            return 0
+        if len(self.index):
+            if not self.is_stale(watermark):
+                return 0
+            print(
+                f"[HASH] {self.table_cfg['name']}: index synced to {self.index.synced_to()}, "
+                f"table watermark is {watermark}; re-seeding from RAW"
+            )
+            self.index.clear()
+        cur.execute(
+            f"SELECT {', '.join(self.keys)}, {self.hash_column} FROM {self.table_cfg['target_table']} "
+            f"WHERE {self.hash_column} IS NOT NULL"
+        )
+        total = 0
+        while True:
+            rows = cur.fetchmany(50_000)
+            if not rows:
+                break
+            self.index.upsert([(self._index_key(row[:-1]), int(row[-1])) for row in rows])
+            total += len(rows)
+        print(f"[HASH] {self.table_cfg['name']}: seeded {total} row hashes from {self.table_cfg['target_table']}")
+        # RAW holds everything loaded up to the current watermark.
+        self.mark_synced(watermark)
+        return total
+
+    def report(self) -> str:
+        pct = 100.0 * self.rows_skipped / self.rows_in if self.rows_in else 0.0
+        return (
+            f"[HASH] {self.table_cfg['name']}: skipped {self.rows_skipped} of {self.rows_in} "
+            f"unchanged rows ({pct:.1f}%)"
+        )
+
+    def close(self) -> None:
+        self.index.close()
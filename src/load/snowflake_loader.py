@@ -1,7 +1,60 @@
 # src/load/snowflake_loader.py
 
-from typing import List, Tuple, Dict, Any
-from src.common.db_connections import get_snowflake_conn
+import csv
+import gzip
+import tempfile
+import time
+import uuid
+from itertools import chain
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Dict, Any, Union
+from src.common.batch_sizer import BatchSizer, executemany_batched, sizer_for
+from src.common.db_connections import snowflake_session
+from src.common.instrumentation import span, table_scope
+from src.common.record_batch import RecordBatch
+from src.common.schema_registry import primary_key_columns
+from src.load.row_converter import row_converter_for
+
+Chunk = Tuple[List[str], List[Tuple]]
+
+# Internal stage used by the bulk (PUT + COPY INTO) load path. The user stage
+# needs no DDL and works for TEMP staging tables as well as RAW tables.
+BULK_STAGE = "@~/etl_bulk"
+
+# NULL marker written to bulk-load files; matched by NULL_IF in the COPY.
+CSV_NULL = "\\N"
+
+BULK_FILE_FORMAT = (
+    "TYPE = CSV "
+    "COMPRESSION = GZIP "
+    "FIELD_OPTIONALLY_ENCLOSED_BY = '\"' "
+    "ESCAPE_UNENCLOSED_FIELD = NONE "
+    "EMPTY_FIELD_AS_NULL = FALSE "
+    "NULL_IF = ('\\\\N')"
+)
+
+
+def _peek_chunks(chunks: Iterable[Chunk]):
+    """
+    Return (first_chunk, iterator over all chunks) or (None, None) when the
+    stream holds no rows, without materialising anything past the first chunk.
+    """
+    it = iter(chunks)
+    for columns, batch in it:
+        if batch:
+            return (columns, batch), chain([(columns, batch)], it)
+    return None, None
+
+
+def _seed_row_hashes(chunks: Iterable[Chunk], row_filter) -> Iterable[Chunk]:
+    # A failed full load leaves no watermark, so the next run reloads and
+    # resets the index; hashes can therefore be persisted chunk by chunk.
+    for columns, batch in chunks:
+        with span("load.row_hash") as s:
+            out = row_filter.filter(columns, batch, skip_unchanged=False)
+            row_filter.commit()
+            s.add(rows=len(batch))
+        yield out
 
 
 def full_load_to_raw(
@@ -9,6 +62,7 @@ def full_load_to_raw(
     rows: List[Tuple],
     table_cfg: Dict[str, Any],
     sf_cfg: Dict[str, Any],
+    conn=None,
 ) -> None:
     """
     Perform a full load into a Snowflake RAW table:
@@ -21,50 +75,74 @@ def full_load_to_raw(
         rows: list of tuples, each tuple is one record.
         table_cfg: table configuration dict with 'target_table', etc.
         sf_cfg: Snowflake configuration dict from config.yaml.
+        conn: optional open Snowflake connection to reuse (left open).
+    """
+    if rows:
+        print(f"[FULL LOAD] Number of rows to insert: {len(rows)}")
+    full_load_chunks_to_raw([(columns, rows)], table_cfg, sf_cfg, conn=conn)
+
+
+def full_load_chunks_to_raw(
+    chunks: Iterable[Chunk],
+    table_cfg: Dict[str, Any],
+    sf_cfg: Dict[str, Any],
+    conn=None,
+    row_filter=None,
+) -> int:
+    """
+    Streaming full load: TRUNCATE the target table, then insert each
+    (columns, batch) chunk as it arrives (e.g. from mysql_extractor.iter_full_table).
+
+    Only one chunk is held in memory at a time. An injected `conn` is reused
+    and left open. A `row_filter` (row_hash.RowHashFilter) is reset and
+    re-seeded with the hash of every loaded row. Returns the number of rows
+    inserted.
     """
     target_table = table_cfg["target_table"]
 
-    if not rows:
+    if row_filter is not None:
+        row_filter.reset()
+        chunks = _seed_row_hashes(chunks, row_filter)
+
+    first, chunks = _peek_chunks(chunks)
+    if first is None:
         print(f"[FULL LOAD] No rows provided for table {target_table}. Skipping.")
-        return
+        return 0
 
     print(f"[FULL LOAD] Starting full load into {target_table} ...")
-    print(f"[FULL LOAD] Number of rows to insert: {len(rows)}")
 
-    conn = get_snowflake_conn(sf_cfg)
-    cur = conn.cursor()
+    with snowflake_session(sf_cfg, conn) as conn:
+        cur = conn.cursor()
 
-    try:
-        # 1. Truncate the target table
-        truncate_sql = f"TRUNCATE TABLE {target_table}"
-        print(f"[FULL LOAD] Executing: {truncate_sql}")
-        cur.execute(truncate_sql)
+        try:
+            # 1. Truncate the target table
+            truncate_sql = f"TRUNCATE TABLE {target_table}"
+            print(f"[FULL LOAD] Executing: {truncate_sql}")
+            with span("load.truncate", table=table_cfg["name"]):
+                cur.execute(truncate_sql)
 
-        # 2. Insert all rows
-        col_list = ", ".join(columns)
-        # snowflake-connector-python uses %s placeholders
-        placeholders = ", ".join(["%s"] * len(columns))
-        insert_sql = f"INSERT INTO {target_table} ({col_list}) VALUES ({placeholders})"
-
-        print(f"[FULL LOAD] Inserting rows into {target_table} ...")
-        cur.executemany(insert_sql, rows)
+            # 2. Insert rows chunk by chunk
+            print(f"[FULL LOAD] Inserting rows into {target_table} ...")
+            total = load_chunks(cur, target_table, chunks, table_cfg)
 
-        conn.commit()
-        print(f"[FULL LOAD] Completed full load into {target_table}. Rows inserted: {len(rows)}")
+            with span("load.commit", table=table_cfg["name"]):
+                conn.commit()
+            print(f"[FULL LOAD] Completed full load into {target_table}. Rows inserted: {total}")
+            return total
 
-    except Exception as e:
-        conn.rollback()
-        print(f"[FULL LOAD] Error during full load into {target_table}: {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+        except Exception as e:
+            conn.rollback()
+            print(f"[FULL LOAD] Error during full load into {target_table}: {e}")
+            raise
+        finally:
+            cur.close()
 
 def incremental_upsert_to_raw(
     columns: List[str],
     rows: List[Tuple],
     table_cfg: Dict[str, Any],
     sf_cfg: Dict[str, Any],
+    conn=None,
 ) -> None:
     """
     Upsert incremental rows into RAW table using a TEMP staging table + MERGE.
@@ -73,67 +151,610 @@ def incremental_upsert_to_raw(
     - rows: list of tuples with data
     - table_cfg: config entry for this table (includes target_table, primary_key)
     - sf_cfg: Snowflake config
+    - conn: optional open Snowflake connection to reuse (left open)
+    """
+    incremental_upsert_chunks_to_raw([(columns, rows)], table_cfg, sf_cfg, conn=conn)
+
+
+def incremental_upsert_chunks_to_raw(
+    chunks: Iterable[Chunk],
+    table_cfg: Dict[str, Any],
+    sf_cfg: Dict[str, Any],
+    conn=None,
+) -> int:
     """
-    if not rows:
+    Streaming variant of incremental_upsert_to_raw.
+
+    Each (columns, batch) chunk (e.g. from mysql_extractor.iter_incremental_rows)
+    is inserted into the TEMP staging table as it arrives; a single MERGE runs
+    once the stream is exhausted. Returns the number of rows staged.
+    """
+    first, chunks = _peek_chunks(chunks)
+    if first is None:
         print(f"[INCREMENTAL] No rows to load for {table_cfg['name']}.")
-        return
+        return 0
 
-    conn = get_snowflake_conn(sf_cfg)
-    cur = conn.cursor()
+    columns = first[0]
 
     target_table = table_cfg["target_table"]
-    pk = table_cfg["primary_key"]
     temp_table = f"{target_table}_STAGE"
 
-    col_list = ", ".join(columns)
-    placeholders = ", ".join(["%s"] * len(columns))
+    with snowflake_session(sf_cfg, conn) as conn:
+        cur = conn.cursor()
 
-    try:
-        print(f"[INCREMENTAL] Creating temp staging table {temp_table}...")
-        # 1. Create temp table with same structure as target (no data)
-        cur.execute(
-            f"CREATE OR REPLACE TEMP TABLE {temp_table} AS "
-            f"SELECT * FROM {target_table} WHERE 1=0"
-        )
+        try:
+            print(f"[INCREMENTAL] Creating temp staging table {temp_table}...")
+            # 1. Create temp table with same structure as target (no data)
+            cur.execute(
+                f"CREATE OR REPLACE TEMP TABLE {temp_table} AS "
+                f"SELECT * FROM {target_table} WHERE 1=0"
+            )
+
+            # 2. Insert new/changed rows into temp table, one chunk at a time
+            total = load_chunks(cur, temp_table, chunks, table_cfg)
+
+            print(f"[INCREMENTAL] Inserted {total} rows into {temp_table}.")
+
+            # 3. MERGE the latest staged row per key into the target
+            merge_sql = merge_sql_for(table_cfg, columns, target_table, temp_table)
+
+            print(f"[INCREMENTAL] Running MERGE into {target_table}...")
+            with span("load.merge", table=table_cfg["name"]) as s:
+                cur.execute(merge_sql)
+                conn.commit()
+                s.add(rows=total)
+            print(f"[INCREMENTAL] Upsert completed for {target_table}. Rows processed: {total}")
+            return total
+
+        finally:
+            cur.close()
+
+
+def merge_sql_for(table_cfg: Dict[str, Any], columns: List[str], target_table: str, source_table: str) -> str:
+    """
+    build_merge_sql with the table's keys, deduped on its incremental column.
+
+    When the batch carries the row_hash_column, matched rows are compared on
+    that single fingerprint column instead of on every column.
+    """
+    hash_column = table_cfg.get("row_hash_column")
+    return build_merge_sql(
+        columns,
+        target_table,
+        source_table,
+        primary_key_columns(table_cfg),
+        incremental_column=table_cfg.get("incremental_column"),
+        change_columns=[hash_column] if hash_column and hash_column in columns else None,
+    )
+
+
+def build_merge_sql(
+    columns: List[str],
+    target_table: str,
+    source_table: str,
+    pk: Union[str, List[str]],
+    incremental_column: Optional[str] = None,
+    change_columns: Optional[List[str]] = None,
+) -> str:
+    """
+    MERGE rows of `source_table` into `target_table` on the key column(s) `pk`:
+    update the non-key columns of matched rows, insert the rest.
+
+    - With `incremental_column`, the source is first deduped to the latest
+      row per key (QUALIFY ROW_NUMBER()), so keys staged several times in
+      one batch neither fail the MERGE nor update a row twice.
+    - Matched rows are only updated when one of `change_columns` differs
+      (NULL-safe); by default every non-key column except
+      `incremental_column`. Rows that were only touched are left alone, so
+      their micro-partitions are not rewritten.
+    """
+    keys = [pk] if isinstance(pk, str) else list(pk)
+    key_set = {k.lower() for k in keys}
+
+    #    ON condition = every key column
+    on_cond = " AND ".join(f"t.{k} = s.{k}" for k in keys)
 
-        # 2. Insert new/changed rows into temp table
-        insert_sql = f"INSERT INTO {temp_table} ({col_list}) VALUES ({placeholders})"
-        cur.executemany(insert_sql, rows)
+    #    SET clause for all non-key columns
+    set_clause = ", ".join(f"t.{c} = s.{c}" for c in columns if c.lower() not in key_set)
 
-        print(f"[INCREMENTAL] Inserted {len(rows)} rows into {temp_table}.")
+    #    Only rewrite rows whose data changed
+    if change_columns is None:
+        skip = key_set | ({incremental_column.lower()} if incremental_column else set())
+        change_columns = [c for c in columns if c.lower() not in skip]
+    changed = " OR ".join(f"NOT EQUAL_NULL(t.{c}, s.{c})" for c in change_columns)
+    when_matched = f"WHEN MATCHED AND ({changed}) THEN" if changed else "WHEN MATCHED THEN"
 
-        # 3. Build MERGE statement
-        #    ON condition = primary key
-        on_cond = f"t.{pk} = s.{pk}"
+    #    INSERT column list + VALUES from source
+    insert_columns = ", ".join(columns)
+    insert_values = ", ".join([f"s.{c}" for c in columns])
+
+    #    Latest staged row per key
+    if incremental_column:
+        source = f"""(
+            SELECT * FROM {source_table}
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY {', '.join(keys)} ORDER BY {incremental_column} DESC) = 1
+        )"""
+    else:
+        source = source_table
+
+    if not set_clause:
+        return f"""
+        MERGE INTO {target_table} AS t
+        USING {source} AS s
+        ON {on_cond}
+        WHEN NOT MATCHED THEN
+          INSERT ({insert_columns})
+          VALUES ({insert_values});
+    """
+
+    return f"""
+        MERGE INTO {target_table} AS t
+        USING {source} AS s
+        ON {on_cond}
+        {when_matched}
+          UPDATE SET {set_clause}
+        WHEN NOT MATCHED THEN
+          INSERT ({insert_columns})
+          VALUES ({insert_values});
+    """
+
+
+def incremental_upsert_checkpointed(
+    chunks: Iterable[Chunk],
+    table_cfg: Dict[str, Any],
+    sf_cfg: Dict[str, Any],
+    checkpoint: Callable[[Any, List[str], List[Tuple]], None],
+    conn=None,
+    row_filter=None,
+) -> int:
+    """
+    Incremental upsert that commits after every chunk.
 
-        #    SET clause for all non-PK columns
-        set_clause_list = []
-        for c in columns:
-            if c == pk:
+    For each (columns, batch) chunk: reload the TEMP staging table, then in
+    one transaction MERGE it into the target and call
+    `checkpoint(cur, columns, batch)` so the caller can record how far the
+    load got (e.g. watermark_utils.write_checkpoint). A crash loses at most
+    the chunk in flight.
+
+    With a `row_filter` (row_hash.RowHashFilter) only rows whose fingerprint
+    changed are staged and merged; the checkpoint still covers the whole
+    chunk. Returns the number of rows merged.
+    """
+    first, chunks = _peek_chunks(chunks)
+    if first is None:
+        print(f"[INCREMENTAL] No rows to load for {table_cfg['name']}.")
+        return 0
+
+    target_table = table_cfg["target_table"]
+    temp_table = f"{target_table}_STAGE"
+    total = 0
+
+    with snowflake_session(sf_cfg, conn) as conn:
+        cur = conn.cursor()
+
+        try:
+            print(f"[INCREMENTAL] Creating temp staging table {temp_table}...")
+            cur.execute(
+                f"CREATE OR REPLACE TEMP TABLE {temp_table} AS "
+                f"SELECT * FROM {target_table} WHERE 1=0"
+            )
+            merge_sql = None
+
+            for columns, batch in chunks:
+                if not batch:
+                    continue
+                load_columns, load_batch = columns, batch
+                if row_filter is not None:
+                    with span("load.row_hash", table=table_cfg["name"]) as s:
+                        load_columns, load_batch = row_filter.filter(columns, batch)
+                        s.add(rows=len(batch))
+
+                if load_batch:
+                    if merge_sql is None:
+                        merge_sql = merge_sql_for(table_cfg, load_columns, target_table, temp_table)
+                    with span("load.truncate", table=table_cfg["name"]):
+                        cur.execute(f"TRUNCATE TABLE {temp_table}")
+                    load_chunks(cur, temp_table, [(load_columns, load_batch)], table_cfg)
+
+                cur.execute("BEGIN")
+                try:
+                    if load_batch:
+                        with span("load.merge", table=table_cfg["name"]) as s:
+                            cur.execute(merge_sql)
+                            s.add(rows=len(load_batch))
+                    checkpoint(cur, columns, batch)
+                    with span("load.commit", table=table_cfg["name"]):
+                        cur.execute("COMMIT")
+                except Exception:
+                    cur.execute("ROLLBACK")
+                    if row_filter is not None:
+                        row_filter.rollback()
+                    raise
+                if row_filter is not None:
+                    row_filter.commit()
+
+                total += len(load_batch)
+                print(f"[INCREMENTAL] {target_table}: {total} rows merged and checkpointed")
+
+            return total
+
+        finally:
+            cur.close()
+
+
+# Keys per DELETE statement; keeps the IN list well under Snowflake's
+# expression limit.
+DELETE_BATCH = 1000
+
+
+def delete_keys(cur, table: str, key_columns: List[str], keys: List[Tuple]) -> int:
+    """
+    DELETE the rows of `table` whose key is in `keys` (tuples in
+    `key_columns` order), DELETE_BATCH keys per statement.
+    Returns the number of keys sent.
+    """
+    for i in range(0, len(keys), DELETE_BATCH):
+        part = keys[i:i + DELETE_BATCH]
+        if len(key_columns) == 1:
+            where = f"{key_columns[0]} IN ({', '.join(['%s'] * len(part))})"
+            params = [key[0] for key in part]
+        else:
+            match = "(" + " AND ".join(f"{c} = %s" for c in key_columns) + ")"
+            where = " OR ".join([match] * len(part))
+            params = [v for key in part for v in key]
+        with span("load.delete") as s:
+            cur.execute(f"DELETE FROM {table} WHERE {where}", params)
+            s.add(rows=len(part))
+    return len(keys)
+
+
+def apply_cdc_batches(
+    batches: Iterable[Any],
+    table_cfg: Dict[str, Any],
+    sf_cfg: Dict[str, Any],
+    checkpoint: Callable[[Any, Any], None],
+    conn=None,
+    row_filter=None,
+) -> Tuple[int, int]:
+    """
+    Apply binlog_cdc.CdcBatch objects to the target table, committing after
+    every batch.
+
+    For each batch: stage the upserts in the TEMP staging table, then in one
+    transaction DELETE the deleted keys, MERGE the upserts and call
+    `checkpoint(cur, batch)` to record the batch's binlog position.
+
+    With a `row_filter` unchanged upserts are skipped and deleted keys are
+    dropped from the hash index. Returns (rows merged, rows deleted).
+    """
+    target_table = table_cfg["target_table"]
+    temp_table = f"{target_table}_STAGE"
+    keys = primary_key_columns(table_cfg)
+    merged = deleted = 0
+    staging_ready = False
+
+    with snowflake_session(sf_cfg, conn) as conn:
+        cur = conn.cursor()
+
+        try:
+            for batch in batches:
+                load_columns, load_rows = batch.columns, batch.upserts
+                if row_filter is not None and load_rows:
+                    with span("load.row_hash", table=table_cfg["name"]) as s:
+                        load_columns, load_rows = row_filter.filter(batch.columns, batch.upserts)
+                        s.add(rows=len(batch.upserts))
+                if row_filter is not None and batch.deletes:
+                    row_filter.forget(batch.deletes)
+
+                if load_rows:
+                    if not staging_ready:
+                        print(f"[CDC] Creating temp staging table {temp_table}...")
+                        cur.execute(
+                            f"CREATE OR REPLACE TEMP TABLE {temp_table} AS "
+                            f"SELECT * FROM {target_table} WHERE 1=0"
+                        )
+                        staging_ready = True
+                    with span("load.truncate", table=table_cfg["name"]):
+                        cur.execute(f"TRUNCATE TABLE {temp_table}")
+                    load_chunks(cur, temp_table, [(load_columns, load_rows)], table_cfg)
+
+                cur.execute("BEGIN")
+                try:
+                    if batch.deletes:
+                        with table_scope(table_cfg["name"]):
+                            delete_keys(cur, target_table, keys, batch.deletes)
+                    if load_rows:
+                        with span("load.merge", table=table_cfg["name"]) as s:
+                            cur.execute(merge_sql_for(table_cfg, load_columns, target_table, temp_table))
+                            s.add(rows=len(load_rows))
+                    checkpoint(cur, batch)
+                    with span("load.commit", table=table_cfg["name"]):
+                        cur.execute("COMMIT")
+                except Exception:
+                    cur.execute("ROLLBACK")
+                    if row_filter is not None:
+                        row_filter.rollback()
+                    raise
+                if row_filter is not None:
+                    row_filter.commit()
+
+                merged += len(load_rows)
+                deleted += len(batch.deletes)
+                print(
+                    f"[CDC] {target_table}: {merged} rows merged, {deleted} deleted, "
+                    f"at {batch.position.log_file}:{batch.position.log_pos}"
+                )
+
+            return merged, deleted
+
+        finally:
+            cur.close()
+
+
+def delete_from_raw(
+    keys: Sequence[int],
+    table_cfg: Dict[str, Any],
+    sf_cfg: Dict[str, Any],
+    conn=None,
+    row_filter=None,
+    keys_per_commit: int = 50 * DELETE_BATCH,
+) -> int:
+    """
+    DELETE rows of the target table by single-column key (e.g. the keys
+    found by src/pipeline/delete_sync.py), committing every
+    `keys_per_commit` keys. A `row_filter` forgets the deleted keys.
+    Returns the number of keys sent.
+    """
+    target_table = table_cfg["target_table"]
+    key_columns = primary_key_columns(table_cfg)
+
+    with snowflake_session(sf_cfg, conn) as conn:
+        cur = conn.cursor()
+
+        try:
+            for i in range(0, len(keys), keys_per_commit):
+                part = [(key,) for key in keys[i:i + keys_per_commit]]
+                cur.execute("BEGIN")
+                try:
+                    with table_scope(table_cfg["name"]):
+                        delete_keys(cur, target_table, key_columns, part)
+                    with span("load.commit", table=table_cfg["name"]):
+                        cur.execute("COMMIT")
+                except Exception:
+                    cur.execute("ROLLBACK")
+                    if row_filter is not None:
+                        row_filter.rollback()
+                    raise
+                if row_filter is not None:
+                    row_filter.forget(part)
+                    row_filter.commit()
+                print(f"[DELETES] {target_table}: {min(i + keys_per_commit, len(keys))} of {len(keys)} keys deleted")
+            return len(keys)
+
+        finally:
+            cur.close()
+
+
+def resync_keys_to_raw(
+    chunks: Iterable[Chunk],
+    delete: List[Tuple],
+    table_cfg: Dict[str, Any],
+    sf_cfg: Dict[str, Any],
+    conn=None,
+    row_filter=None,
+) -> Tuple[int, int]:
+    """
+    Repair rows of the target table found to differ from the source (see
+    src/pipeline/reconcile.py): in one transaction DELETE the keys in
+    `delete`, then MERGE `chunks` (the source rows re-read by key), updating
+    every matched row whether or not it looks unchanged.
+
+    With a `row_filter` the repaired keys are dropped from the hash index
+    first, so the rows are re-hashed rather than skipped. Returns
+    (rows merged, rows deleted).
+    """
+    target_table = table_cfg["target_table"]
+    temp_table = f"{target_table}_STAGE"
+    keys = primary_key_columns(table_cfg)
+    chunks = list(chunks)
+
+    if row_filter is not None:
+        row_filter.forget(delete)
+        for columns, batch in chunks:
+            idx = [columns.index(k) for k in keys]
+            row_filter.forget([tuple(row[i] for i in idx) for row in batch])
+        row_filter.commit()
+
+    with snowflake_session(sf_cfg, conn) as conn:
+        cur = conn.cursor()
+
+        try:
+            print(f"[RECONCILE] Creating temp staging table {temp_table}...")
+            cur.execute(
+                f"CREATE OR REPLACE TEMP TABLE {temp_table} AS "
+                f"SELECT * FROM {target_table} WHERE 1=0"
+            )
+            load_columns: Optional[List[str]] = None
+            merged = 0
+            for columns, batch in chunks:
+                if row_filter is not None:
+                    columns, batch = row_filter.filter(columns, batch, skip_unchanged=False)
+                load_chunks(cur, temp_table, [(columns, batch)], table_cfg)
+                load_columns = columns
+                merged += len(batch)
+
+            cur.execute("BEGIN")
+            try:
+                if delete:
+                    with table_scope(table_cfg["name"]):
+                        delete_keys(cur, target_table, keys, delete)
+                if load_columns is not None:
+                    merge_sql = build_merge_sql(
+                        load_columns, target_table, temp_table, keys,
+                        incremental_column=table_cfg.get("incremental_column"),
+                        change_columns=[],
+                    )
+                    with span("load.merge", table=table_cfg["name"]) as s:
+                        cur.execute(merge_sql)
+                        s.add(rows=merged)
+                with span("load.commit", table=table_cfg["name"]):
+                    cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                if row_filter is not None:
+                    row_filter.rollback()
+                raise
+            if row_filter is not None:
+                row_filter.commit()
+
+            print(f"[RECONCILE] {target_table}: {merged} rows merged, {len(delete)} deleted")
+            return merged, len(delete)
+
+        finally:
+            cur.close()
+
+
+def load_chunks(
+    cur,
+    table: str,
+    chunks: Iterable[Chunk],
+    table_cfg: Dict[str, Any],
+) -> int:
+    """
+    Write (columns, batch) chunks into `table` using the table's configured
+    `load_method`:
+
+    - "insert" (default): executemany INSERTs per chunk, in batches sized
+      by the table's BatchSizer (src/common/batch_sizer.py).
+    - "copy": compressed CSV files + PUT to an internal stage + COPY INTO.
+
+    Prints the achieved rows/sec so the two paths can be compared run to run.
+    Returns the number of rows written.
+    """
+    method = table_cfg.get("load_method", "insert")
+    start = time.perf_counter()
+
+    with table_scope(table_cfg["name"]):
+        if method == "copy":
+            total = copy_chunks_into(cur, table, chunks, parallel=int(table_cfg.get("put_parallel", 4)))
+        elif method == "insert":
+            # The sizer is saved once per table run (batch_sizer.save).
+            total = insert_chunks(cur, table, chunks, sizer_for(table_cfg), raw_table=table_cfg["target_table"])
+        else:
+            raise ValueError(f"Unknown load_method '{method}' for table {table_cfg['name']}")
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"[LOAD] {table}: {total} rows via {method} in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+    return total
+
+
+def insert_chunks(
+    cur,
+    table: str,
+    chunks: Iterable[Chunk],
+    sizer: Optional[BatchSizer] = None,
+    raw_table: Optional[str] = None,
+) -> int:
+    """
+    Row-by-row load path: executemany INSERTs per chunk, split into batches
+    by `sizer` (one executemany per chunk without one).
+
+    With `raw_table`, each chunk first goes through that RAW table's
+    RowConverter (src/load/row_converter.py), so temporal columns reach the
+    connector pre-rendered as str (Decimals are bound as they are); staging
+    tables pass their RAW table.
+    """
+    total = 0
+    for columns, batch in chunks:
+        if not batch:
+            continue
+        col_list = ", ".join(columns)
+        # snowflake-connector-python uses %s placeholders
+        placeholders = ", ".join(["%s"] * len(columns))
+        insert_sql = f"INSERT INTO {table} ({col_list}) VALUES ({placeholders})"
+        if raw_table is not None:
+            with span("load.convert") as s:
+                batch = row_converter_for(raw_table, columns).convert(batch)
+                s.add(rows=len(batch))
+        with span("load.insert") as s:
+            if sizer is None:
+                cur.executemany(insert_sql, batch)
+            else:
+                executemany_batched(cur, insert_sql, batch, sizer)
+            s.add(rows=len(batch))
+        total += len(batch)
+        print(f"[LOAD] {table}: {total} rows inserted so far")
+    return total
+
+
+def write_chunk_file(path: Path, batch: List[Tuple]) -> None:
+    """
+    Write one batch as a gzip-compressed CSV file readable with BULK_FILE_FORMAT.
+    """
+    with gzip.open(path, "wt", newline="", encoding="utf-8", compresslevel=1) as f:
+        writer = csv.writer(f)
+        if isinstance(batch, RecordBatch):
+            # Render column by column straight from the typed buffers.
+            writer.writerows(zip(*batch.to_text_columns(CSV_NULL)))
+        else:
+            for row in batch:
+                writer.writerow([CSV_NULL if v is None else v for v in row])
+
+
+def copy_chunks_into(
+    cur,
+    table: str,
+    chunks: Iterable[Chunk],
+    parallel: int = 4,
+    work_dir: Optional[str] = None,
+) -> int:
+    """
+    Bulk load path:
+
+    1. Write every chunk to a local .csv.gz file.
+    2. Upload all files to BULK_STAGE with one PUT (PARALLEL upload threads).
+    3. Ingest them with a single COPY INTO, purging the staged files.
+
+    Local files live in a temporary directory that is removed afterwards.
+    Returns the number of rows written.
+    """
+    prefix = f"{BULK_STAGE}/{table.lower()}/{uuid.uuid4().hex}"
+    total = 0
+    columns: Optional[List[str]] = None
+
+    with tempfile.TemporaryDirectory(prefix=f"{table.lower()}_", dir=work_dir) as tmp:
+        tmp_path = Path(tmp)
+        n_files = 0
+        for chunk_columns, batch in chunks:
+            if not batch:
                 continue
-            set_clause_list.append(f"t.{c} = s.{c}")
-        set_clause = ", ".join(set_clause_list)
-
-        #    INSERT column list + VALUES from source
-        insert_columns = ", ".join(columns)
-        insert_values = ", ".join([f"s.{c}" for c in columns])
-
-        merge_sql = f"""
-            MERGE INTO {target_table} AS t
-            USING {temp_table} AS s
-            ON {on_cond}
-            WHEN MATCHED THEN
-              UPDATE SET {set_clause}
-            WHEN NOT MATCHED THEN
-              INSERT ({insert_columns})
-              VALUES ({insert_values});
-        """
-
-        print(f"[INCREMENTAL] Running MERGE into {target_table}...")
-        cur.execute(merge_sql)
-        conn.commit()
-        print(f"[INCREMENTAL] Upsert completed for {target_table}. Rows processed: {len(rows)}")
-
-    finally:
-        cur.close()
-        conn.close()
+            if columns is None:
+                columns = list(chunk_columns)
+            part = tmp_path / f"part_{n_files:05d}.csv.gz"
+            with span("load.copy.write") as s:
+                write_chunk_file(part, batch)
+                s.add(rows=len(batch), nbytes=part.stat().st_size)
+            n_files += 1
+            total += len(batch)
+
+        if columns is None:
+            return 0
+
+        print(f"[LOAD] {table}: uploading {n_files} files ({total} rows) to {prefix}")
+        with span("load.copy.put") as s:
+            cur.execute(
+                f"PUT 'file://{tmp_path.as_posix()}/part_*.csv.gz' '{prefix}' "
+                f"PARALLEL = {parallel} AUTO_COMPRESS = FALSE SOURCE_COMPRESSION = GZIP OVERWRITE = TRUE"
+            )
+            s.add(rows=total, nbytes=sum(p.stat().st_size for p in tmp_path.glob("part_*.csv.gz")))
+
+    col_list = ", ".join(columns)
+    with span("load.copy.copy_into") as s:
+        cur.execute(
+            f"COPY INTO {table} ({col_list}) FROM '{prefix}/' "
+            f"FILE_FORMAT = ({BULK_FILE_FORMAT}) "
+            f"ON_ERROR = ABORT_STATEMENT PURGE = TRUE"
+        )
+        s.add(rows=total)
+    return total
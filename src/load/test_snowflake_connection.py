@@ -1,6 +1,6 @@
 # src/load/test_snowflake_connection.py
 
-from src.common.config_loader import load_config
+from src.common.config_loader import get_config
 from src.common.db_connections import get_snowflake_conn
 
 def test_snowflake_connection():
@@ -13,8 +13,8 @@ def test_snowflake_connection():
     - Run SELECT 1
     - Print result
     """
-    config = load_config()
-    sf_cfg = config["snowflake"]
+    config = get_config()
+    sf_cfg = config.snowflake
 
     print("Testing Snowflake connection with config:", {k: v for k, v in sf_cfg.items() if k != "password"})
 
@@ -1,10 +1,10 @@
 from datetime import datetime
-from src.common.config_loader import load_config
+from src.common.config_loader import get_config
 from src.load.watermark_utils import get_last_loaded_at, update_last_loaded_at
 
 if __name__ == "__main__":
-    config = load_config()
-    sf_cfg = config["snowflake"]
+    config = get_config()
+    sf_cfg = config.snowflake
 
     table_name = "customers"
 
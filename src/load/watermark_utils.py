@@ -1,50 +1,344 @@
-from typing import Optional
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
-from src.common.db_connections import get_snowflake_conn
+from src.common.db_connections import snowflake_session
+from src.common.instrumentation import span
+from src.common.record_batch import decode_value, encode_value
 
 
-def get_last_loaded_at(table_name: str, sf_cfg: dict) -> Optional[datetime]:
+def encode_pk(pk: Optional[Any]) -> Optional[str]:
+    """
+    JSON text of a checkpoint key for the LAST_LOADED_PK VARIANT: the value
+    for a single-column key, an array for a composite key (a tuple).
+    """
+    if pk is None:
+        return None
+    if isinstance(pk, tuple):
+        return json.dumps([encode_value(v) for v in pk])
+    return json.dumps(encode_value(pk))
+
+
+def decode_pk(raw: Optional[Any]) -> Optional[Any]:
+    """
+    Inverse of encode_pk. The connector returns a VARIANT as JSON text;
+    anything else is a plain value (a NUMBER column not migrated yet).
+    """
+    if not isinstance(raw, str):
+        return raw
+    value = json.loads(raw, object_hook=decode_value)
+    return tuple(value) if isinstance(value, list) else value
+
+
+def get_last_loaded_at(table_name: str, sf_cfg: dict, conn=None) -> Optional[datetime]:
     """
     Returns the last_loaded_at timestamp for a given table_name from ETL_WATERMARK,
-    or None if no record exists yet.
+    or None if no record exists yet. An injected `conn` is reused and left open.
     """
-    conn = get_snowflake_conn(sf_cfg)
-    cur = conn.cursor()
+    with snowflake_session(sf_cfg, conn) as conn:
+        cur = conn.cursor()
 
-    try:
-        sql = "SELECT LAST_LOADED_AT FROM ETL_WATERMARK WHERE TABLE_NAME = %s"
-        cur.execute(sql, (table_name,))
-        row = cur.fetchone()
-        if row:
-            return row[0]
-        return None
-    finally:
-        cur.close()
-        conn.close()
+        try:
+            sql = "SELECT LAST_LOADED_AT FROM ETL_WATERMARK WHERE TABLE_NAME = %s"
+            with span("watermark.read", table=table_name):
+                cur.execute(sql, (table_name,))
+                row = cur.fetchone()
+            if row:
+                return row[0]
+            return None
+        finally:
+            cur.close()
 
 
-def update_last_loaded_at(table_name: str, last_loaded_at: datetime, sf_cfg: dict) -> None:
+def update_last_loaded_at(table_name: str, last_loaded_at: datetime, sf_cfg: dict, conn=None) -> None:
     """
     Upserts (MERGE) a record into ETL_WATERMARK for the given table_name.
-    If the table exists, update LAST_LOADED_AT; else insert new row.
-    """
-    conn = get_snowflake_conn(sf_cfg)
-    cur = conn.cursor()
-
-    try:
-        # Snowflake MERGE using parameters
-        merge_sql = """
-            MERGE INTO ETL_WATERMARK AS tgt
-            USING (SELECT %s AS TABLE_NAME, %s AS LAST_LOADED_AT) AS src
-            ON tgt.TABLE_NAME = src.TABLE_NAME
-            WHEN MATCHED THEN
-              UPDATE SET LAST_LOADED_AT = src.LAST_LOADED_AT
-            WHEN NOT MATCHED THEN
-              INSERT (TABLE_NAME, LAST_LOADED_AT)
-              VALUES (src.TABLE_NAME, src.LAST_LOADED_AT);
+    If the table exists, update LAST_LOADED_AT (clearing any LAST_LOADED_PK
+    checkpoint); else insert new row. An injected `conn` is reused and left open.
+    """
+    with snowflake_session(sf_cfg, conn) as conn:
+        cur = conn.cursor()
+
+        try:
+            write_checkpoint(cur, table_name, last_loaded_at, None)
+            with span("watermark.commit", table=table_name):
+                conn.commit()
+        finally:
+            cur.close()
+
+
+def get_checkpoint(table_name: str, sf_cfg: dict, conn=None) -> Tuple[Optional[datetime], Optional[Any]]:
+    """
+    Returns (LAST_LOADED_AT, LAST_LOADED_PK) for a table, or (None, None)
+    if no record exists yet. LAST_LOADED_PK is None for plain timestamp
+    watermarks (e.g. after a full load).
+    """
+    with snowflake_session(sf_cfg, conn) as conn:
+        cur = conn.cursor()
+
+        try:
+            sql = "SELECT LAST_LOADED_AT, LAST_LOADED_PK FROM ETL_WATERMARK WHERE TABLE_NAME = %s"
+            with span("watermark.read", table=table_name):
+                cur.execute(sql, (table_name,))
+                row = cur.fetchone()
+            if row:
+                return row[0], decode_pk(row[1])
+            return None, None
+        finally:
+            cur.close()
+
+
+def write_checkpoint(cur, table_name: str, last_loaded_at: datetime, last_loaded_pk: Optional[Any]) -> None:
+    """
+    MERGE the (LAST_LOADED_AT, LAST_LOADED_PK) cursor for a table using an
+    open cursor, without committing, so it can share a transaction with the
+    data MERGE it describes. A composite key is passed as a tuple.
+    """
+    # Snowflake MERGE using parameters
+    merge_sql = """
+        MERGE INTO ETL_WATERMARK AS tgt
+        USING (SELECT %s AS TABLE_NAME, %s::TIMESTAMP_NTZ AS LAST_LOADED_AT, PARSE_JSON(%s) AS LAST_LOADED_PK) AS src
+        ON tgt.TABLE_NAME = src.TABLE_NAME
+        WHEN MATCHED THEN
+          UPDATE SET LAST_LOADED_AT = src.LAST_LOADED_AT, LAST_LOADED_PK = src.LAST_LOADED_PK
+        WHEN NOT MATCHED THEN
+          INSERT (TABLE_NAME, LAST_LOADED_AT, LAST_LOADED_PK)
+          VALUES (src.TABLE_NAME, src.LAST_LOADED_AT, src.LAST_LOADED_PK);
+    """
+    with span("watermark.write", table=table_name):
+        cur.execute(merge_sql, (table_name, last_loaded_at, encode_pk(last_loaded_pk)))
+
+
+def get_binlog_position(table_name: str, sf_cfg: dict, conn=None) -> Optional[Tuple[str, int]]:
+    """
+    Returns the (BINLOG_FILE, BINLOG_POS) a CDC table was last applied up to,
+    or None if the table has never been loaded from the binlog.
+    """
+    with snowflake_session(sf_cfg, conn) as conn:
+        cur = conn.cursor()
+
+        try:
+            sql = "SELECT BINLOG_FILE, BINLOG_POS FROM ETL_WATERMARK WHERE TABLE_NAME = %s"
+            with span("watermark.read", table=table_name):
+                cur.execute(sql, (table_name,))
+                row = cur.fetchone()
+            if row and row[0] is not None:
+                return row[0], int(row[1])
+            return None
+        finally:
+            cur.close()
+
+
+def write_binlog_position(
+    cur,
+    table_name: str,
+    binlog_file: str,
+    binlog_pos: int,
+    last_loaded_at: Optional[datetime] = None,
+) -> None:
+    """
+    MERGE the binlog position of a CDC table using an open cursor, without
+    committing, so it shares a transaction with the changes it covers.
+    LAST_LOADED_AT is only moved when `last_loaded_at` is given.
+    """
+    merge_sql = """
+        MERGE INTO ETL_WATERMARK AS tgt
+        USING (
+            SELECT %s AS TABLE_NAME, %s AS BINLOG_FILE, %s::NUMBER AS BINLOG_POS,
+                   %s::TIMESTAMP_NTZ AS LAST_LOADED_AT
+        ) AS src
+        ON tgt.TABLE_NAME = src.TABLE_NAME
+        WHEN MATCHED THEN
+          UPDATE SET BINLOG_FILE = src.BINLOG_FILE, BINLOG_POS = src.BINLOG_POS,
+                     LAST_LOADED_AT = COALESCE(src.LAST_LOADED_AT, tgt.LAST_LOADED_AT)
+        WHEN NOT MATCHED THEN
+          INSERT (TABLE_NAME, LAST_LOADED_AT, BINLOG_FILE, BINLOG_POS)
+          VALUES (src.TABLE_NAME, src.LAST_LOADED_AT, src.BINLOG_FILE, src.BINLOG_POS);
+    """
+    with span("watermark.write", table=table_name):
+        cur.execute(merge_sql, (table_name, binlog_file, binlog_pos, last_loaded_at))
+
+
+class WatermarkTracker:
+    """
+    Pass-through over a stream of (columns, batch) chunks that remembers the
+    largest non-null value of `column`, so the watermark can be computed
+    without holding the whole extract in memory.
+    """
+
+    def __init__(self, column: str, initial: Optional[Any] = None):
+        self.column = column
+        self.max_value = initial
+        self.rows_seen = 0
+
+    def wrap(
+        self, chunks: Iterable[Tuple[List[str], List[Tuple]]]
+    ) -> Iterator[Tuple[List[str], List[Tuple]]]:
+        for columns, batch in chunks:
+            idx = columns.index(self.column)
+            batch_max = max((r[idx] for r in batch if r[idx] is not None), default=None)
+            if batch_max is not None and (self.max_value is None or batch_max > self.max_value):
+                self.max_value = batch_max
+            self.rows_seen += len(batch)
+            yield columns, batch
+
+
+class WatermarkStore:
+    """
+    Run-scoped cache over ETL_WATERMARK.
+
+    - load() reads every table's watermark in one query.
+    - get()/set() work on the in-memory copy; set() only marks a table dirty.
+    - flush() writes all dirty watermarks with a single multi-row MERGE.
+    - get_checkpoint()/record_checkpoint() expose the (timestamp, pk) cursor
+      of checkpointed incremental loads, which commit to ETL_WATERMARK
+      themselves after every chunk.
+
+    With `cache_path`, every change is also written through to a local JSON
+    file. `prefer_cache=True` makes load() read that file instead of
+    Snowflake (dry runs, restarts); entries that were never flushed are
+    flushed again on the next flush().
+    """
+
+    def __init__(
+        self,
+        sf_cfg: dict,
+        cache_path: Optional[str] = None,
+        prefer_cache: bool = False,
+    ):
+        self.sf_cfg = sf_cfg
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.prefer_cache = prefer_cache
+        self._values: Dict[str, Optional[datetime]] = {}
+        self._pks: Dict[str, Any] = {}
+        self._dirty: Dict[str, datetime] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self, conn=None) -> Dict[str, Optional[datetime]]:
+        with self._lock:
+            if self._loaded:
+                return dict(self._values)
+            if self.prefer_cache and self._read_cache():
+                print(f"[WATERMARK] Loaded {len(self._values)} watermarks from {self.cache_path}")
+            else:
+                with snowflake_session(self.sf_cfg, conn) as conn:
+                    cur = conn.cursor()
+                    try:
+                        with span("watermark.read") as s:
+                            cur.execute("SELECT TABLE_NAME, LAST_LOADED_AT, LAST_LOADED_PK FROM ETL_WATERMARK")
+                            rows = cur.fetchall()
+                            s.add(rows=len(rows))
+                        self._values = {name: ts for name, ts, _ in rows}
+                        self._pks = {name: decode_pk(pk) for name, _, pk in rows if pk is not None}
+                    finally:
+                        cur.close()
+                print(f"[WATERMARK] Loaded {len(self._values)} watermarks from ETL_WATERMARK")
+                self._write_cache()
+            self._loaded = True
+            return dict(self._values)
+
+    def get(self, table_name: str, conn=None) -> Optional[datetime]:
+        if not self._loaded:
+            self.load(conn=conn)
+        with self._lock:
+            return self._values.get(table_name)
+
+    def get_checkpoint(self, table_name: str, conn=None) -> Tuple[Optional[datetime], Optional[Any]]:
+        if not self._loaded:
+            self.load(conn=conn)
+        with self._lock:
+            return self._values.get(table_name), self._pks.get(table_name)
+
+    def set(self, table_name: str, last_loaded_at: datetime) -> None:
+        with self._lock:
+            self._values[table_name] = last_loaded_at
+            self._pks.pop(table_name, None)
+            self._dirty[table_name] = last_loaded_at
+            self._write_cache()
+
+    def record_checkpoint(self, table_name: str, last_loaded_at: datetime, last_loaded_pk: Any) -> None:
+        """
+        Remember a checkpoint that has already been committed to ETL_WATERMARK
+        (it is not flushed again).
+        """
+        with self._lock:
+            self._values[table_name] = last_loaded_at
+            self._pks[table_name] = last_loaded_pk
+            self._dirty.pop(table_name, None)
+            self._write_cache()
+
+    def flush(self, conn=None) -> int:
         """
-        cur.execute(merge_sql, (table_name, last_loaded_at))
-        conn.commit()
-    finally:
-        cur.close()
-        conn.close()
+        MERGE every dirty watermark into ETL_WATERMARK in one statement.
+        Returns the number of tables written.
+        """
+        with self._lock:
+            if not self._dirty:
+                return 0
+            items = sorted(self._dirty.items())
+            values_sql = ", ".join(["(%s, %s)"] * len(items))
+            params: List[Any] = [v for item in items for v in item]
+            merge_sql = f"""
+                MERGE INTO ETL_WATERMARK AS tgt
+                USING (
+                    SELECT $1 AS TABLE_NAME, $2::TIMESTAMP_NTZ AS LAST_LOADED_AT
+                    FROM VALUES {values_sql}
+                ) AS src
+                ON tgt.TABLE_NAME = src.TABLE_NAME
+                WHEN MATCHED THEN
+                  UPDATE SET LAST_LOADED_AT = src.LAST_LOADED_AT, LAST_LOADED_PK = NULL
+                WHEN NOT MATCHED THEN
+                  INSERT (TABLE_NAME, LAST_LOADED_AT)
+                  VALUES (src.TABLE_NAME, src.LAST_LOADED_AT);
+            """
+            with snowflake_session(self.sf_cfg, conn) as conn:
+                cur = conn.cursor()
+                try:
+                    with span("watermark.flush") as s:
+                        cur.execute(merge_sql, params)
+                        conn.commit()
+                        s.add(rows=len(items))
+                finally:
+                    cur.close()
+            self._dirty.clear()
+            self._write_cache()
+            print(f"[WATERMARK] Flushed {len(items)} watermarks to ETL_WATERMARK")
+            return len(items)
+
+    def _read_cache(self) -> bool:
+        if self.cache_path is None or not self.cache_path.exists():
+            return False
+        data = json.loads(self.cache_path.read_text())
+        self._values = {
+            name: datetime.fromisoformat(entry["last_loaded_at"]) if entry["last_loaded_at"] else None
+            for name, entry in data.items()
+        }
+        self._pks = {
+            name: decode_pk(entry["last_loaded_pk"])
+            for name, entry in data.items()
+            if entry.get("last_loaded_pk") is not None
+        }
+        self._dirty = {
+            name: self._values[name]
+            for name, entry in data.items()
+            if not entry.get("flushed", True) and self._values[name] is not None
+        }
+        return True
+
+    def _write_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        data = {
+            name: {
+                "last_loaded_at": ts.isoformat() if ts is not None else None,
+                "last_loaded_pk": encode_pk(self._pks.get(name)),
+                "flushed": name not in self._dirty,
+            }
+            for name, ts in sorted(self._values.items())
+        }
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2))
+        tmp.replace(self.cache_path)
@@ -0,0 +1,325 @@
+# src/pipeline/__main__.py
+
+"""
+Pipeline command line.
+
+    python -m src.pipeline run         [--tables ...] [--workers N] [--catchup] [--watermarks-from-cache] [--profile ...]
+    python -m src.pipeline full-load   [--tables ...] [--workers N]
+    python -m src.pipeline extract     [--tables ...] [--full] [--out DIR]
+    python -m src.pipeline watermarks  [--tables ...] [--from-cache]
+    python -m src.pipeline reconcile   [--tables ...] [--resync] [--fanout N] [--leaf-rows N]
+    python -m src.pipeline delete-sync [--tables ...] [--dry-run] [--window-rows N]
+    python -m src.pipeline schema      [--tables ...] [--refresh]
+    python -m src.pipeline report      [--tables ...] [--threshold F] [--window N] [--min-rows N] [--from-snowflake]
+    python -m src.pipeline bench       [bench_pipeline options]
+
+`run` loads the selected tables (all by default) as src.pipeline.runner
+does; `full-load` reloads them from scratch whatever their watermark.
+`extract` only reads MySQL and writes each table's chunks to a spool under
+pipeline.spool_dir, which the next `run` replays when pipeline.spool is on.
+`watermarks` prints the stored watermarks, `reconcile` compares RAW with
+the source by bucketed checksums (src/pipeline/reconcile.py),
+`delete-sync` removes rows deleted in MySQL from RAW
+(src/pipeline/delete_sync.py), `schema` shows (or with --refresh re-reads)
+the cached column schemas (src/common/schema_registry.py), `report` shows
+each table's latest throughput against its recent median from the run
+ledger (src/pipeline/run_ledger.py) and `bench` runs
+src/bench/bench_pipeline.py.
+
+The config is parsed and validated once (config_loader.get_config), and
+each command imports only what it needs: `watermarks` never loads the
+MySQL connector, and `extract --full` (or `--from-cache` with a cache file)
+never loads the Snowflake one.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from src.common.config_loader import DEFAULT_CONFIG_PATH, PipelineConfig, get_config
+
+
+def cmd_run(config: PipelineConfig, args: argparse.Namespace) -> int:
+    from src.pipeline.runner import run_pipeline
+
+    results = run_pipeline(
+        config.as_dict(),
+        args.tables,
+        args.workers,
+        watermarks_from_cache=getattr(args, "watermarks_from_cache", False),
+        profile=args.profile,
+        catchup=getattr(args, "catchup", False),
+        full_reload=args.command == "full-load",
+    )
+    return 0 if all(r.status == "ok" for r in results) else 1
+
+
+def cmd_extract(config: PipelineConfig, args: argparse.Namespace) -> int:
+    from src.common.db_connections import close_pools, get_mysql_pool
+    from src.load.watermark_utils import WatermarkStore
+    from src.pipeline.runner import TableResult, extract_table, read_table_checkpoint
+    from src.pipeline.spool import SPOOL_DIR, write_spool
+
+    out_dir = Path(args.out or config.pipeline.get("spool_dir", SPOOL_DIR))
+    store = None
+    if not args.full:
+        store = WatermarkStore(
+            config.snowflake, cache_path=config.pipeline.get("watermark_cache"), prefer_cache=args.from_cache
+        )
+    mysql_pool = get_mysql_pool(config.mysql)
+    try:
+        for table_cfg in config.select_tables(args.tables):
+            name = table_cfg["name"]
+            last_loaded, last_pk = None, None
+            if store is not None:
+                last_loaded, last_pk = read_table_checkpoint(name, config.snowflake, store, None, TableResult(name=name))
+            with mysql_pool.connection() as mysql_conn:
+                chunks = extract_table(
+                    table_cfg, config.mysql, last_loaded, last_pk, mysql_conn=mysql_conn, mysql_pool=mysql_pool
+                )
+                # Same meta as runner.load_with_spool, so a spooled run replays it.
+                manifest = write_spool(chunks, str(out_dir / name), meta={
+                    "table": name,
+                    "mode": "full" if last_loaded is None else "incremental",
+                    "last_loaded_at": last_loaded.isoformat() if last_loaded is not None else None,
+                    "last_pk": last_pk,
+                })
+            print(f"[EXTRACT] {name}: spooled {manifest['rows']} rows in {len(manifest['chunks'])} chunks to {out_dir / name}")
+    finally:
+        close_pools()
+    return 0
+
+
+def cmd_watermarks(config: PipelineConfig, args: argparse.Namespace) -> int:
+    from src.common.db_connections import close_pools
+    from src.load.watermark_utils import WatermarkStore
+
+    store = WatermarkStore(
+        config.snowflake, cache_path=config.pipeline.get("watermark_cache"), prefer_cache=args.from_cache
+    )
+    try:
+        store.load()
+    finally:
+        close_pools()
+    print(f"{'table':<14}{'last_loaded_at':<28}{'last_loaded_pk':>16}")
+    for table_cfg in config.select_tables(args.tables):
+        last_loaded, last_pk = store.get_checkpoint(table_cfg["name"])
+        print(f"{table_cfg['name']:<14}{str(last_loaded or '-'):<28}{str(last_pk if last_pk is not None else '-'):>16}")
+    return 0
+
+
+def cmd_reconcile(config: PipelineConfig, args: argparse.Namespace) -> int:
+    from src.load.row_hash import ROW_HASH_DIR
+    from src.pipeline.reconcile import DEFAULT_FANOUT, DEFAULT_LEAF_ROWS, reconcile_table, resync
+
+    drifted = 0
+    for table_cfg in config.select_tables(args.tables):
+        result = reconcile_table(
+            table_cfg, config.mysql, config.snowflake,
+            fanout=args.fanout or DEFAULT_FANOUT, leaf_rows=args.leaf_rows or DEFAULT_LEAF_ROWS,
+        )
+        for label, keys in (("missing", result.missing), ("extra", result.extra), ("changed", result.changed)):
+            if keys:
+                shown = ", ".join(str(k[0] if len(k) == 1 else k) for k in keys[:args.show])
+                more = f" ... (+{len(keys) - args.show})" if len(keys) > args.show else ""
+                print(f"[RECONCILE] {table_cfg['name']} {label}: {shown}{more}")
+        if result.in_sync:
+            continue
+        if args.resync:
+            resync(result, table_cfg, config.mysql, config.snowflake, config.pipeline.get("row_hash_dir", ROW_HASH_DIR))
+        else:
+            drifted += 1
+    return 1 if drifted else 0
+
+
+def cmd_delete_sync(config: PipelineConfig, args: argparse.Namespace) -> int:
+    from src.load.row_hash import ROW_HASH_DIR, RowHashFilter
+    from src.pipeline.delete_sync import sync_deletes
+
+    for table_cfg in config.select_tables(args.tables):
+        row_filter = None
+        if table_cfg.get("row_hash") and not args.dry_run:
+            row_filter = RowHashFilter(table_cfg, config.pipeline.get("row_hash_dir", ROW_HASH_DIR))
+        try:
+            result = sync_deletes(
+                table_cfg, config.mysql, config.snowflake,
+                window_rows=args.window_rows, dry_run=args.dry_run, row_filter=row_filter,
+            )
+        finally:
+            if row_filter is not None:
+                row_filter.close()
+        if args.dry_run and result.keys:
+            shown = ", ".join(str(k) for k in result.keys[:20])
+            more = f" ... (+{len(result.keys) - 20})" if len(result.keys) > 20 else ""
+            print(f"[DELETES] {table_cfg['name']} would delete: {shown}{more}")
+    return 0
+
+
+def cmd_schema(config: PipelineConfig, args: argparse.Namespace) -> int:
+    from src.common import schema_registry
+    from src.common.db_connections import close_pools, get_mysql_pool, get_snowflake_pool
+
+    schema_registry.configure(
+        config.pipeline.get("schema_cache", schema_registry.SCHEMA_CACHE_PATH), config.pipeline.get("schema_ttl_hours")
+    )
+    failed = 0
+    try:
+        with get_mysql_pool(config.mysql).connection() as mysql_conn, \
+                get_snowflake_pool(config.snowflake).connection() as sf_conn:
+            for table_cfg in config.select_tables(args.tables):
+                try:
+                    schema = schema_registry.ensure(
+                        table_cfg, config.mysql, config.snowflake,
+                        mysql_conn=mysql_conn, sf_conn=sf_conn, refresh=args.refresh,
+                    )
+                except ValueError as e:
+                    print(f"[SCHEMA] {e}")
+                    failed += 1
+                    continue
+                columns = schema_registry.extract_columns(table_cfg)
+                print(
+                    f"[SCHEMA] {table_cfg['name']}: extracting {len(columns)}/{len(schema.source)} source columns "
+                    f"({', '.join(columns)}); checked {schema.checked_at:%Y-%m-%d %H:%M} UTC, "
+                    f"fingerprint {schema.fingerprint[:12]}"
+                )
+    finally:
+        close_pools()
+    return 1 if failed else 0
+
+
+def cmd_report(config: PipelineConfig, args: argparse.Namespace) -> int:
+    from src.pipeline import run_ledger
+
+    names = [t["name"] for t in config.select_tables(args.tables)]
+    if args.from_snowflake:
+        from src.common.db_connections import close_pools
+
+        try:
+            records = run_ledger.read_snowflake_records(config.snowflake, names)
+        finally:
+            close_pools()
+    else:
+        ledger = run_ledger.RunLedger(config.snowflake, config.pipeline.get("run_log", run_ledger.RUN_LOG_PATH))
+        try:
+            records = ledger.records(names)
+        finally:
+            ledger.close()
+
+    settings = run_ledger.slowdown_settings(config.pipeline)
+    for key in ("threshold", "window", "min_rows"):
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+    compared, slow = run_ledger.detect_slowdowns(records, **settings)
+    print(f"[LEDGER] {len(records)} records of {len({r.run_id for r in records})} runs")
+    print(f"{'table':<14}{'mode':<13}{'last run':<18}{'rows':>10}{'rows/sec':>12}{'median':>12}{'change':>9}")
+    for s in compared:
+        print(
+            f"{s.run.table_name:<14}{s.run.mode:<13}{s.run.started_at:%Y-%m-%d %H:%M}  "
+            f"{s.run.rows_processed:>10}{s.rows_per_sec:>12,.0f}{s.median_rows_per_sec:>12,.0f}{s.change:>+9.0%}"
+            + ("  SLOW" if s in slow else "")
+        )
+    for s in slow:
+        print(f"[LEDGER] SLOWDOWN {run_ledger.describe_slowdown(s)}")
+    return 1 if slow else 0
+
+
+def cmd_bench(argv: List[str]) -> int:
+    from src.bench import bench_pipeline
+
+    sys.argv = ["python -m src.pipeline bench", *argv]
+    bench_pipeline.main()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    common.add_argument("--tables", nargs="+", help="only these tables (by config name)")
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.pipeline",
+        description="MySQL -> Snowflake RAW pipeline.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (
+        ("run", "load tables: full the first time, incremental after that"),
+        ("full-load", "reload tables from scratch, ignoring their watermarks"),
+    ):
+        p = sub.add_parser(name, parents=[common], help=help_text)
+        p.add_argument("--workers", type=int, help="max tables loaded concurrently")
+        p.add_argument(
+            "--profile",
+            help="comma-separated stages to profile with cProfile/tracemalloc (e.g. extract.fetch,load.insert or all)",
+        )
+        if name == "run":
+            p.add_argument(
+                "--watermarks-from-cache",
+                action="store_true",
+                help="read watermarks from the local cache file instead of ETL_WATERMARK",
+            )
+            p.add_argument(
+                "--catchup",
+                action="store_true",
+                help="read incremental tables as parallel time slices regardless of watermark age",
+            )
+
+    p = sub.add_parser("extract", parents=[common], help="extract tables from MySQL into the local spool")
+    p.add_argument("--full", action="store_true", help="extract whole tables instead of rows after the watermark")
+    p.add_argument("--from-cache", action="store_true", help="read watermarks from the local cache file")
+    p.add_argument("--out", help="spool root directory (default: pipeline.spool_dir)")
+
+    p = sub.add_parser("watermarks", parents=[common], help="show the stored watermarks")
+    p.add_argument("--from-cache", action="store_true", help="read the local cache file instead of ETL_WATERMARK")
+
+    p = sub.add_parser("reconcile", parents=[common], help="compare RAW tables with the source by bucketed checksums")
+    p.add_argument("--resync", action="store_true", help="re-load only the rows found to differ")
+    p.add_argument("--fanout", type=int, help="sub-buckets per differing bucket (default 16)")
+    p.add_argument("--leaf-rows", type=int, help="compare buckets of at most this many rows row by row (default 1000)")
+    p.add_argument("--show", type=int, default=20, help="mismatched keys printed per kind")
+
+    p = sub.add_parser("delete-sync", parents=[common], help="delete rows from RAW that were deleted in MySQL")
+    p.add_argument("--dry-run", action="store_true", help="only report the keys that would be deleted")
+    p.add_argument("--window-rows", type=int, help="keys compared per window (default 1000000)")
+
+    p = sub.add_parser("schema", parents=[common], help="show the cached source / RAW column schemas")
+    p.add_argument("--refresh", action="store_true", help="re-read information_schema instead of trusting the cache")
+
+    p = sub.add_parser("report", parents=[common], help="flag tables running slower than their recent median")
+    p.add_argument("--threshold", type=float, help="flag drops larger than this fraction (default pipeline.slowdown_threshold)")
+    p.add_argument("--window", type=int, help="previous runs the median is taken over (default pipeline.slowdown_window)")
+    p.add_argument("--min-rows", type=int, help="ignore runs that moved fewer rows (default 1000)")
+    p.add_argument("--from-snowflake", action="store_true", help="read ETL_RUN_LOG instead of the local mirror")
+
+    p = sub.add_parser("bench", help="run the synthetic pipeline benchmark (see src/bench/bench_pipeline.py)")
+    p.add_argument("bench_args", nargs=argparse.REMAINDER, help="options passed to bench_pipeline")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "bench":
+        # Runs against SQLite stand-ins; needs no config.
+        return cmd_bench(args.bench_args)
+
+    config = get_config(args.config)
+    # Fail on a typo before any connection is opened.
+    config.select_tables(args.tables)
+    if args.command in ("run", "full-load"):
+        return cmd_run(config, args)
+    if args.command == "extract":
+        return cmd_extract(config, args)
+    if args.command == "reconcile":
+        return cmd_reconcile(config, args)
+    if args.command == "delete-sync":
+        return cmd_delete_sync(config, args)
+    if args.command == "schema":
+        return cmd_schema(config, args)
+    if args.command == "report":
+        return cmd_report(config, args)
+    return cmd_watermarks(config, args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
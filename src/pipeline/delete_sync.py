@@ -0,0 +1,186 @@
+# src/pipeline/delete_sync.py
+
+"""
+Hard-delete detection: find the keys that are still in a RAW table but no
+longer in the MySQL source, and delete them from RAW.
+
+The updated_at incremental path never sees a deleted row, so this stage
+compares key sets instead. RAW's keys are streamed in primary key order
+(one sorted scan) and cut into windows of `window_rows` keys; for every
+window the source keys in the same range are read with an index range scan.
+Both sides of a window are held as sorted array('q') (8 bytes per key, not
+a Python int object each) and merge-diffed in one linear pass; identical
+windows, the common case, are detected with a single C-level comparison.
+Only the deleted keys accumulate, in another array('q'), so memory is a few
+windows of keys whatever the size of the table (2 x 1M keys = 16 MB at the
+default window).
+
+RAW is read before the source for every window, so a row inserted into
+MySQL while the stage runs can never look deleted.
+
+The primary key must be a single integer column. Enabled per table with
+`delete_sync: true` (or pipeline-wide), or run on demand:
+
+    python -m src.pipeline delete-sync --tables customers [--dry-run]
+"""
+
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+from src.common.db_connections import mysql_session, snowflake_session
+from src.common.instrumentation import span
+from src.load.snowflake_loader import delete_from_raw, primary_key_columns
+
+# RAW keys per window; each window holds two arrays of up to this many keys.
+DEFAULT_WINDOW_ROWS = 1_000_000
+
+# Refuse to delete more than this fraction of RAW in one run (table_cfg
+# delete_sync_max_fraction); an empty or truncated source should not empty RAW.
+DEFAULT_MAX_DELETE_FRACTION = 0.10
+
+# Rows per fetchmany(): the driver's list of row tuples is the only
+# per-row Python object overhead, so keep it well below a window.
+_FETCH_ROWS = 50_000
+
+
+@dataclass
+class DeleteSyncResult:
+    table: str
+    target_keys: int = 0
+    source_keys: int = 0
+    windows: int = 0
+    deleted: int = 0
+    keys: array = field(default_factory=lambda: array("q"))
+    elapsed: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"[DELETES] {self.table}: {self.target_keys} RAW keys checked against {self.source_keys} "
+            f"source keys in {self.windows} windows; {len(self.keys)} deleted in the source "
+            f"({self.elapsed:.2f}s)"
+        )
+
+
+def sorted_difference(a: array, b: array) -> array:
+    """Keys of sorted `a` that are not in sorted `b`, in one linear merge pass."""
+    if a == b:
+        return array("q")
+    out = array("q")
+    j, nb = 0, len(b)
+    for key in a:
+        while j < nb and b[j] < key:
+            j += 1
+        if j == nb or b[j] != key:
+            out.append(key)
+    return out
+
+
+def iter_key_windows(cur, sql: str, window_rows: int, table: Optional[str] = None) -> Iterator[array]:
+    """Run `sql` (one sorted key column) and yield its keys as arrays of up to `window_rows`."""
+    cur.execute(sql)
+    done = False
+    while not done:
+        keys = array("q")
+        with span("delete_sync.target", table=table) as s:
+            while len(keys) < window_rows:
+                rows = cur.fetchmany(min(_FETCH_ROWS, window_rows - len(keys)))
+                if not rows:
+                    done = True
+                    break
+                keys.extend(row[0] for row in rows)
+            s.add(rows=len(keys), nbytes=keys.itemsize * len(keys))
+        if keys:
+            yield keys
+
+
+def read_key_range(
+    cur, table: str, key: str, low_exclusive: Optional[int], high: int, name: Optional[str] = None
+) -> array:
+    """Sorted keys of `table` in (low_exclusive, high]."""
+    if low_exclusive is None:
+        sql, params = f"SELECT {key} FROM {table} WHERE {key} <= %s ORDER BY {key}", (high,)
+    else:
+        sql, params = f"SELECT {key} FROM {table} WHERE {key} > %s AND {key} <= %s ORDER BY {key}", (low_exclusive, high)
+    with span("delete_sync.source", table=name) as s:
+        cur.execute(sql, params)
+        keys = array("q")
+        while True:
+            rows = cur.fetchmany(_FETCH_ROWS)
+            if not rows:
+                break
+            keys.extend(row[0] for row in rows)
+        s.add(rows=len(keys), nbytes=keys.itemsize * len(keys))
+    return keys
+
+
+def find_deleted_keys(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    sf_cfg: Dict[str, Any],
+    window_rows: int = DEFAULT_WINDOW_ROWS,
+    mysql_conn=None,
+    sf_conn=None,
+) -> DeleteSyncResult:
+    """Keys present in the RAW table and missing from the source."""
+    keys = primary_key_columns(table_cfg)
+    if len(keys) != 1:
+        raise ValueError(f"Delete sync needs a single integer primary key; {table_cfg['name']} has {keys}")
+    key = keys[0]
+    result = DeleteSyncResult(table=table_cfg["name"])
+    start = time.perf_counter()
+
+    with snowflake_session(sf_cfg, sf_conn) as sf_conn, mysql_session(mysql_cfg, mysql_conn) as mysql_conn:
+        sf_cur, mysql_cur = sf_conn.cursor(), mysql_conn.cursor()
+        try:
+            low: Optional[int] = None
+            target_sql = f"SELECT {key} FROM {table_cfg['target_table']} ORDER BY {key}"
+            for target in iter_key_windows(sf_cur, target_sql, window_rows, table=table_cfg["name"]):
+                high = target[-1]
+                source = read_key_range(mysql_cur, table_cfg["source_table"], key, low, high, table_cfg["name"])
+                result.keys.extend(sorted_difference(target, source))
+                result.windows += 1
+                result.target_keys += len(target)
+                result.source_keys += len(source)
+                low = high
+        finally:
+            sf_cur.close()
+            mysql_cur.close()
+
+    result.elapsed = time.perf_counter() - start
+    print(result.summary())
+    return result
+
+
+def sync_deletes(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    sf_cfg: Dict[str, Any],
+    window_rows: Optional[int] = None,
+    dry_run: bool = False,
+    mysql_conn=None,
+    sf_conn=None,
+    row_filter=None,
+) -> DeleteSyncResult:
+    """
+    find_deleted_keys(), then delete those keys from RAW (snowflake_loader.
+    delete_from_raw) unless `dry_run`. Raises ValueError instead of deleting
+    more than delete_sync_max_fraction of the table.
+    """
+    result = find_deleted_keys(
+        table_cfg, mysql_cfg, sf_cfg,
+        window_rows=int(window_rows or table_cfg.get("delete_sync_window_rows") or DEFAULT_WINDOW_ROWS),
+        mysql_conn=mysql_conn, sf_conn=sf_conn,
+    )
+    if not result.keys or dry_run:
+        return result
+
+    max_fraction = float(table_cfg.get("delete_sync_max_fraction", DEFAULT_MAX_DELETE_FRACTION))
+    if len(result.keys) > max_fraction * result.target_keys:
+        raise ValueError(
+            f"Delete sync for {table_cfg['name']} would delete {len(result.keys)} of {result.target_keys} RAW rows "
+            f"(more than delete_sync_max_fraction={max_fraction}); check the source or raise the limit"
+        )
+    result.deleted = delete_from_raw(result.keys, table_cfg, sf_cfg, conn=sf_conn, row_filter=row_filter)
+    return result
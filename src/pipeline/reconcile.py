@@ -0,0 +1,300 @@
+# src/pipeline/reconcile.py
+
+"""
+Checksum reconciliation of a RAW table against its MySQL source.
+
+Both sides are cut into buckets by ranges of the (first) primary key column
+and aggregated in SQL: COUNT(*) and the SUM of a per-row hash (the first 60
+bits of the MD5 of the row's canonical text), which does not depend on row
+order. Buckets that agree are done; a bucket that differs is split into
+`fanout` sub-ranges and compared again, like walking down a Merkle tree,
+until it holds at most `leaf_rows` rows, whose (key, hash) pairs are then
+compared one by one. Only aggregates and the hashes of differing leaves
+leave either database: a table that is in sync costs one aggregate query
+per side, and every drifted row adds a few index range scans.
+
+The canonical text is built the same way on both sides: each value cast to
+text (datetimes as 'YYYY-MM-DD HH:MM:SS', decimals at the source scale),
+NULL as a marker character, columns joined by a separator character. Column
+types come from the source's information_schema (schema_registry.
+mysql_columns); only the extracted columns (`columns`) are compared, minus
+`reconcile_exclude`. That defaults to the row-hash exclusions
+(`row_hash_exclude`, i.e. [incremental_column]): a row whose only change is
+in those columns is skipped by the row-hash filter, so RAW keeps the old
+value there by design and it would otherwise show up as drift.
+
+resync() repairs what was found through the MERGE path: missing and changed
+rows are read again from MySQL by key and merged, extra rows are deleted.
+
+    python -m src.pipeline reconcile --tables orders [--resync]
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.common.db_connections import mysql_session, snowflake_session
+from src.common.instrumentation import span
+from src.common.schema_registry import ColumnInfo, mysql_columns
+from src.extract.mysql_extractor import iter_rows_by_key
+from src.load.row_hash import ROW_HASH_DIR, RowHashFilter
+from src.load.snowflake_loader import primary_key_columns, resync_keys_to_raw
+
+# Sub-ranges a differing bucket is split into.
+DEFAULT_FANOUT = 16
+
+# Buckets with at most this many rows (on either side) are compared row by row.
+DEFAULT_LEAF_ROWS = 1000
+
+MYSQL = "mysql"
+SNOWFLAKE = "snowflake"
+
+_INT_TYPES = {"tinyint", "smallint", "mediumint", "int", "integer", "bigint"}
+_DATETIME_TYPES = {"datetime", "timestamp"}
+_DECIMAL_TYPES = {"decimal", "numeric"}
+_FLOAT_TYPES = {"float", "double", "real"}
+_BINARY_TYPES = {"binary", "varbinary", "tinyblob", "blob", "mediumblob", "longblob"}
+
+# Decimal places compared for FLOAT / DOUBLE columns.
+_FLOAT_SCALE = 6
+
+# Separator between columns and marker for NULL in the canonical row text.
+_SEPARATOR = {MYSQL: "CHAR(31 USING utf8mb4)", SNOWFLAKE: "CHR(31)"}
+_NULL = {MYSQL: "CHAR(30 USING utf8mb4)", SNOWFLAKE: "CHR(30)"}
+
+
+@dataclass
+class ReconcileResult:
+    """
+    Outcome of reconcile_table(). Keys are tuples in primary key order:
+
+    - missing: in the source, not in RAW
+    - extra: in RAW, not in the source
+    - changed: in both, with different values
+    - duplicates: present more than once in RAW
+    """
+
+    table: str
+    source_rows: int = 0
+    target_rows: int = 0
+    missing: List[Tuple] = field(default_factory=list)
+    extra: List[Tuple] = field(default_factory=list)
+    changed: List[Tuple] = field(default_factory=list)
+    duplicates: List[Tuple] = field(default_factory=list)
+    buckets: int = 0
+    leaves: int = 0
+    queries: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def in_sync(self) -> bool:
+        return not (self.missing or self.extra or self.changed or self.duplicates)
+
+    def summary(self) -> str:
+        return (
+            f"[RECONCILE] {self.table}: source {self.source_rows} rows, RAW {self.target_rows} rows; "
+            f"{len(self.missing)} missing, {len(self.extra)} extra, {len(self.changed)} changed, "
+            f"{len(self.duplicates)} duplicated ({self.buckets} buckets, {self.leaves} leaves, "
+            f"{self.queries} queries, {self.elapsed:.2f}s)"
+        )
+
+
+def source_columns(table_cfg: Dict[str, Any], mysql_cfg: Dict[str, Any], conn=None) -> List[ColumnInfo]:
+    """
+    Columns of the source table in ordinal order: the extracted ones (the
+    table's `columns` when set) minus `reconcile_exclude` (by default the
+    columns left out of the row hash).
+    """
+    columns = mysql_columns(table_cfg, mysql_cfg, conn=conn)
+    projected = {c.lower() for c in table_cfg.get("columns") or [c.name for c in columns]}
+    default_exclude = table_cfg.get("row_hash_exclude", [table_cfg["incremental_column"]])
+    exclude = {c.lower() for c in table_cfg.get("reconcile_exclude", default_exclude)}
+    return [c for c in columns if c.name.lower() in projected and c.name.lower() not in exclude]
+
+
+def _value_sql(col: ColumnInfo, dialect: str) -> str:
+    c = col.name
+    mysql = dialect == MYSQL
+    if col.data_type in _DATETIME_TYPES:
+        text = f"DATE_FORMAT({c}, '%Y-%m-%d %H:%i:%s')" if mysql else f"TO_VARCHAR({c}, 'YYYY-MM-DD HH24:MI:SS')"
+    elif col.data_type == "date":
+        text = f"DATE_FORMAT({c}, '%Y-%m-%d')" if mysql else f"TO_VARCHAR({c}, 'YYYY-MM-DD')"
+    elif col.data_type in _DECIMAL_TYPES or col.data_type in _FLOAT_TYPES:
+        scale = _FLOAT_SCALE if col.data_type in _FLOAT_TYPES else int(col.scale or 0)
+        text = f"CAST(CAST({c} AS DECIMAL(38, {scale})) AS CHAR)" if mysql else f"TO_VARCHAR(CAST({c} AS NUMBER(38, {scale})))"
+    elif col.data_type in _BINARY_TYPES:
+        text = f"HEX({c})" if mysql else f"HEX_ENCODE({c})"
+    else:
+        text = f"CAST({c} AS CHAR)" if mysql else f"TO_VARCHAR({c})"
+    return f"COALESCE({text}, {_NULL[dialect]})"
+
+
+def row_hash_sql(columns: List[ColumnInfo], dialect: str) -> str:
+    """SQL for the unsigned 60-bit hash of a row, identical in both dialects."""
+    values = [_value_sql(col, dialect) for col in columns]
+    if dialect == MYSQL:
+        text = "CONCAT(" + f", {_SEPARATOR[MYSQL]}, ".join(values) + ")"
+        return f"CAST(CONV(LEFT(MD5({text}), 15), 16, 10) AS UNSIGNED)"
+    text = f" || {_SEPARATOR[SNOWFLAKE]} || ".join(values)
+    return f"TO_NUMBER(LEFT(MD5({text}), 15), 'XXXXXXXXXXXXXXX')"
+
+
+def split_range(low: int, high: int, fanout: int) -> List[Tuple[int, int]]:
+    """Cut the key range [low, high] into up to `fanout` contiguous, non-empty ranges."""
+    width = high - low + 1
+    n = min(fanout, width)
+    edges = [low + width * i // n for i in range(n + 1)]
+    return [(edges[i], edges[i + 1] - 1) for i in range(n)]
+
+
+class _Side:
+    """One database of the comparison: its table, hash expression and cursor."""
+
+    def __init__(self, label: str, cur, table: str, key_columns: List[str], hash_sql: str, result: ReconcileResult):
+        self.label = label
+        self.cur = cur
+        self.table = table
+        self.key_columns = key_columns
+        self.bucket_column = key_columns[0]
+        self.hash_sql = hash_sql
+        self.result = result
+
+    def _query(self, sql: str) -> List[Tuple]:
+        # Bounds are ints rendered inline: no parameters, so the '%' in
+        # DATE_FORMAT patterns needs no escaping.
+        with span(f"reconcile.{self.label}", table=self.result.table) as s:
+            self.cur.execute(sql)
+            rows = self.cur.fetchall()
+            s.add(rows=len(rows))
+        self.result.queries += 1
+        return rows
+
+    def key_range(self) -> Tuple[Optional[int], Optional[int]]:
+        low, high = self._query(f"SELECT MIN({self.bucket_column}), MAX({self.bucket_column}) FROM {self.table}")[0]
+        return low, high
+
+    def buckets(self, ranges: List[Tuple[int, int]]) -> Dict[int, Tuple[int, int]]:
+        """{bucket index: (rows, hash sum)} for contiguous `ranges`; empty buckets are absent."""
+        k = self.bucket_column
+        case = " ".join(f"WHEN {k} < {int(start)} THEN {i}" for i, (start, _) in enumerate(ranges[1:]))
+        bucket = f"CASE {case} ELSE {len(ranges) - 1} END" if case else "0"
+        rows = self._query(
+            f"SELECT {bucket} AS bucket, COUNT(*), SUM({self.hash_sql}) FROM {self.table} "
+            f"WHERE {k} BETWEEN {int(ranges[0][0])} AND {int(ranges[-1][1])} GROUP BY 1"
+        )
+        return {int(b): (int(n), int(h or 0)) for b, n, h in rows}
+
+    def leaf(self, low: int, high: int) -> List[Tuple[Tuple, int]]:
+        rows = self._query(
+            f"SELECT {', '.join(self.key_columns)}, {self.hash_sql} FROM {self.table} "
+            f"WHERE {self.bucket_column} BETWEEN {int(low)} AND {int(high)}"
+        )
+        n = len(self.key_columns)
+        return [(tuple(row[:n]), int(row[n])) for row in rows]
+
+
+def _compare_leaf(source: _Side, target: _Side, low: int, high: int, result: ReconcileResult) -> None:
+    result.leaves += 1
+    src = dict(source.leaf(low, high))
+    tgt: Dict[Tuple, int] = {}
+    for key, h in target.leaf(low, high):
+        if key in tgt:
+            if key not in result.duplicates:
+                result.duplicates.append(key)
+            continue
+        tgt[key] = h
+    for key, h in src.items():
+        if key not in tgt:
+            result.missing.append(key)
+        elif tgt[key] != h and key not in result.duplicates:
+            result.changed.append(key)
+    result.extra.extend(key for key in tgt if key not in src)
+
+
+def reconcile_table(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    sf_cfg: Dict[str, Any],
+    fanout: int = DEFAULT_FANOUT,
+    leaf_rows: int = DEFAULT_LEAF_ROWS,
+    mysql_conn=None,
+    sf_conn=None,
+) -> ReconcileResult:
+    """
+    Compare a table's source rows with its RAW rows and return the keys that
+    differ. The first primary key column must be an integer.
+    """
+    result = ReconcileResult(table=table_cfg["name"])
+    key_columns = primary_key_columns(table_cfg)
+    start = time.perf_counter()
+
+    with mysql_session(mysql_cfg, mysql_conn) as mysql_conn, snowflake_session(sf_cfg, sf_conn) as sf_conn:
+        columns = source_columns(table_cfg, mysql_cfg, conn=mysql_conn)
+        types = {c.name.lower(): c.data_type for c in columns}
+        if types.get(key_columns[0].lower()) not in _INT_TYPES:
+            raise ValueError(
+                f"Cannot reconcile {table_cfg['name']}: key column {key_columns[0]} is not an integer column"
+            )
+        mysql_cur, sf_cur = mysql_conn.cursor(), sf_conn.cursor()
+        try:
+            source = _Side("source", mysql_cur, table_cfg["source_table"], key_columns,
+                           row_hash_sql(columns, MYSQL), result)
+            target = _Side("target", sf_cur, table_cfg["target_table"], key_columns,
+                           row_hash_sql(columns, SNOWFLAKE), result)
+            bounds = [b for side in (source.key_range(), target.key_range()) for b in side if b is not None]
+            pending = [(int(min(bounds)), int(max(bounds)))] if bounds else []
+            root = True
+            while pending:
+                low, high = pending.pop()
+                ranges = split_range(low, high, fanout)
+                src, tgt = source.buckets(ranges), target.buckets(ranges)
+                if root:
+                    result.source_rows = sum(n for n, _ in src.values())
+                    result.target_rows = sum(n for n, _ in tgt.values())
+                    root = False
+                for i, (b_low, b_high) in enumerate(ranges):
+                    result.buckets += 1
+                    s, t = src.get(i, (0, 0)), tgt.get(i, (0, 0))
+                    if s == t:
+                        continue
+                    if max(s[0], t[0]) <= leaf_rows or b_low == b_high:
+                        _compare_leaf(source, target, b_low, b_high, result)
+                    else:
+                        pending.append((b_low, b_high))
+        finally:
+            mysql_cur.close()
+            sf_cur.close()
+
+    result.elapsed = time.perf_counter() - start
+    print(result.summary())
+    return result
+
+
+def resync(
+    result: ReconcileResult,
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    sf_cfg: Dict[str, Any],
+    row_hash_dir: str = ROW_HASH_DIR,
+    mysql_conn=None,
+    sf_conn=None,
+) -> Tuple[int, int]:
+    """
+    Re-sync only the keys `result` found: source rows for missing, changed
+    and duplicated keys are re-read and MERGEd, extra and duplicated keys are
+    deleted first. Returns (rows merged, rows deleted).
+    """
+    if result.in_sync:
+        return 0, 0
+    key_columns = primary_key_columns(table_cfg)
+    chunks = iter_rows_by_key(
+        table_cfg, mysql_cfg, key_columns, result.missing + result.changed + result.duplicates, conn=mysql_conn
+    )
+    row_filter = RowHashFilter(table_cfg, row_hash_dir) if table_cfg.get("row_hash") else None
+    try:
+        return resync_keys_to_raw(
+            chunks, result.extra + result.duplicates, table_cfg, sf_cfg, conn=sf_conn, row_filter=row_filter
+        )
+    finally:
+        if row_filter is not None:
+            row_filter.close()
@@ -0,0 +1,383 @@
+# src/pipeline/run_ledger.py
+
+"""
+Run ledger: one record per table per pipeline run, kept in Snowflake
+(ETL_RUN_LOG, sql/03_create_etl_control_tables.sql) and in a local SQLite
+mirror (RUN_LOG_PATH, or pipeline.run_log).
+
+The runner records every table's mode, status, start time, duration, rows
+extracted / merged / skipped / deleted, extracted bytes and per-phase
+timings: its own phases (TableResult.timings) plus the seconds each
+instrumentation stage spent on the table during the run. Records go to the
+mirror first and are then pushed to ETL_RUN_LOG with multi-row INSERTs;
+records that could not be pushed stay marked unsynced and are sent again by the next
+run, so a Snowflake outage loses no history and never fails a load.
+
+Slowdown detection compares a run's throughput (rows extracted, or rows
+merged + skipped, per second of table time) with the rolling median of the
+previous `window` ok runs of the same table and mode. Runs under `min_rows`
+rows are ignored on both sides: an incremental run that moved 12 rows says
+nothing about throughput.
+
+    python -m src.pipeline report [--tables ...] [--threshold 0.3] [--window 10] [--from-snowflake]
+"""
+
+import json
+import sqlite3
+import statistics
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.common.db_connections import snowflake_session
+from src.common.instrumentation import StageStats
+
+RUN_LOG_PATH = ".etl_state/run_log.sqlite"
+
+DEFAULT_SLOWDOWN_THRESHOLD = 0.3  # flag runs more than 30% below the median
+DEFAULT_SLOWDOWN_WINDOW = 10      # previous runs the median is taken over
+DEFAULT_SLOWDOWN_MIN_ROWS = 1000
+MIN_HISTORY = 3
+
+# Records per INSERT when pushing to ETL_RUN_LOG.
+_PUSH_ROWS = 500
+
+# Instrumentation stages whose rows are rows read from MySQL (CDC: binlog
+# events), and those whose bytes measure the extract, in order of preference.
+_EXTRACT_ROW_STAGES = ("extract.fetch", "extract.cdc.batch")
+_EXTRACT_BYTE_STAGES = ("extract.columnar", "spool.write")
+
+_COLUMNS = (
+    "run_id", "table_name", "mode", "status", "started_at", "duration_sec", "rows_extracted",
+    "rows_merged", "rows_skipped", "rows_deleted", "bytes", "timings", "error",
+)
+
+
+@dataclass
+class RunRecord:
+    run_id: str
+    table_name: str
+    mode: str
+    status: str
+    started_at: datetime
+    duration_sec: float
+    rows_extracted: int = 0
+    rows_merged: int = 0
+    rows_skipped: int = 0
+    rows_deleted: int = 0
+    bytes: Optional[int] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def rows_processed(self) -> int:
+        return self.rows_extracted or self.rows_merged + self.rows_skipped
+
+    @property
+    def rows_per_sec(self) -> Optional[float]:
+        if self.duration_sec <= 0:
+            return None
+        return self.rows_processed / self.duration_sec
+
+    def as_row(self) -> Tuple:
+        return (
+            self.run_id, self.table_name, self.mode, self.status,
+            self.started_at.strftime("%Y-%m-%d %H:%M:%S.%f"), self.duration_sec,
+            self.rows_extracted, self.rows_merged, self.rows_skipped, self.rows_deleted,
+            self.bytes, json.dumps(self.timings, sort_keys=True), self.error,
+        )
+
+    @classmethod
+    def from_row(cls, row: Tuple) -> "RunRecord":
+        values = dict(zip(_COLUMNS, row))
+        started_at = values["started_at"]
+        if isinstance(started_at, str):
+            started_at = datetime.fromisoformat(started_at)
+        timings = values["timings"]
+        if isinstance(timings, str):
+            # Snowflake returns VARIANT columns as JSON text.
+            timings = json.loads(timings)
+        values.update(
+            started_at=started_at.replace(tzinfo=None),
+            timings=timings or {},
+            mode=values["mode"] or "",
+            duration_sec=float(values["duration_sec"] or 0.0),
+            rows_extracted=int(values["rows_extracted"] or 0),
+            rows_merged=int(values["rows_merged"] or 0),
+            rows_skipped=int(values["rows_skipped"] or 0),
+            rows_deleted=int(values["rows_deleted"] or 0),
+        )
+        return cls(**values)
+
+
+@dataclass
+class Slowdown:
+    run: RunRecord
+    rows_per_sec: float
+    median_rows_per_sec: float
+    history: int
+    # (phase, seconds this run, median seconds) of the phase that grew most.
+    phase: Optional[Tuple[str, float, float]] = None
+
+    @property
+    def change(self) -> float:
+        return self.rows_per_sec / self.median_rows_per_sec - 1.0
+
+
+def new_run_id() -> str:
+    """Sortable run id: UTC start time plus a random suffix."""
+    return f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:6]}"
+
+
+def stage_deltas(
+    before: Dict[Tuple[str, str], StageStats],
+    after: Dict[Tuple[str, str], StageStats],
+    table: str,
+) -> Dict[str, StageStats]:
+    """{stage: stats} a table added to the instrumentation registry between two snapshots."""
+    deltas = {}
+    for (name, stage), st in after.items():
+        if name != table:
+            continue
+        prev = before.get((name, stage), StageStats())
+        if st.calls > prev.calls:
+            deltas[stage] = StageStats(
+                calls=st.calls - prev.calls,
+                seconds=st.seconds - prev.seconds,
+                rows=st.rows - prev.rows,
+                bytes=st.bytes - prev.bytes,
+            )
+    return deltas
+
+
+def build_record(run_id: str, result: Any, stages: Dict[str, StageStats], run_started_at: datetime) -> RunRecord:
+    """RunRecord of one runner TableResult and its instrumentation stage deltas."""
+    timings = {phase: round(seconds, 4) for phase, seconds in result.timings.items()}
+    for stage, st in stages.items():
+        if stage != "table":
+            timings[stage] = round(st.seconds, 4)
+    nbytes = next((stages[s].bytes for s in _EXTRACT_BYTE_STAGES if s in stages and stages[s].bytes), None)
+    started_at = result.started_at or run_started_at
+    return RunRecord(
+        run_id=run_id,
+        table_name=result.name,
+        mode=result.mode,
+        status=result.status,
+        started_at=started_at.astimezone(timezone.utc).replace(tzinfo=None),
+        duration_sec=round(result.timings.get("total", 0.0), 4),
+        rows_extracted=sum(stages[s].rows for s in _EXTRACT_ROW_STAGES if s in stages),
+        rows_merged=result.rows,
+        rows_skipped=result.skipped,
+        rows_deleted=result.deleted,
+        bytes=nbytes,
+        timings=timings,
+        error=result.error,
+    )
+
+
+def detect_slowdowns(
+    records: Iterable[RunRecord],
+    threshold: float = DEFAULT_SLOWDOWN_THRESHOLD,
+    window: int = DEFAULT_SLOWDOWN_WINDOW,
+    min_rows: int = DEFAULT_SLOWDOWN_MIN_ROWS,
+    run_id: Optional[str] = None,
+) -> Tuple[List[Slowdown], List[Slowdown]]:
+    """
+    Compare the latest comparable run of every (table, mode) (or only the
+    runs of `run_id`) with the median of the `window` runs before it.
+    Returns (all comparisons, those more than `threshold` below the median).
+    """
+    series: Dict[Tuple[str, str], List[RunRecord]] = {}
+    for r in sorted(records, key=lambda r: (r.started_at, r.run_id)):
+        if r.status == "ok" and r.rows_processed >= min_rows and r.rows_per_sec:
+            series.setdefault((r.table_name, r.mode), []).append(r)
+
+    compared, slow = [], []
+    for key, runs in sorted(series.items()):
+        latest = runs[-1]
+        if run_id is not None and latest.run_id != run_id:
+            continue
+        history = runs[-1 - window:-1]
+        if len(history) < MIN_HISTORY:
+            continue
+        median = statistics.median(r.rows_per_sec for r in history)
+        s = Slowdown(latest, latest.rows_per_sec, median, len(history), _grown_phase(latest, history))
+        compared.append(s)
+        if s.change < -threshold:
+            slow.append(s)
+    return compared, slow
+
+
+def _grown_phase(latest: RunRecord, history: List[RunRecord]) -> Optional[Tuple[str, float, float]]:
+    # Instrumentation stages (dotted) pinpoint more than the runner's
+    # phases, which add them up.
+    phases = [p for p in latest.timings if "." in p] or [p for p in latest.timings if p != "total"]
+    grown = None
+    for phase in phases:
+        seconds = latest.timings[phase]
+        median = statistics.median(r.timings.get(phase, 0.0) for r in history)
+        if grown is None or seconds - median > grown[1] - grown[2]:
+            grown = (phase, seconds, median)
+    return grown
+
+
+def describe_slowdown(s: Slowdown) -> str:
+    text = (
+        f"{s.run.table_name} ({s.run.mode}): {s.rows_per_sec:,.0f} rows/sec is {-s.change:.0%} below "
+        f"the median of its last {s.history} runs ({s.median_rows_per_sec:,.0f} rows/sec)"
+    )
+    if s.phase is not None and s.phase[1] > s.phase[2]:
+        text += f"; {s.phase[0]} took {s.phase[1]:.2f}s vs {s.phase[2]:.2f}s"
+    return text
+
+
+class RunLedger:
+    """
+    Local SQLite mirror of ETL_RUN_LOG plus the push of unsynced records.
+    With `path=None` records are only kept in memory until pushed.
+    """
+
+    def __init__(self, sf_cfg: Dict[str, Any], path: Optional[str] = RUN_LOG_PATH):
+        self.sf_cfg = sf_cfg
+        self.path = Path(path) if path else None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Airflow commits the tables of a tier from parallel tasks, so wait
+        # for another writer rather than failing on a locked database.
+        self._db = sqlite3.connect(str(self.path) if self.path is not None else ":memory:", timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS run_log ("
+            "run_id TEXT NOT NULL, table_name TEXT NOT NULL, mode TEXT, status TEXT, started_at TEXT, "
+            "duration_sec REAL, rows_extracted INTEGER, rows_merged INTEGER, rows_skipped INTEGER, "
+            "rows_deleted INTEGER, bytes INTEGER, timings TEXT, error TEXT, synced INTEGER NOT NULL DEFAULT 0, "
+            "PRIMARY KEY (run_id, table_name))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS run_log_table ON run_log (table_name, started_at)")
+
+    def record(self, records: List[RunRecord]) -> None:
+        with self._db:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO run_log ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                [r.as_row() for r in records],
+            )
+
+    def records(self, tables: Optional[List[str]] = None) -> List[RunRecord]:
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM run_log"
+        params: List[Any] = []
+        if tables:
+            sql += f" WHERE table_name IN ({', '.join('?' * len(tables))})"
+            params = list(tables)
+        return [RunRecord.from_row(row) for row in self._db.execute(sql + " ORDER BY started_at", params)]
+
+    def push(self, conn=None) -> int:
+        """
+        INSERT every unsynced record into ETL_RUN_LOG, up to _PUSH_ROWS per
+        statement. Failures are reported and the records kept for the next
+        push. Returns the number of records written.
+        """
+        rows = self._db.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM run_log WHERE synced = 0 ORDER BY started_at"
+        ).fetchall()
+        if not rows:
+            return 0
+        # TIMINGS is VARIANT: bound as JSON text and parsed on the way in.
+        select = ", ".join(f"PARSE_JSON(${i + 1})" if c == "timings" else f"${i + 1}" for i, c in enumerate(_COLUMNS))
+        placeholders = "(" + ", ".join(["%s"] * len(_COLUMNS)) + ")"
+        written = 0
+        try:
+            with snowflake_session(self.sf_cfg, conn) as conn:
+                cur = conn.cursor()
+                try:
+                    for i in range(0, len(rows), _PUSH_ROWS):
+                        part = rows[i:i + _PUSH_ROWS]
+                        cur.execute(
+                            f"INSERT INTO ETL_RUN_LOG ({', '.join(c.upper() for c in _COLUMNS)}) "
+                            f"SELECT {select} FROM VALUES {', '.join([placeholders] * len(part))}",
+                            [v for row in part for v in row],
+                        )
+                        conn.commit()
+                        with self._db:
+                            self._db.executemany(
+                                "UPDATE run_log SET synced = 1 WHERE run_id = ? AND table_name = ?",
+                                [row[:2] for row in part],
+                            )
+                        written += len(part)
+                finally:
+                    cur.close()
+        except Exception as e:
+            print(
+                f"[LEDGER] Could not write ETL_RUN_LOG ({e}); "
+                f"{len(rows) - written} records kept in {self.path or 'memory'} for the next run"
+            )
+        if written:
+            print(f"[LEDGER] Wrote {written} records to ETL_RUN_LOG")
+        return written
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def read_snowflake_records(sf_cfg: Dict[str, Any], tables: Optional[List[str]] = None, conn=None) -> List[RunRecord]:
+    """Every ETL_RUN_LOG record (of `tables`), oldest first."""
+    sql = f"SELECT {', '.join(c.upper() for c in _COLUMNS)} FROM ETL_RUN_LOG"
+    params: List[Any] = []
+    if tables:
+        sql += f" WHERE TABLE_NAME IN ({', '.join(['%s'] * len(tables))})"
+        params = list(tables)
+    with snowflake_session(sf_cfg, conn) as conn:
+        cur = conn.cursor()
+        try:
+            cur.execute(sql + " ORDER BY STARTED_AT", params)
+            return [RunRecord.from_row(row) for row in cur.fetchall()]
+        finally:
+            cur.close()
+
+
+def slowdown_settings(pipeline_cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """detect_slowdowns() keyword arguments from the pipeline section of config.yaml."""
+    return {
+        "threshold": float(pipeline_cfg.get("slowdown_threshold", DEFAULT_SLOWDOWN_THRESHOLD)),
+        "window": int(pipeline_cfg.get("slowdown_window", DEFAULT_SLOWDOWN_WINDOW)),
+        "min_rows": int(pipeline_cfg.get("slowdown_min_rows", DEFAULT_SLOWDOWN_MIN_ROWS)),
+    }
+
+
+def record_and_check(ledger: RunLedger, records: List[RunRecord], **settings: Any) -> List[Slowdown]:
+    """
+    Store records of one run in the local mirror and print the tables that
+    ran slower than their history (see detect_slowdowns for `settings`).
+    """
+    if not records:
+        return []
+    ledger.record(records)
+    _, slow = detect_slowdowns(
+        ledger.records(sorted({r.table_name for r in records})), run_id=records[0].run_id, **settings
+    )
+    for s in slow:
+        print(f"[LEDGER] SLOWDOWN {describe_slowdown(s)}")
+    return slow
+
+
+def record_results(
+    ledger: RunLedger,
+    run_id: str,
+    results: List[Any],
+    before: Dict[Tuple[str, str], StageStats],
+    after: Dict[Tuple[str, str], StageStats],
+    run_started_at: datetime,
+    **settings: Any,
+) -> List[Slowdown]:
+    """
+    record_and_check() the runner's TableResults, with the stage timings of
+    the instrumentation snapshots taken before and after the run. Tables
+    that never started (pending when the run aborted) are not recorded.
+    """
+    records = [
+        build_record(run_id, r, stage_deltas(before, after, r.name), run_started_at)
+        for r in results
+        if r.status != "pending"
+    ]
+    return record_and_check(ledger, records, **settings)
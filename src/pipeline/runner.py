@@ -0,0 +1,854 @@
+# src/pipeline/runner.py
+
+"""
+Config-driven pipeline runner.
+
+Loads every table listed under `tables:` in config.yaml. Tables are ordered
+by their foreign keys (parsed from the source DDL, or an explicit
+`depends_on` list in the table config), and tables whose dependencies have
+finished run concurrently on a bounded worker pool.
+
+Usage:
+    python -m src.pipeline run [--tables customers orders] [--workers 4]
+
+(`python -m src.pipeline.runner` takes the same options; see
+src/pipeline/__main__.py for the other commands.)
+"""
+
+import argparse
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.common.config_loader import DEFAULT_CONFIG_PATH, get_config
+from src.common import batch_sizer, instrumentation, schema_registry
+from src.common.db_connections import close_pools, get_mysql_pool, get_snowflake_pool
+from src.common.record_batch import map_batch_file
+from src.extract.binlog_cdc import (
+    BinlogPosition,
+    cdc_batches,
+    current_binlog_position,
+    fixture_start,
+    iter_binlog_events,
+    iter_fixture_events,
+)
+from src.extract.mysql_extractor import (
+    Chunk,
+    iter_full_table,
+    iter_incremental_catchup,
+    iter_incremental_keyset,
+    prefetch_chunks,
+    source_high_watermark,
+)
+from src.load.row_hash import ROW_HASH_DIR, RowHashFilter
+from src.load.snowflake_loader import (
+    apply_cdc_batches,
+    full_load_chunks_to_raw,
+    incremental_upsert_checkpointed,
+    primary_key_columns,
+)
+from src.load.watermark_utils import (
+    WatermarkStore,
+    WatermarkTracker,
+    get_binlog_position,
+    get_checkpoint,
+    update_last_loaded_at,
+    write_binlog_position,
+    write_checkpoint,
+)
+from src.pipeline import run_ledger
+from src.pipeline.delete_sync import sync_deletes
+from src.pipeline.spool import SPOOL_DIR, has_spool, read_manifest, read_spool, remove_spool, spool_through
+
+SOURCE_DDL_PATH = "sql/01_create_source_tables.sql"
+
+# Chunks fetched ahead of the loader (pipeline.prefetch_depth / per-table
+# prefetch_depth); 0 runs extract and load strictly one after the other.
+DEFAULT_PREFETCH_DEPTH = 2
+
+# Incremental loads whose watermark is further than this behind the source's
+# newest row (pipeline / per-table catchup_after_hours) read their backlog as
+# parallel time slices.
+DEFAULT_CATCHUP_AFTER_HOURS = 24.0
+
+_CREATE_RE = re.compile(r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?\s*\((.*?)\);", re.IGNORECASE | re.DOTALL)
+_FK_RE = re.compile(r"FOREIGN\s+KEY\s*\([^)]*\)\s*REFERENCES\s+`?(\w+)`?", re.IGNORECASE)
+
+
+@dataclass
+class TableResult:
+    name: str
+    mode: str = ""
+    status: str = "pending"
+    rows: int = 0
+    skipped: int = 0
+    deleted: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+
+
+def parse_fk_dependencies(ddl_path: str = SOURCE_DDL_PATH) -> Dict[str, Set[str]]:
+    """
+    Map each source table in the DDL file to the set of tables it references
+    through FOREIGN KEY constraints.
+    """
+    path = Path(ddl_path)
+    if not path.exists():
+        return {}
+    deps: Dict[str, Set[str]] = {}
+    for table, body in _CREATE_RE.findall(path.read_text()):
+        deps[table.lower()] = {ref.lower() for ref in _FK_RE.findall(body) if ref.lower() != table.lower()}
+    return deps
+
+
+def build_dependency_graph(
+    tables: List[Dict[str, Any]],
+    ddl_path: str = SOURCE_DDL_PATH,
+) -> Dict[str, Set[str]]:
+    """
+    Return {table name: names of configured tables it must wait for}.
+
+    An explicit `depends_on` list in a table config wins over the DDL.
+    Dependencies on tables that are not part of this run are ignored.
+    """
+    fk_deps = parse_fk_dependencies(ddl_path)
+    by_source = {t["source_table"].lower(): t["name"] for t in tables}
+    names = {t["name"] for t in tables}
+
+    graph: Dict[str, Set[str]] = {}
+    for t in tables:
+        if "depends_on" in t:
+            deps = set(t["depends_on"] or [])
+        else:
+            deps = {by_source[ref] for ref in fk_deps.get(t["source_table"].lower(), set()) if ref in by_source}
+        graph[t["name"]] = (deps & names) - {t["name"]}
+
+    _check_acyclic(graph)
+    return graph
+
+
+def _check_acyclic(graph: Dict[str, Set[str]]) -> None:
+    dependency_tiers(graph)
+
+
+def dependency_tiers(graph: Dict[str, Set[str]]) -> List[List[str]]:
+    """
+    Group tables into tiers: every table only depends on tables in earlier
+    tiers, so the tables of one tier can load in parallel.
+    """
+    remaining = {name: set(deps) for name, deps in graph.items()}
+    tiers: List[List[str]] = []
+    while remaining:
+        ready = sorted(name for name, deps in remaining.items() if not deps)
+        if not ready:
+            raise ValueError(f"Dependency cycle between tables: {sorted(remaining)}")
+        tiers.append(ready)
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return tiers
+
+
+def load_table(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    sf_cfg: Dict[str, Any],
+    store: Optional[WatermarkStore] = None,
+    row_hash_dir: str = ROW_HASH_DIR,
+    prefetch_depth: int = DEFAULT_PREFETCH_DEPTH,
+    catchup_after_hours: float = DEFAULT_CATCHUP_AFTER_HOURS,
+    spool_dir: Optional[str] = None,
+    full_reload: bool = False,
+    delete_sync: bool = False,
+) -> TableResult:
+    """
+    Load one table: full load when it has no watermark yet, otherwise an
+    incremental upsert. Connections come from the shared pools.
+
+    Incremental loads page by (incremental_column, primary_key) and commit a
+    checkpoint to ETL_WATERMARK after every chunk, so a rerun after a crash
+    resumes from the last loaded chunk.
+
+    With a `store`, watermarks are read from the run's WatermarkStore and the
+    full-load watermark is written back to it (flushed by the caller) instead
+    of ETL_WATERMARK directly.
+
+    Tables with `row_hash: true` only stage and MERGE rows whose fingerprint
+    changed (see row_hash.RowHashFilter).
+
+    Up to `prefetch_depth` chunks (table_cfg['prefetch_depth'] wins) are
+    extracted ahead on a background thread while the current one loads.
+
+    A watermark more than `catchup_after_hours` behind the source's newest
+    row (table_cfg wins) is caught up in parallel time slices (see
+    extract_table).
+
+    With `spool_dir` (or `spool: true` in table_cfg) the extract is spooled
+    to {spool_dir}/{table} and loaded from there (see load_with_spool).
+
+    Tables with `extract_mode: cdc` read their changes from the MySQL binlog
+    instead (see run_cdc_table).
+
+    `full_reload` ignores the stored watermark (or binlog position) and
+    reloads the whole table, then sets a fresh one.
+
+    With `delete_sync` (table_cfg wins) an incremental load is followed by
+    a hard-delete pass (src/pipeline/delete_sync.py) that removes rows
+    deleted in MySQL from RAW.
+
+    The columns extracted and loaded come from the schema registry
+    (src/common/schema_registry.py); a table whose `columns` no longer match
+    the source or RAW fails before anything is read.
+    """
+    result = TableResult(name=table_cfg["name"], started_at=datetime.now(timezone.utc))
+    prefetch_depth = int(table_cfg.get("prefetch_depth", prefetch_depth))
+    if catchup_after_hours > 0:
+        # 0 (run_pipeline(catchup=True)) catches up every table.
+        catchup_after_hours = float(table_cfg.get("catchup_after_hours", catchup_after_hours))
+    if table_cfg.get("spool", spool_dir is not None):
+        spool_dir = str(Path(spool_dir or SPOOL_DIR) / table_cfg["name"])
+    else:
+        spool_dir = None
+    mysql_pool = get_mysql_pool(mysql_cfg)
+    row_filter = RowHashFilter(table_cfg, row_hash_dir) if table_cfg.get("row_hash") else None
+    start = time.perf_counter()
+
+    try:
+        with instrumentation.span("table", table=table_cfg["name"]) as s:
+            _run_table(
+                table_cfg, mysql_cfg, sf_cfg, store, row_filter, mysql_pool,
+                prefetch_depth, catchup_after_hours, spool_dir, full_reload, result,
+            )
+            if table_cfg.get("delete_sync", delete_sync) and result.mode == "incremental":
+                t0 = time.perf_counter()
+                with get_snowflake_pool(sf_cfg).connection() as sf_conn, mysql_pool.connection() as mysql_conn:
+                    synced = sync_deletes(
+                        table_cfg, mysql_cfg, sf_cfg, mysql_conn=mysql_conn, sf_conn=sf_conn, row_filter=row_filter
+                    )
+                result.deleted += synced.deleted
+                result.timings["delete_sync"] = time.perf_counter() - t0
+            s.add(rows=result.rows)
+    except Exception:
+        # A failure may be schema drift the cache has not seen yet.
+        schema_registry.invalidate(table_cfg["name"])
+        raise
+    finally:
+        if row_filter is not None:
+            print(row_filter.report())
+            result.skipped = row_filter.rows_skipped
+            row_filter.close()
+        batch_sizer.save(table_cfg["name"])
+
+    result.timings["total"] = time.perf_counter() - start
+    result.status = "ok"
+    return result
+
+
+def _run_table(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    sf_cfg: Dict[str, Any],
+    store: Optional[WatermarkStore],
+    row_filter: Optional[RowHashFilter],
+    mysql_pool,
+    prefetch_depth: int,
+    catchup_after_hours: float,
+    spool_dir: Optional[str],
+    full_reload: bool,
+    result: TableResult,
+) -> None:
+    with get_snowflake_pool(sf_cfg).connection() as sf_conn, mysql_pool.connection() as mysql_conn:
+        # Column lists come from the schema cache (re-read from
+        # information_schema every schema_ttl_hours, or on a full reload);
+        # drift fails the table here, before anything is extracted.
+        schema_registry.ensure(
+            table_cfg, mysql_cfg, sf_cfg, mysql_conn=mysql_conn, sf_conn=sf_conn, refresh=full_reload
+        )
+        if table_cfg.get("extract_mode") == "cdc":
+            run_cdc_table(
+                table_cfg, mysql_cfg, sf_cfg, store, row_filter, sf_conn, mysql_conn, mysql_pool, prefetch_depth,
+                result, full_reload,
+            )
+            return
+        if full_reload:
+            last_loaded, last_pk = None, None
+            print(f"[RUN] {table_cfg['name']}: full reload requested, ignoring the stored watermark")
+        else:
+            last_loaded, last_pk = read_table_checkpoint(table_cfg["name"], sf_cfg, store, sf_conn, result)
+        if spool_dir is not None:
+            load_with_spool(
+                table_cfg, mysql_cfg, sf_cfg, spool_dir, last_loaded, last_pk, store, row_filter,
+                sf_conn, mysql_conn, mysql_pool, catchup_after_hours, result,
+            )
+            return
+        chunks = extract_table(
+            table_cfg, mysql_cfg, last_loaded, last_pk,
+            mysql_conn=mysql_conn, mysql_pool=mysql_pool, prefetch_depth=prefetch_depth,
+            catchup_after_hours=catchup_after_hours,
+        )
+        load_extracted(table_cfg, sf_cfg, chunks, last_loaded, store, row_filter, sf_conn, result)
+
+
+def load_with_spool(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    sf_cfg: Dict[str, Any],
+    spool_dir: str,
+    last_loaded: Optional[datetime],
+    last_pk: Optional[Any],
+    store: Optional[WatermarkStore],
+    row_filter: Optional[RowHashFilter],
+    sf_conn,
+    mysql_conn,
+    mysql_pool,
+    catchup_after_hours: Optional[float],
+    result: TableResult,
+) -> None:
+    """
+    Load a table through its local spool.
+
+    A complete spool left by a failed load of the same extract is replayed
+    (memory-mapped) instead of reading MySQL again; for incremental spools
+    the chunks the failed attempt already checkpointed are skipped.
+    Otherwise the extract is written to the spool while it is loaded
+    (spool_through). The spool is removed once the load has committed and
+    kept when it fails.
+    """
+    table_name = table_cfg["name"]
+    chunks = _replayable_spool(table_cfg, spool_dir, last_loaded, last_pk)
+    if chunks is None:
+        extracted = extract_table(
+            table_cfg, mysql_cfg, last_loaded, last_pk,
+            mysql_conn=mysql_conn, mysql_pool=mysql_pool, prefetch_depth=0,
+            catchup_after_hours=catchup_after_hours,
+        )
+        chunks = spool_through(extracted, spool_dir, meta={
+            "table": table_name,
+            "mode": "full" if last_loaded is None else "incremental",
+            "last_loaded_at": last_loaded.isoformat() if last_loaded is not None else None,
+            "last_pk": last_pk,
+        }, table=table_name)
+
+    try:
+        load_extracted(table_cfg, sf_cfg, chunks, last_loaded, store, row_filter, sf_conn, result)
+    except Exception:
+        # Let the extract finish writing the spool before reporting.
+        chunks.close()
+        if has_spool(spool_dir):
+            print(f"[SPOOL] {table_name}: load failed, extract kept in {spool_dir} for the next attempt")
+        raise
+    chunks.close()
+    remove_spool(spool_dir)
+
+
+def _replayable_spool(
+    table_cfg: Dict[str, Any],
+    spool_dir: str,
+    last_loaded: Optional[datetime],
+    last_pk: Optional[Any],
+) -> Optional[Iterator[Chunk]]:
+    if not has_spool(spool_dir):
+        return None
+    manifest = read_manifest(spool_dir)
+    meta = manifest["meta"]
+    table_name = table_cfg["name"]
+    replay = None
+    if meta.get("table") == table_name and manifest["chunks"]:
+        if last_loaded is None and meta.get("mode") == "full":
+            replay = read_spool(spool_dir)
+        elif last_loaded is not None and meta.get("mode") == "incremental" and meta.get("last_loaded_at"):
+            spooled_from = datetime.fromisoformat(meta["last_loaded_at"])
+            last_chunk = map_batch_file(str(Path(spool_dir) / manifest["chunks"][-1]["file"]))
+            # Still covers rows past the current checkpoint?
+            if spooled_from <= last_loaded and not _chunk_loaded(table_cfg, *last_chunk, last_loaded, last_pk):
+                replay = (
+                    chunk for chunk in read_spool(spool_dir)
+                    if not _chunk_loaded(table_cfg, *chunk, last_loaded, last_pk)
+                )
+
+    if replay is None:
+        print(f"[SPOOL] {table_name}: discarding stale spool in {spool_dir}")
+        remove_spool(spool_dir)
+        return None
+    print(
+        f"[SPOOL] {table_name}: replaying {manifest['rows']} spooled rows from {spool_dir} "
+        f"(extracted {manifest['created_at']}), skipping MySQL"
+    )
+    return replay
+
+
+def _chunk_loaded(
+    table_cfg: Dict[str, Any],
+    columns: List[str],
+    batch: List[Tuple],
+    last_loaded: datetime,
+    last_pk: Optional[Any],
+) -> bool:
+    """True when every row of the chunk is at or before the (last_loaded, last_pk) checkpoint."""
+    last_row = batch[-1]
+    value = last_row[columns.index(table_cfg["incremental_column"])]
+    if last_pk is None:
+        # Rows at the boundary timestamp itself are re-read (iter_incremental_keyset).
+        return value < last_loaded
+    key = schema_registry.key_getter(columns, primary_key_columns(table_cfg))(last_row)
+    return (value, key) <= (last_loaded, last_pk)
+
+
+def run_cdc_table(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    sf_cfg: Dict[str, Any],
+    store: Optional[WatermarkStore],
+    row_filter: Optional[RowHashFilter],
+    sf_conn,
+    mysql_conn,
+    mysql_pool,
+    prefetch_depth: int,
+    result: TableResult,
+    full_reload: bool = False,
+) -> None:
+    """
+    Binlog CDC load of one table (src/extract/binlog_cdc.py).
+
+    Without a stored binlog position the table is snapshotted: the current
+    binlog position is noted, the table is fully loaded, and the noted
+    position becomes its watermark, so changes made during the snapshot are
+    replayed by the next run (the MERGE makes that idempotent). After that
+    every run applies the upserts and deletes since the stored position and
+    commits the new position with each batch.
+
+    With `cdc_fixture` set, events are replayed from that recorded file
+    instead of the live binlog. `full_reload` takes a new snapshot whatever
+    position is stored.
+    """
+    table_name = table_cfg["name"]
+    fixture = table_cfg.get("cdc_fixture")
+    incr_col = table_cfg.get("incremental_column")
+
+    stored = None
+    if not full_reload:
+        t0 = time.perf_counter()
+        stored = get_binlog_position(table_name, sf_cfg, conn=sf_conn)
+        result.timings["watermark_read"] = time.perf_counter() - t0
+
+    if stored is None:
+        start = fixture_start(fixture) if fixture else current_binlog_position(mysql_cfg, conn=mysql_conn)
+        print(f"[CDC] {table_name}: no binlog position yet, snapshot at {start.log_file}:{start.log_pos}")
+        chunks = extract_table(
+            table_cfg, mysql_cfg, None, None,
+            mysql_conn=mysql_conn, mysql_pool=mysql_pool, prefetch_depth=prefetch_depth,
+        )
+        load_extracted(table_cfg, sf_cfg, chunks, None, store, row_filter, sf_conn, result)
+        cur = sf_conn.cursor()
+        try:
+            write_binlog_position(cur, table_name, start.log_file, start.log_pos)
+            sf_conn.commit()
+        finally:
+            cur.close()
+        result.mode = "cdc-snapshot"
+        return
+
+    result.mode = "cdc"
+    start = BinlogPosition(*stored)
+    print(f"[CDC] {table_name}: applying changes after {start.log_file}:{start.log_pos}")
+    if fixture:
+        events = iter_fixture_events(fixture, start)
+    else:
+        events = iter_binlog_events(
+            mysql_cfg, [table_cfg["source_table"]], start,
+            primary_keys={table_cfg["source_table"]: primary_key_columns(table_cfg)},
+        )
+    batches = prefetch_chunks(
+        cdc_batches(events, table_cfg, primary_key_columns(table_cfg)), prefetch_depth, table=table_name
+    )
+    position: Dict[str, Any] = {}
+
+    def _checkpoint(cur, batch) -> None:
+        last_loaded = None
+        if incr_col in batch.columns and batch.upserts:
+            idx = batch.columns.index(incr_col)
+            last_loaded = max((r[idx] for r in batch.upserts if r[idx] is not None), default=None)
+        write_binlog_position(cur, table_name, batch.position.log_file, batch.position.log_pos, last_loaded)
+        position["at"] = batch.position
+        if last_loaded is not None:
+            position["last_loaded"] = max(last_loaded, position.get("last_loaded", last_loaded))
+
+    last_loaded = None
+    if row_filter is not None:
+        # The index must have seen every load up to the table's watermark.
+        if store is not None:
+            last_loaded = store.get(table_name, conn=sf_conn)
+        else:
+            last_loaded, _ = get_checkpoint(table_name, sf_cfg, conn=sf_conn)
+        cur = sf_conn.cursor()
+        try:
+            row_filter.bootstrap_from_raw(cur, last_loaded)
+        finally:
+            cur.close()
+
+    t0 = time.perf_counter()
+    result.rows, result.deleted = apply_cdc_batches(
+        batches, table_cfg, sf_cfg, _checkpoint, conn=sf_conn, row_filter=row_filter
+    )
+    result.timings["extract_load"] = time.perf_counter() - t0
+
+    if "at" in position:
+        if "last_loaded" in position:
+            if store is not None:
+                store.record_checkpoint(table_name, position["last_loaded"], None)
+            if row_filter is not None:
+                row_filter.mark_synced(max(position["last_loaded"], last_loaded or position["last_loaded"]))
+        print(f"[CDC] {table_name}: binlog position moved to {position['at'].log_file}:{position['at'].log_pos}")
+    else:
+        print(f"[CDC] {table_name}: no new changes, position remains {start.log_file}:{start.log_pos}")
+
+
+def read_table_checkpoint(
+    table_name: str,
+    sf_cfg: Dict[str, Any],
+    store: Optional[WatermarkStore],
+    sf_conn,
+    result: TableResult,
+) -> Tuple[Optional[datetime], Optional[Any]]:
+    """(last_loaded_at, last_loaded_pk) of a table, from `store` when given."""
+    t0 = time.perf_counter()
+    if store is not None:
+        last_loaded, last_pk = store.get_checkpoint(table_name, conn=sf_conn)
+    else:
+        last_loaded, last_pk = get_checkpoint(table_name, sf_cfg, conn=sf_conn)
+    result.timings["watermark_read"] = time.perf_counter() - t0
+    print(f"[RUN] {table_name}: current watermark {last_loaded} (pk {last_pk})")
+    return last_loaded, last_pk
+
+
+def extract_table(
+    table_cfg: Dict[str, Any],
+    mysql_cfg: Dict[str, Any],
+    last_loaded: Optional[datetime],
+    last_pk: Optional[Any],
+    mysql_conn=None,
+    mysql_pool=None,
+    prefetch_depth: int = 0,
+    catchup_after_hours: Optional[float] = None,
+) -> Iterator[Chunk]:
+    """
+    Chunk stream for a table: the whole table when it has no watermark yet,
+    otherwise the rows after the (last_loaded, last_pk) checkpoint.
+
+    When the checkpoint is more than `catchup_after_hours` behind the
+    source's MAX(incremental_column) the backlog is read as time slices on parallel connections (iter_incremental_catchup),
+    still in checkpoint order.
+
+    With `prefetch_depth` > 0 the stream is read on a background thread
+    (prefetch_chunks) so extraction overlaps the load. Parallel full-table
+    reads and catch-ups already run on their own threads and are returned
+    as-is.
+    """
+    if last_loaded is None:
+        chunks = iter_full_table(table_cfg, mysql_cfg, conn=mysql_conn, pool=mysql_pool)
+        if int(table_cfg.get("parallelism") or 1) > 1:
+            return chunks
+    else:
+        newest = None
+        if catchup_after_hours is not None and isinstance(last_loaded, datetime):
+            newest = source_high_watermark(table_cfg, mysql_cfg, conn=mysql_conn)
+        if _is_behind(last_loaded, newest, catchup_after_hours):
+            print(
+                f"[RUN] {table_cfg['name']}: watermark {last_loaded} is over {catchup_after_hours}h behind "
+                f"the source ({newest}), catching up"
+            )
+            return iter_incremental_catchup(table_cfg, mysql_cfg, last_loaded, last_pk, pool=mysql_pool)
+        chunks = iter_incremental_keyset(table_cfg, mysql_cfg, last_loaded, last_pk, conn=mysql_conn)
+    return prefetch_chunks(chunks, prefetch_depth, table=table_cfg["name"])
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Naive values (DATETIME, TIMESTAMP_NTZ) are taken as UTC already.
+    return value if value.tzinfo is None else value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _is_behind(last_loaded: Any, newest: Any, catchup_after_hours: Optional[float]) -> bool:
+    """
+    True when the source's newest row (`newest`, MAX(incremental_column)) is
+    more than `catchup_after_hours` past the watermark. Both values come from
+    the source's clock, so the host's time zone and a quiet table (old
+    watermark, nothing new) do not trigger a catch-up.
+    """
+    if catchup_after_hours is None or not isinstance(last_loaded, datetime) or not isinstance(newest, datetime):
+        return False
+    return _as_utc(newest) - _as_utc(last_loaded) > timedelta(hours=catchup_after_hours)
+
+
+def load_extracted(
+    table_cfg: Dict[str, Any],
+    sf_cfg: Dict[str, Any],
+    chunks: Iterable[Chunk],
+    last_loaded: Optional[datetime],
+    store: Optional[WatermarkStore],
+    row_filter: Optional[RowHashFilter],
+    sf_conn,
+    result: TableResult,
+) -> None:
+    """
+    Load the chunks from extract_table() and move the watermark: a full load
+    (last_loaded is None) followed by one watermark write, or a checkpointed
+    incremental upsert that commits its cursor with every chunk.
+    """
+    table_name = table_cfg["name"]
+    incr_col = table_cfg["incremental_column"]
+    keys = primary_key_columns(table_cfg)
+
+    t0 = time.perf_counter()
+    if last_loaded is None:
+        result.mode = "full"
+        tracker = WatermarkTracker(incr_col)
+        result.rows = full_load_chunks_to_raw(
+            tracker.wrap(chunks), table_cfg, sf_cfg, conn=sf_conn, row_filter=row_filter
+        )
+        result.timings["extract_load"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        if tracker.rows_seen and tracker.max_value is not None:
+            if store is not None:
+                store.set(table_name, tracker.max_value)
+            else:
+                update_last_loaded_at(table_name, tracker.max_value, sf_cfg, conn=sf_conn)
+            if row_filter is not None:
+                row_filter.mark_synced(tracker.max_value)
+            print(f"[RUN] {table_name}: watermark moved to {tracker.max_value}")
+        else:
+            print(f"[RUN] {table_name}: no rows, no watermark set")
+        result.timings["watermark_write"] = time.perf_counter() - t0
+    else:
+        result.mode = "incremental"
+        position: Dict[str, Any] = {}
+
+        def _checkpoint(cur, columns: List[str], batch: List[tuple]) -> None:
+            last_row = batch[-1]
+            cursor = (last_row[columns.index(incr_col)], schema_registry.key_getter(columns, keys)(last_row))
+            write_checkpoint(cur, table_name, *cursor)
+            position["cursor"] = cursor
+
+        if row_filter is not None:
+            cur = sf_conn.cursor()
+            try:
+                # Re-seeds the index if another host loaded past it.
+                row_filter.bootstrap_from_raw(cur, last_loaded)
+            finally:
+                cur.close()
+
+        result.rows = incremental_upsert_checkpointed(
+            chunks, table_cfg, sf_cfg, _checkpoint, conn=sf_conn, row_filter=row_filter
+        )
+        result.timings["extract_load"] = time.perf_counter() - t0
+
+        if "cursor" in position:
+            if store is not None:
+                store.record_checkpoint(table_name, *position["cursor"])
+            if row_filter is not None:
+                row_filter.mark_synced(position["cursor"][0])
+            print(f"[RUN] {table_name}: checkpoint moved to {position['cursor']}")
+        else:
+            print(f"[RUN] {table_name}: no new rows, watermark remains {last_loaded}")
+
+
+def run_pipeline(
+    config: Dict[str, Any],
+    table_names: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    watermarks_from_cache: bool = False,
+    profile: Optional[str] = None,
+    catchup: bool = False,
+    full_reload: bool = False,
+) -> List[TableResult]:
+    """
+    Run every configured table (or only `table_names`) in dependency order,
+    with up to `max_workers` tables in flight at once.
+
+    Watermarks for all tables are read in one query up front and written in
+    one MERGE at the end (see WatermarkStore); `watermarks_from_cache` reads
+    them from pipeline.watermark_cache instead.
+
+    A table whose dependency failed is skipped. Returns one TableResult per
+    table in config order.
+
+    Per-stage timings go to pipeline.metrics_log (JSON lines) and
+    pipeline.prometheus_textfile when configured; `profile` lists stages to
+    capture with cProfile / tracemalloc (see src/common/instrumentation.py).
+
+    `catchup` reads every incremental table as a sliced catch-up, however
+    recent its watermark; `full_reload` fully reloads every selected table
+    regardless of its watermark.
+
+    With pipeline.delete_sync, incremental tables also delete the rows that
+    were hard-deleted in MySQL.
+
+    With pipeline.spool, extracts go through a local spool under
+    pipeline.spool_dir, so a table whose load failed is retried by the next
+    run without extracting it again.
+
+    Every table's result is recorded in the run ledger (ETL_RUN_LOG and its
+    local mirror pipeline.run_log, see src/pipeline/run_ledger.py), and
+    tables whose throughput fell more than pipeline.slowdown_threshold below
+    their recent median are reported.
+    """
+    tables = config["tables"]
+    if table_names:
+        unknown = set(table_names) - {t["name"] for t in tables}
+        if unknown:
+            raise ValueError(f"Unknown tables: {sorted(unknown)}")
+        tables = [t for t in tables if t["name"] in table_names]
+
+    pipeline_cfg = config.get("pipeline") or {}
+    workers = int(max_workers or pipeline_cfg.get("max_workers", 4))
+    catchup_after_hours = 0.0 if catchup else float(
+        pipeline_cfg.get("catchup_after_hours", DEFAULT_CATCHUP_AFTER_HOURS)
+    )
+    spool_dir = pipeline_cfg.get("spool_dir", SPOOL_DIR) if pipeline_cfg.get("spool") else None
+    instrumentation.configure(
+        metrics_log=pipeline_cfg.get("metrics_log"),
+        prom_textfile=pipeline_cfg.get("prometheus_textfile"),
+        profile=profile or pipeline_cfg.get("profile"),
+        profile_dir=pipeline_cfg.get("profile_dir"),
+    )
+    batch_sizer.configure(pipeline_cfg.get("batch_state"))
+    schema_registry.configure(
+        pipeline_cfg.get("schema_cache", schema_registry.SCHEMA_CACHE_PATH), pipeline_cfg.get("schema_ttl_hours")
+    )
+    ledger = run_ledger.RunLedger(config["snowflake"], pipeline_cfg.get("run_log", run_ledger.RUN_LOG_PATH))
+    run_id = run_ledger.new_run_id()
+    run_started_at = datetime.now(timezone.utc)
+    stats_before = instrumentation.snapshot()
+    graph = build_dependency_graph(tables, pipeline_cfg.get("source_ddl", SOURCE_DDL_PATH))
+    by_name = {t["name"]: t for t in tables}
+    results = {name: TableResult(name=name) for name in by_name}
+
+    pending = dict(graph)
+    running: Dict[Future, str] = {}
+    store = WatermarkStore(
+        config["snowflake"],
+        cache_path=pipeline_cfg.get("watermark_cache"),
+        prefer_cache=watermarks_from_cache,
+    )
+
+    print(f"[RUN] Run {run_id}: loading {len(tables)} tables with up to {workers} workers")
+    try:
+        with get_snowflake_pool(config["snowflake"]).connection() as sf_conn:
+            store.load(conn=sf_conn)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="table") as pool:
+            while pending or running:
+                for name, deps in list(pending.items()):
+                    failed = [d for d in deps if results[d].status in ("failed", "skipped")]
+                    if failed:
+                        results[name].status = "skipped"
+                        results[name].error = f"dependency failed: {', '.join(sorted(failed))}"
+                        del pending[name]
+                    elif all(results[d].status == "ok" for d in deps):
+                        print(f"[RUN] Starting {name}")
+                        results[name].started_at = datetime.now(timezone.utc)
+                        future = pool.submit(
+                            load_table, by_name[name], config["mysql"], config["snowflake"], store,
+                            pipeline_cfg.get("row_hash_dir", ROW_HASH_DIR),
+                            int(pipeline_cfg.get("prefetch_depth", DEFAULT_PREFETCH_DEPTH)),
+                            catchup_after_hours,
+                            spool_dir,
+                            full_reload,
+                            bool(pipeline_cfg.get("delete_sync", False)),
+                        )
+                        running[future] = name
+                        del pending[name]
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        results[name].status = "failed"
+                        results[name].error = str(e)
+                        results[name].timings["total"] = (
+                            datetime.now(timezone.utc) - results[name].started_at
+                        ).total_seconds()
+                        print(f"[RUN] {name} FAILED: {e}")
+    finally:
+        try:
+            # Commit the watermarks of every table that did load, even if
+            # another table failed.
+            try:
+                with get_snowflake_pool(config["snowflake"]).connection() as sf_conn:
+                    store.flush(conn=sf_conn)
+            finally:
+                # The local mirror is written even when Snowflake is down;
+                # unpushed records go to ETL_RUN_LOG with the next run.
+                run_ledger.record_results(
+                    ledger, run_id, [results[t["name"]] for t in tables], stats_before, instrumentation.snapshot(),
+                    run_started_at, **run_ledger.slowdown_settings(pipeline_cfg),
+                )
+            with get_snowflake_pool(config["snowflake"]).connection() as sf_conn:
+                ledger.push(conn=sf_conn)
+        finally:
+            ledger.close()
+            close_pools()
+            instrumentation.flush()
+            # The textfile describes this run only; the next run in the same
+            # process (an Airflow worker, say) starts from zero.
+            instrumentation.reset()
+            batch_sizer.report()
+
+    ordered = [results[t["name"]] for t in tables]
+    print_summary(ordered)
+    return ordered
+
+
+def print_summary(results: List[TableResult]) -> None:
+    print("\n[RUN] Summary")
+    print(f"{'table':<14}{'mode':<13}{'status':<9}{'rows':>10}{'skipped':>10}{'deleted':>9}{'extract+load':>14}{'total':>9}")
+    for r in results:
+        print(
+            f"{r.name:<14}{r.mode:<13}{r.status:<9}{r.rows:>10}{r.skipped:>10}{r.deleted:>9}"
+            f"{r.timings.get('extract_load', 0.0):>13.2f}s{r.timings.get('total', 0.0):>8.2f}s"
+        )
+        if r.error:
+            print(f"{'':<14}{r.error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load configured tables from MySQL into Snowflake RAW.")
+    parser.add_argument("--tables", nargs="+", help="only load these tables (by config name)")
+    parser.add_argument("--workers", type=int, help="max tables loaded concurrently")
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    parser.add_argument(
+        "--watermarks-from-cache",
+        action="store_true",
+        help="read watermarks from the local cache file instead of ETL_WATERMARK",
+    )
+    parser.add_argument(
+        "--profile",
+        help="comma-separated stages to profile with cProfile/tracemalloc (e.g. extract.fetch,load.insert or all)",
+    )
+    parser.add_argument(
+        "--catchup",
+        action="store_true",
+        help="read incremental tables as parallel time slices regardless of watermark age",
+    )
+    args = parser.parse_args()
+
+    results = run_pipeline(
+        get_config(args.config).as_dict(), args.tables, args.workers, args.watermarks_from_cache, args.profile, args.catchup
+    )
+    if any(r.status != "ok" for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# src/pipeline/spool.py
+
+"""
+Local spool of extracted chunks.
+
+Lets extraction and loading run as separate steps (e.g. separate Airflow
+tasks, or a load retry after a Snowflake failure): the extract side writes
+every (columns, batch) chunk to a columnar batch file in a per-table
+directory plus a manifest.json; the load side replays the chunks in the same
+order. Batch files hold the raw RecordBatch column buffers
+(record_batch.write_batch_file) and are replayed through mmap, so replaying
+copies nothing into Python objects until the loader reads the values.
+Values come back with the same types (datetimes, Decimals, strings), so row
+hashes and checkpoints come out the same as when streaming directly.
+
+spool_through() does both at once for the runner: chunks are written to the
+spool on a background thread and handed to the loader as soon as they are on
+disk. If the load fails, extraction still runs to the end, so the next
+attempt can load from the spool without reading MySQL again.
+"""
+
+import json
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.common.instrumentation import span
+from src.common.record_batch import map_batch_file, write_batch_file
+
+SPOOL_DIR = ".etl_state/spool"
+MANIFEST = "manifest.json"
+SPOOL_FORMAT = "batch-v1"
+
+Chunk = Tuple[List[str], List[Tuple]]
+
+
+class _SpoolWriter:
+    """Writes chunk files into one spool directory and finally its manifest."""
+
+    def __init__(self, spool_dir: str, meta: Optional[Dict[str, Any]], table: Optional[str] = None):
+        self.path = Path(spool_dir)
+        if self.path.exists():
+            shutil.rmtree(self.path)
+        self.path.mkdir(parents=True)
+        self.meta = meta or {}
+        self.table = table
+        self.files: List[Dict[str, Any]] = []
+        self.columns: Optional[List[str]] = None
+
+    def write(self, columns: List[str], batch: List[Tuple]) -> Optional[str]:
+        if not batch:
+            return None
+        name = f"chunk_{len(self.files):05d}.batch"
+        with span("spool.write", table=self.table) as s:
+            nbytes = write_batch_file(str(self.path / name), columns, batch)
+            s.add(rows=len(batch), nbytes=nbytes)
+        self.columns = list(columns)
+        self.files.append({"file": name, "rows": len(batch), "bytes": nbytes})
+        return name
+
+    def finish(self) -> Dict[str, Any]:
+        manifest = {
+            "format": SPOOL_FORMAT,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "columns": self.columns,
+            "rows": sum(f["rows"] for f in self.files),
+            "chunks": self.files,
+            "meta": self.meta,
+        }
+        # Written last: a spool without a manifest is incomplete.
+        tmp = self.path / f"{MANIFEST}.tmp"
+        tmp.write_text(json.dumps(manifest, indent=2, default=str))
+        tmp.replace(self.path / MANIFEST)
+        return manifest
+
+
+def write_spool(
+    chunks: Iterable[Chunk],
+    spool_dir: str,
+    meta: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Write every chunk to `spool_dir` (replacing anything already there) and
+    return the manifest. `meta` is stored in the manifest as-is and must be
+    JSON serialisable.
+    """
+    writer = _SpoolWriter(spool_dir, meta)
+    for columns, batch in chunks:
+        writer.write(columns, batch)
+    return writer.finish()
+
+
+def read_manifest(spool_dir: str) -> Dict[str, Any]:
+    manifest_path = Path(spool_dir) / MANIFEST
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"No complete spool at {spool_dir} (missing {MANIFEST})")
+    manifest = json.loads(manifest_path.read_text())
+    if manifest.get("format") != SPOOL_FORMAT:
+        raise ValueError(f"Spool at {spool_dir} has format {manifest.get('format')!r}, expected {SPOOL_FORMAT!r}")
+    return manifest
+
+
+def has_spool(spool_dir: str) -> bool:
+    """True when `spool_dir` holds a complete spool of the current format."""
+    try:
+        read_manifest(spool_dir)
+    except (FileNotFoundError, ValueError):
+        return False
+    return True
+
+
+def read_spool(spool_dir: str) -> Iterator[Chunk]:
+    """Replay the chunks of a spool (memory-mapped) in the order they were written."""
+    path = Path(spool_dir)
+    for entry in read_manifest(spool_dir)["chunks"]:
+        yield map_batch_file(str(path / entry["file"]))
+
+
+def spool_through(
+    chunks: Iterable[Chunk],
+    spool_dir: str,
+    meta: Optional[Dict[str, Any]] = None,
+    table: Optional[str] = None,
+) -> Iterator[Chunk]:
+    """
+    Spool `chunks` on a background thread and yield each one, memory-mapped
+    back from its file, as soon as it has been written.
+
+    The spool is a disk-backed prefetch queue: the extract runs ahead of
+    the loader as far as it can, holding no chunks in memory. When the
+    consumer stops early (a failed load), the extract is still finished and
+    the manifest written before this generator returns, so the spool can be
+    replayed by the retry. An extract error is re-raised here and leaves no
+    manifest.
+    """
+    writer = _SpoolWriter(spool_dir, meta, table)
+    written: List[str] = []
+    state: Dict[str, Any] = {"done": False, "error": None}
+    ready = threading.Condition()
+
+    def _produce() -> None:
+        try:
+            for columns, batch in chunks:
+                name = writer.write(columns, batch)
+                if name is not None:
+                    with ready:
+                        written.append(name)
+                        ready.notify()
+            writer.finish()
+        except BaseException as e:
+            state["error"] = e
+        finally:
+            with ready:
+                state["done"] = True
+                ready.notify()
+
+    producer = threading.Thread(target=_produce, daemon=True, name=f"spool-{table or 'chunks'}")
+    producer.start()
+    try:
+        i = 0
+        while True:
+            with span("extract.wait", table=table):
+                with ready:
+                    while i >= len(written) and not state["done"]:
+                        ready.wait()
+                    name = written[i] if i < len(written) else None
+            if name is None:
+                if state["error"] is not None:
+                    raise state["error"]
+                return
+            yield map_batch_file(str(writer.path / name))
+            i += 1
+    finally:
+        producer.join()
+
+
+def remove_spool(spool_dir: str) -> None:
+    shutil.rmtree(spool_dir, ignore_errors=True)